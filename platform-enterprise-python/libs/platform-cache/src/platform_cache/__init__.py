@@ -1,12 +1,70 @@
 """Platform Cache - 缓存抽象层"""
 
-from platform_cache.client import CacheClient, create_redis_pool
-from platform_cache.rate_limiter import RateLimiter
+from platform_cache.client import CacheClient, create_redis_client, create_redis_pool
+from platform_cache.decorators import CachedFunctionStats, cached, get_cached_stats
+from platform_cache.filters import BloomFilter, CuckooFilter, bloom_parameters
+from platform_cache.hotkeys import CountMinSketch, HotKey, HotKeyDetector, SpaceSaving
+from platform_cache.local import CacheStats, LocalCache
+from platform_cache.manager import PoolConfig, PoolStats, RedisManager, default_pools
+from platform_cache.memory import InMemoryRedis, MemoryStore, get_memory_store, register_script_handler
+from platform_cache.pipelining import AutoPipeline
+from platform_cache.rate_limiter import (
+    ApproximateLimiterStats,
+    ApproximateRateLimiter,
+    RateLimiter,
+    SlidingWindowRateLimiter,
+    TokenBucketLimiter,
+    TokenBucketResult,
+)
+from platform_cache.serializers import (
+    Codec,
+    JsonCodec,
+    MsgpackCodec,
+    OrjsonCodec,
+    Serializer,
+)
+from platform_cache.sharding import HashRing, ShardedCacheClient, create_sharded_cache
+
 
 __version__ = "1.0.0"
 
 __all__ = [
+    "ApproximateLimiterStats",
+    "ApproximateRateLimiter",
+    "AutoPipeline",
+    "BloomFilter",
     "CacheClient",
+    "CacheStats",
+    "CachedFunctionStats",
+    "Codec",
+    "CountMinSketch",
+    "CuckooFilter",
+    "HashRing",
+    "HotKey",
+    "HotKeyDetector",
+    "InMemoryRedis",
+    "JsonCodec",
+    "LocalCache",
+    "MemoryStore",
+    "MsgpackCodec",
+    "OrjsonCodec",
+    "PoolConfig",
+    "PoolStats",
     "RateLimiter",
+    "RedisManager",
+    "Serializer",
+    "ShardedCacheClient",
+    "SlidingWindowRateLimiter",
+    "SpaceSaving",
+    "TokenBucketLimiter",
+    "TokenBucketResult",
+    "bloom_parameters",
+    "cached",
+    "create_redis_client",
     "create_redis_pool",
+    "create_sharded_cache",
+    "default_pools",
+    "get_cached_stats",
+    "get_memory_store",
+    "register_script_handler",
 ]
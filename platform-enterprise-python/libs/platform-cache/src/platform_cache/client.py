@@ -1,17 +1,68 @@
 """Redis Cache Client"""
 
+import asyncio
+import contextlib
 import json
+import logging
+import math
+import random
+import time
+import uuid
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from redis.asyncio import ConnectionPool, Redis
 
+from platform_cache.hotkeys import HotKeyDetector
+from platform_cache.local import CacheStats, LocalCache
+from platform_cache.memory import InMemoryRedis, is_memory_url, register_script_handler
+from platform_cache.pipelining import AutoPipeline
+from platform_cache.serializers import Serializer
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+Loader = Callable[[], Awaitable[Any]]
+
+# UNLINK / SCAN 的单批键数
+_BATCH_SIZE = 500
+
+# 每登记多少次标签成员后在后台清理一次这些标签中已过期的成员
+_TAG_PRUNE_INTERVAL = 1000
+
+# 仅当租约仍由本节点持有时删除 (回源超过 lease_ttl 后租约可能已被其他节点取得)
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _release_lease_local(redis: InMemoryRedis, keys: list[str], args: list[Any]) -> int:
+    """RELEASE_LEASE_SCRIPT 的 Python 实现 (memory:// 后端)"""
+    owner = redis.run_command("get", keys[0])
+    if isinstance(owner, bytes):
+        owner = owner.decode()
+    if owner != str(args[0]):
+        return 0
+    return redis.run_command("delete", keys[0])
+
+
+register_script_handler(RELEASE_LEASE_SCRIPT, _release_lease_local)
+
 
 def create_redis_pool(
     url: str,
     max_connections: int = 50,
     decode_responses: bool = True,
+    serializer: Serializer | None = None,
 ) -> ConnectionPool:
-    """创建 Redis 连接池"""
+    """创建 Redis 连接池 (传入 serializer 时使用二进制连接)"""
+    if serializer is not None:
+        decode_responses = False
     return ConnectionPool.from_url(
         url,
         max_connections=max_connections,
@@ -22,28 +73,180 @@ def create_redis_pool(
     )
 
 
+def create_redis_client(
+    url: str,
+    max_connections: int = 50,
+    decode_responses: bool = True,
+    serializer: Serializer | None = None,
+) -> Redis:
+    """创建 Redis 客户端 (memory:// 返回进程内后端, 见 InMemoryRedis)"""
+    if is_memory_url(url):
+        return InMemoryRedis.from_url(url, decode_responses=decode_responses and serializer is None)
+    return Redis(connection_pool=create_redis_pool(url, max_connections, decode_responses, serializer))
+
+
 class CacheClient:
-    """缓存客户端"""
+    """缓存客户端
+
+    传入 local_cache 时启用两级缓存: 进程内 L1 位于 Redis (L2) 之前。
+    任一节点的写操作 (set / delete / incr 等) 在 Redis 写入完成后通过 Pub/Sub
+    广播失效消息, 其他节点需调用 start_invalidation_listener() 订阅。
+    发起读取后收到过失效消息的 L1 回填会被丢弃, 避免在途的旧值覆盖失效。
+
+    传入 serializer 时按二进制格式存储 (连接需 decode_responses=False,
+    见 create_redis_pool); 未传入时保持 JSON 文本格式。
+
+    set / set_many 传入 tags 时, 键会记录到每个标签对应的 Set 中,
+    invalidate_tag(tag) 只删除该标签下的键, 无需扫描整个键空间。
+    标签集合的过期时间依赖 EXPIRE NX / GT (需 Redis >= 7.0); 持续写入的标签
+    不会过期, 其中已过期的成员由 prune_tag() 定期清理。
+
+    传入 hot_keys 时对读取和计数的键采样统计热点 (见 HotKeyDetector)。
+
+    auto_pipeline=True 时, 并发协程在同一 tick (或 pipeline_window 秒) 内
+    发出的命令合并为一次 Pipeline 往返 (见 AutoPipeline)。
+    """
 
     def __init__(
         self,
         redis: Redis,
         prefix: str = "platform",
         default_ttl: int = 300,
+        *,
+        local_cache: LocalCache | None = None,
+        serializer: Serializer | None = None,
+        hot_keys: HotKeyDetector | None = None,
+        auto_pipeline: bool = False,
+        pipeline_window: float = 0.0,
     ) -> None:
-        self.redis = redis
+        self.redis = AutoPipeline(redis, window=pipeline_window) if auto_pipeline else redis
         self.prefix = prefix
         self.default_ttl = default_ttl
+        self.local = local_cache
+        self.serializer = serializer
+        self.hot_keys = hot_keys
+        self.node_id = uuid.uuid4().hex
+        self.invalidation_channel = f"{prefix}:__invalidate__"
+        self._stats = CacheStats()
+        # L1 失效代数, 每次失效递增; 回填前代数已变化说明读到的值可能已过期
+        self._generation = 0
+        self._listener_task: asyncio.Task[None] | None = None
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self._background: set[asyncio.Task[Any]] = set()
+        self._tag_writes = 0
+        self._release_lease = self.redis.register_script(RELEASE_LEASE_SCRIPT)
 
     def _make_key(self, key: str) -> str:
         """生成完整的缓存键"""
         return f"{self.prefix}:{key}"
 
+    def for_key(self, key: str) -> "CacheClient":  # noqa: ARG002
+        """获取键所属节点的客户端 (单节点即自身, 与 ShardedCacheClient.for_key 对应)"""
+        return self
+
+    def _make_tag_key(self, tag: str) -> str:
+        """生成标签成员集合的键"""
+        return f"{self.prefix}:__tag__:{tag}"
+
+    def _add_tags(
+        self,
+        pipe: Any,
+        full_keys: list[str],
+        tags: list[str],
+        expire: int,
+    ) -> None:
+        """在 Pipeline 中记录标签成员, 标签集合的过期时间取成员中的最大值"""
+        for tag in tags:
+            tag_key = self._make_tag_key(tag)
+            pipe.sadd(tag_key, *full_keys)
+            pipe.expire(tag_key, expire, nx=True)
+            pipe.expire(tag_key, expire, gt=True)
+
+    def _maybe_prune_tags(self, tags: list[str]) -> None:
+        """每 _TAG_PRUNE_INTERVAL 次标签写入在后台清理一次本次写入的标签"""
+        self._tag_writes += 1
+        if self._tag_writes % _TAG_PRUNE_INTERVAL:
+            return
+
+        async def prune() -> None:
+            for tag in tags:
+                try:
+                    await self.prune_tag(tag)
+                except Exception as e:
+                    logger.warning(f"Tag prune failed for {tag}: {e}")
+
+        task = asyncio.create_task(prune())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _encode(self, value: Any) -> str | bytes:
+        """编码缓存值"""
+        if self.serializer is None:
+            return json.dumps(value, default=str)
+        return self.serializer.dumps(value)
+
+    def _decode(self, data: str | bytes) -> Any:
+        """解码缓存值"""
+        if self.serializer is None:
+            return json.loads(data)
+        return self.serializer.loads(data)
+
+    @staticmethod
+    def _decode_field(field: str | bytes) -> str:
+        """哈希字段名在二进制连接下为 bytes"""
+        return field.decode() if isinstance(field, bytes) else field
+
+    def _fill_local(
+        self,
+        full_key: str,
+        value: Any,
+        size: int,
+        generation: int,
+        ttl: float | None = None,
+    ) -> None:
+        """回填 L1, 读取或写入期间发生过失效时放弃回填"""
+        if self.local is None:
+            return
+        if generation != self._generation:
+            self.local.delete(full_key)
+            return
+        self.local.set(full_key, value, size, ttl=ttl)
+
+    @property
+    def stats(self) -> CacheStats:
+        """缓存命中统计"""
+        if self.local is not None:
+            self._stats.evictions = self.local.evictions
+        return self._stats
+
     async def get(self, key: str) -> Any | None:
         """获取缓存"""
-        data = await self.redis.get(self._make_key(key))
+        full_key = self._make_key(key)
+        if self.hot_keys is not None:
+            self.hot_keys.record(full_key)
+        if self.local is not None:
+            value = self.local.get(full_key, _MISSING)
+            if value is not _MISSING:
+                self._stats.l1_hits += 1
+                return value
+            self._stats.l1_misses += 1
+
+        promoted = self.hot_keys.promoted if self.hot_keys is not None else None
+        if promoted is not None:
+            value = promoted.get(full_key, _MISSING)
+            if value is not _MISSING:
+                return value
+
+        generation = self._generation
+        data = await self.redis.get(full_key)
         if data:
-            return json.loads(data)
+            self._stats.l2_hits += 1
+            value = self._decode(data)
+            self._fill_local(full_key, value, len(data), generation)
+            if promoted is not None and generation == self._generation and self.hot_keys.is_hot(full_key):
+                promoted.set(full_key, value, len(data))
+            return value
+        self._stats.l2_misses += 1
         return None
 
     async def set(
@@ -51,11 +254,30 @@ class CacheClient:
         key: str,
         value: Any,
         ttl: int | None = None,
+        tags: list[str] | None = None,
     ) -> bool:
-        """设置缓存"""
-        data = json.dumps(value, default=str)
+        """设置缓存 (tags: 所属标签, 供 invalidate_tag 批量失效)"""
+        data = self._encode(value)
         expire = ttl or self.default_ttl
-        result = await self.redis.setex(self._make_key(key), expire, data)
+        full_key = self._make_key(key)
+        if self.hot_keys is not None:
+            self.hot_keys.forget([full_key])
+        if self.local is None and not tags:
+            result = await self.redis.setex(full_key, expire, data)
+            return bool(result)
+
+        # 写入、标签登记与失效广播合并为一次往返 (PUBLISH 排在写入之后)
+        generation = self._generation
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.setex(full_key, expire, data)
+            if tags:
+                self._add_tags(pipe, [full_key], tags, expire)
+            if self.local is not None:
+                pipe.publish(self.invalidation_channel, self._invalidation_message(keys=[full_key]))
+            result, *_ = await pipe.execute()
+        self._fill_local(full_key, value, len(data), generation, ttl=expire)
+        if tags:
+            self._maybe_prune_tags(tags)
         return bool(result)
 
     async def set_nx(
@@ -65,30 +287,116 @@ class CacheClient:
         ttl: int | None = None,
     ) -> bool:
         """设置缓存 (仅当键不存在时)"""
-        data = json.dumps(value, default=str)
+        data = self._encode(value)
         expire = ttl or self.default_ttl
+        full_key = self._make_key(key)
         result = await self.redis.set(
-            self._make_key(key),
+            full_key,
             data,
             ex=expire,
             nx=True,
         )
+        if result:
+            await self._invalidate_remote(keys=[full_key])
         return bool(result)
 
     async def delete(self, key: str) -> bool:
         """删除缓存"""
-        result = await self.redis.delete(self._make_key(key))
+        full_key = self._make_key(key)
+        result = await self.redis.delete(full_key)
+        await self._invalidate_remote(keys=[full_key])
         return result > 0
 
     async def delete_pattern(self, pattern: str) -> int:
-        """删除匹配模式的缓存"""
+        """
+        删除匹配模式的缓存
+
+        边扫描边按批 UNLINK, 不在内存中累积全部键;
+        仍需遍历整个键空间, 能确定归属的键应改用 tags + invalidate_tag。
+        """
         full_pattern = self._make_key(pattern)
-        keys = []
-        async for key in self.redis.scan_iter(full_pattern):
-            keys.append(key)
-        if keys:
-            return await self.redis.delete(*keys)
-        return 0
+        deleted = 0
+        batch: list[str | bytes] = []
+        async for key in self.redis.scan_iter(full_pattern, count=_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= _BATCH_SIZE:
+                deleted += await self.redis.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await self.redis.unlink(*batch)
+        await self._invalidate_remote(pattern=full_pattern)
+        return deleted
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        删除标签下的所有缓存
+
+        以 SSCAN 分批读取标签成员, 在同一事务中 UNLINK 这些键并从标签集合 SREM。
+        只移除扫描到的成员而不删除集合本身, 扫描期间新登记的键仍保留在标签下。
+
+        Returns:
+            实际删除的缓存键数量
+        """
+        tag_key = self._make_tag_key(tag)
+        deleted = 0
+        batch: list[str] = []
+        async for member in self.redis.sscan_iter(tag_key, count=_BATCH_SIZE):
+            batch.append(self._decode_field(member))
+            if len(batch) >= _BATCH_SIZE:
+                deleted += await self._unlink_tagged(tag_key, batch)
+                batch = []
+        if batch:
+            deleted += await self._unlink_tagged(tag_key, batch)
+        return deleted
+
+    async def _unlink_tagged(self, tag_key: str, full_keys: list[str]) -> int:
+        """UNLINK 一批标签成员并从标签集合移除, 然后广播 L1 失效"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.unlink(*full_keys)
+            pipe.srem(tag_key, *full_keys)
+            result, _ = await pipe.execute()
+        await self._invalidate_remote(keys=full_keys)
+        return result
+
+    async def prune_tag(self, tag: str) -> int:
+        """
+        从标签集合中移除已过期 (不存在) 的成员
+
+        持续写入的标签集合会被 EXPIRE GT 一直续期, 需定期清理;
+        set / set_many 每 _TAG_PRUNE_INTERVAL 次标签写入会在后台自动调用。
+
+        Returns:
+            移除的成员数量
+        """
+        tag_key = self._make_tag_key(tag)
+        pruned = 0
+        batch: list[str] = []
+        async for member in self.redis.sscan_iter(tag_key, count=_BATCH_SIZE):
+            batch.append(self._decode_field(member))
+            if len(batch) >= _BATCH_SIZE:
+                pruned += await self._prune_batch(tag_key, batch)
+                batch = []
+        if batch:
+            pruned += await self._prune_batch(tag_key, batch)
+        return pruned
+
+    async def _prune_batch(self, tag_key: str, full_keys: list[str]) -> int:
+        """检查一批标签成员是否存在, SREM 已不存在的成员"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for full_key in full_keys:
+                pipe.exists(full_key)
+            exists = await pipe.execute()
+        missing = [full_key for full_key, found in zip(full_keys, exists, strict=True) if not found]
+        if not missing:
+            return 0
+        return await self.redis.srem(tag_key, *missing)
+
+    async def invalidate_tags(self, tags: list[str]) -> int:
+        """删除多个标签下的所有缓存"""
+        deleted = 0
+        for tag in tags:
+            deleted += await self.invalidate_tag(tag)
+        return deleted
 
     async def exists(self, key: str) -> bool:
         """检查键是否存在"""
@@ -96,11 +404,25 @@ class CacheClient:
 
     async def incr(self, key: str, amount: int = 1) -> int:
         """自增"""
-        return await self.redis.incrby(self._make_key(key), amount)
+        return await self._incrby(key, amount)
 
     async def decr(self, key: str, amount: int = 1) -> int:
         """自减"""
-        return await self.redis.decrby(self._make_key(key), amount)
+        return await self._incrby(key, -amount)
+
+    async def _incrby(self, key: str, amount: int) -> int:
+        """计数并广播 L1 失效 (启用 L1 时与 PUBLISH 合并为一次往返)"""
+        full_key = self._make_key(key)
+        if self.hot_keys is not None:
+            self.hot_keys.record(full_key)
+        if self.local is None:
+            return await self.redis.incrby(full_key, amount)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.incrby(full_key, amount)
+            pipe.publish(self.invalidation_channel, self._invalidation_message(keys=[full_key]))
+            result, _ = await pipe.execute()
+        self._apply_invalidation([full_key], None)
+        return result
 
     async def expire(self, key: str, seconds: int) -> bool:
         """设置过期时间"""
@@ -114,19 +436,347 @@ class CacheClient:
         """获取哈希字段"""
         data = await self.redis.hget(self._make_key(name), key)
         if data:
-            return json.loads(data)
+            return self._decode(data)
         return None
 
     async def hset(self, name: str, key: str, value: Any) -> int:
         """设置哈希字段"""
-        data = json.dumps(value, default=str)
+        data = self._encode(value)
         return await self.redis.hset(self._make_key(name), key, data)
 
     async def hgetall(self, name: str) -> dict[str, Any]:
         """获取所有哈希字段"""
         data = await self.redis.hgetall(self._make_key(name))
-        return {k: json.loads(v) for k, v in data.items()}
+        return {self._decode_field(k): self._decode(v) for k, v in data.items()}
 
     async def hdel(self, name: str, *keys: str) -> int:
         """删除哈希字段"""
         return await self.redis.hdel(self._make_key(name), *keys)
+
+    # ==================== 批量操作 ====================
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """批量获取缓存 (单次 MGET), 仅返回命中的键"""
+        if not keys:
+            return {}
+        result: dict[str, Any] = {}
+        pending: list[tuple[str, str]] = []
+        for key in dict.fromkeys(keys):
+            full_key = self._make_key(key)
+            if self.hot_keys is not None:
+                self.hot_keys.record(full_key)
+            if self.local is not None:
+                value = self.local.get(full_key, _MISSING)
+                if value is not _MISSING:
+                    self._stats.l1_hits += 1
+                    result[key] = value
+                    continue
+                self._stats.l1_misses += 1
+            pending.append((key, full_key))
+
+        if not pending:
+            return result
+
+        generation = self._generation
+        values = await self.redis.mget([full_key for _, full_key in pending])
+        for (key, full_key), data in zip(pending, values, strict=True):
+            if not data:
+                self._stats.l2_misses += 1
+                continue
+            self._stats.l2_hits += 1
+            value = self._decode(data)
+            self._fill_local(full_key, value, len(data), generation)
+            result[key] = value
+        return result
+
+    async def set_many(
+        self,
+        mapping: dict[str, Any],
+        ttl: int | None = None,
+        ttls: dict[str, int] | None = None,
+        tags: list[str] | None = None,
+    ) -> bool:
+        """
+        批量设置缓存 (非事务 Pipeline, 单次往返)
+
+        Args:
+            mapping: 键值映射
+            ttl: 默认过期时间 (秒)
+            ttls: 按键指定的过期时间, 优先于 ttl
+            tags: 所有键共同所属的标签
+        """
+        if not mapping:
+            return True
+        ttls = ttls or {}
+        encoded: list[tuple[str, Any, str | bytes, int]] = []
+        for key, value in mapping.items():
+            expire = ttls.get(key) or ttl or self.default_ttl
+            encoded.append((self._make_key(key), value, self._encode(value), expire))
+        if self.hot_keys is not None:
+            self.hot_keys.forget([item[0] for item in encoded])
+
+        generation = self._generation
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for full_key, _, data, expire in encoded:
+                pipe.setex(full_key, expire, data)
+            if tags:
+                self._add_tags(
+                    pipe,
+                    [item[0] for item in encoded],
+                    tags,
+                    max(item[3] for item in encoded),
+                )
+            if self.local is not None:
+                pipe.publish(
+                    self.invalidation_channel,
+                    self._invalidation_message(keys=[item[0] for item in encoded]),
+                )
+            results = await pipe.execute()
+
+        for full_key, value, data, expire in encoded:
+            self._fill_local(full_key, value, len(data), generation, ttl=expire)
+        if tags:
+            self._maybe_prune_tags(tags)
+        return all(results[: len(encoded)])
+
+    async def delete_many(self, keys: list[str]) -> int:
+        """批量删除缓存 (单条 DEL)"""
+        if not keys:
+            return 0
+        full_keys = [self._make_key(key) for key in keys]
+        result = await self.redis.delete(*full_keys)
+        await self._invalidate_remote(keys=full_keys)
+        return result
+
+    async def hget_many(self, name: str, keys: list[str]) -> dict[str, Any]:
+        """批量获取哈希字段 (单次 HMGET), 仅返回存在的字段"""
+        if not keys:
+            return {}
+        values = await self.redis.hmget(self._make_key(name), keys)
+        return {key: self._decode(data) for key, data in zip(keys, values, strict=True) if data}
+
+    # ==================== 防击穿 ====================
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Loader,
+        ttl: int | None = None,
+        *,
+        beta: float = 1.0,
+        stale_ttl: int = 0,
+        lease_ttl: float = 10.0,
+    ) -> Any:
+        """
+        读取缓存, 未命中时调用 loader 回源并写回
+
+        - 进程内 single-flight: 同一键的并发协程只触发一次 loader
+        - 跨进程租约: 通过短期 SET NX 保证只有一个节点回源
+        - XFetch 概率提前刷新: 越接近过期、回源越慢, 越可能提前刷新
+        - stale_ttl > 0 时开启 stale-while-revalidate: 过期后 stale_ttl 秒内
+          先返回旧值并在后台刷新
+
+        值以 {"v": 值, "d": 回源耗时, "e": 逻辑过期时间} 包装存储,
+        此类键应只通过 get_or_set 读取。
+
+        Args:
+            key: 缓存键
+            loader: 无参异步回源函数
+            ttl: 逻辑过期时间 (秒)
+            beta: XFetch 系数, >1 更积极提前刷新, 0 关闭提前刷新
+            stale_ttl: 过期后允许返回旧值的时长 (秒)
+            lease_ttl: 回源租约时长 (秒)
+        """
+        expire = ttl or self.default_ttl
+        envelope = await self.get(key)
+
+        if isinstance(envelope, dict) and "e" in envelope:
+            value = envelope.get("v")
+            now = time.time()
+            expiry = float(envelope["e"])
+            delta = float(envelope.get("d", 0))
+            # XFetch: now - delta * beta * ln(rand) >= expiry 时提前刷新
+            early = now - delta * beta * math.log(1.0 - random.random()) >= expiry  # noqa: S311
+            if not early:
+                return value
+            if now < expiry + stale_ttl:
+                if stale_ttl > 0:
+                    self._refresh_in_background(key, loader, expire, stale_ttl, lease_ttl)
+                    return value
+                if now < expiry:
+                    # 未真正过期: 尝试抢租约刷新, 抢不到则返回当前值
+                    return await self._load(key, loader, expire, stale_ttl, lease_ttl, fallback=value)
+
+        return await self._load(key, loader, expire, stale_ttl, lease_ttl)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Loader,
+        expire: int,
+        stale_ttl: int,
+        lease_ttl: float,
+        *,
+        fallback: Any = _MISSING,
+    ) -> Any:
+        """进程内 single-flight 回源"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._recompute(key, loader, expire, stale_ttl, lease_ttl, fallback=fallback)
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _recompute(
+        self,
+        key: str,
+        loader: Loader,
+        expire: int,
+        stale_ttl: int,
+        lease_ttl: float,
+        *,
+        fallback: Any,
+    ) -> Any:
+        """跨进程租约 + 回源写回"""
+        lease_key = self._make_key(f"{key}:__lease__")
+        acquired = await self.redis.set(lease_key, self.node_id, px=int(lease_ttl * 1000), nx=True)
+
+        if not acquired:
+            if fallback is not _MISSING:
+                return fallback
+            # 等待持有租约的节点写回, 超时后自行回源
+            deadline = time.monotonic() + lease_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                envelope = await self.get(key)
+                if isinstance(envelope, dict) and float(envelope.get("e", 0)) > time.time():
+                    return envelope.get("v")
+
+        try:
+            start = time.monotonic()
+            value = await loader()
+            delta = time.monotonic() - start
+            envelope = {"v": value, "d": round(delta, 4), "e": time.time() + expire}
+            await self.set(key, envelope, ttl=expire + stale_ttl)
+            return value
+        finally:
+            if acquired:
+                await self._release_lease(keys=[lease_key], args=[self.node_id])
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        loader: Loader,
+        expire: int,
+        stale_ttl: int,
+        lease_ttl: float,
+    ) -> None:
+        """后台刷新 (stale-while-revalidate)"""
+        if key in self._inflight:
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._load(key, loader, expire, stale_ttl, lease_ttl, fallback=None)
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {key}: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    # ==================== L1 失效广播 ====================
+
+    def _invalidation_message(
+        self,
+        keys: list[str] | None = None,
+        pattern: str | None = None,
+    ) -> str:
+        """构造失效消息"""
+        return json.dumps({"node": self.node_id, "keys": keys or [], "pattern": pattern})
+
+    async def _invalidate_remote(
+        self,
+        keys: list[str] | None = None,
+        pattern: str | None = None,
+    ) -> None:
+        """失效本地 L1 并通知其他节点 (须在 Redis 写入完成后调用)"""
+        self._apply_invalidation(keys, pattern)
+        if self.local is None:
+            return
+        await self.redis.publish(
+            self.invalidation_channel,
+            self._invalidation_message(keys=keys, pattern=pattern),
+        )
+
+    def _apply_invalidation(
+        self,
+        keys: list[str] | None,
+        pattern: str | None,
+    ) -> None:
+        """在本地 L1 (及热点副本) 上执行失效"""
+        self._generation += 1
+        if self.hot_keys is not None:
+            self.hot_keys.forget(keys or [], pattern)
+        if self.local is None:
+            return
+        for key in keys or []:
+            self.local.delete(key)
+        if pattern:
+            self.local.delete_pattern(pattern)
+        self._stats.invalidations += 1
+
+    async def start_invalidation_listener(self) -> None:
+        """订阅失效频道 (应用启动时调用)"""
+        if self.local is None or self._listener_task is not None:
+            return
+        self._listener_task = asyncio.create_task(self._listen_invalidations())
+
+    async def stop_invalidation_listener(self) -> None:
+        """停止订阅失效频道 (应用关闭时调用)"""
+        if self._listener_task is None:
+            return
+        self._listener_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._listener_task
+        self._listener_task = None
+
+    async def close(self) -> None:
+        """停止失效订阅并关闭 Redis 客户端 (启用自动流水线时先发送排队的命令)"""
+        await self.stop_invalidation_listener()
+        await self.redis.aclose()
+
+    async def _listen_invalidations(self) -> None:
+        """监听失效消息, 连接中断后清空 L1 并重新订阅"""
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                async for message in pubsub.listen():
+                    self._handle_invalidation(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 断线期间可能丢失失效消息, L1 不再可信
+                logger.warning(f"Invalidation listener error: {e}")
+                self._generation += 1
+                if self.local is not None:
+                    self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+
+    def _handle_invalidation(self, data: Any) -> None:
+        """处理一条失效消息"""
+        if isinstance(data, bytes):
+            data = data.decode()
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        if payload.get("node") == self.node_id:
+            return
+        self._apply_invalidation(payload.get("keys"), payload.get("pattern"))
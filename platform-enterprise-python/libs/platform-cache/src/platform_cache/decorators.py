@@ -0,0 +1,234 @@
+"""Cache Decorators"""
+
+import functools
+import inspect
+import typing
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+
+try:
+    from platform_observability.metrics import default_registry
+except ImportError:  # 未安装 platform-cache[metrics] 时只保留进程内统计
+    default_registry = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from platform_cache.client import CacheClient
+
+
+_MODEL_UNRESOLVED = object()
+
+
+@dataclass
+class CachedFunctionStats:
+    """被缓存函数的命中统计"""
+
+    hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+# 函数全名 -> 命中统计
+_STATS: dict[str, CachedFunctionStats] = {}
+
+
+_CALLS = (
+    default_registry.counter(
+        "cached_function_calls_total",
+        "@cached function calls by cache result",
+        ["function", "result"],
+    )
+    if default_registry is not None
+    else None
+)
+
+
+def get_cached_stats() -> dict[str, CachedFunctionStats]:
+    """获取所有 @cached 函数的命中统计"""
+    return dict(_STATS)
+
+
+class CachedMethod:
+    """@cached 包装后的异步方法 (描述符, 按实例绑定)"""
+
+    def __init__(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        key: str,
+        *,
+        ttl: int | None,
+        negative_on: tuple[type[Exception], ...],
+        negative_ttl: int,
+        cache_attr: str,
+    ) -> None:
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.key = key
+        self.ttl = ttl
+        self.negative_on = negative_on
+        self.negative_ttl = negative_ttl
+        self.cache_attr = cache_attr
+        self.signature = inspect.signature(func)
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.stats = _STATS.setdefault(self.name, CachedFunctionStats())
+        self._model: Any = _MODEL_UNRESOLVED
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        return BoundCachedMethod(self, instance)
+
+    def make_key(self, instance: Any, *args: Any, **kwargs: Any) -> str:
+        """按键模板和调用参数生成缓存键 (缺省参数取函数默认值)"""
+        bound = self.signature.bind_partial(instance, *args, **kwargs)
+        bound.apply_defaults()
+        return self.key.format(**bound.arguments)
+
+    async def call(self, instance: Any, *args: Any, **kwargs: Any) -> Any:
+        """读缓存, 未命中时调用原函数并写回"""
+        cache: CacheClient | None = getattr(instance, self.cache_attr, None)
+        if cache is None:
+            return await self.func(instance, *args, **kwargs)
+
+        key = self.make_key(instance, *args, **kwargs)
+        entry = await cache.get(key)
+        if entry is not None:
+            if "e" in entry:
+                self.stats.negative_hits += 1
+                self._record("negative_hit")
+                raise self._restore_error(entry["e"], entry["m"])
+            self.stats.hits += 1
+            self._record("hit")
+            return self._restore(entry["v"])
+
+        self.stats.misses += 1
+        self._record("miss")
+        try:
+            value = await self.func(instance, *args, **kwargs)
+        except self.negative_on as e:
+            if self.negative_ttl > 0:
+                await cache.set(
+                    key,
+                    {"e": type(e).__name__, "m": str(e)},
+                    ttl=self.negative_ttl,
+                )
+            raise
+
+        await cache.set(key, {"v": self._dump(value)}, ttl=self.ttl)
+        return value
+
+    async def invalidate(self, instance: Any, **kwargs: Any) -> bool:
+        """删除指定参数对应的缓存"""
+        cache: CacheClient | None = getattr(instance, self.cache_attr, None)
+        if cache is None:
+            return False
+        return await cache.delete(self.make_key(instance, **kwargs))
+
+    def _record(self, result: str) -> None:
+        """导出到 platform_observability 指标, 按函数和结果打标签"""
+        if _CALLS is not None:
+            _CALLS.inc(function=self.name, result=result)
+
+    def _resolve_model(self) -> Any:
+        """从返回值注解推断 pydantic 模型 (首次调用时解析, 兼容字符串注解)"""
+        if self._model is _MODEL_UNRESOLVED:
+            try:
+                hint = typing.get_type_hints(self.func).get("return")
+            except Exception:
+                hint = None
+            self._model = hint if hasattr(hint, "model_validate") else None
+        return self._model
+
+    def _dump(self, value: Any) -> Any:
+        if self._resolve_model() is not None and hasattr(value, "model_dump"):
+            return value.model_dump(mode="json")
+        return value
+
+    def _restore(self, data: Any) -> Any:
+        model = self._resolve_model()
+        if model is not None and data is not None:
+            return model.model_validate(data)
+        return data
+
+    def _restore_error(self, name: str, message: str) -> Exception:
+        for exc_type in self.negative_on:
+            if exc_type.__name__ == name:
+                return exc_type(message)
+        return self.negative_on[0](message)
+
+
+class BoundCachedMethod:
+    """绑定到实例的 CachedMethod"""
+
+    def __init__(self, method: CachedMethod, instance: Any) -> None:
+        self._method = method
+        self._instance = instance
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Awaitable[Any]:
+        return self._method.call(self._instance, *args, **kwargs)
+
+    async def invalidate(self, **kwargs: Any) -> bool:
+        """删除指定参数对应的缓存, 如 service.get_profile.invalidate(user_id=...)"""
+        return await self._method.invalidate(self._instance, **kwargs)
+
+    @property
+    def stats(self) -> CachedFunctionStats:
+        return self._method.stats
+
+
+def cached(
+    key: str,
+    ttl: int | None = None,
+    *,
+    negative_on: tuple[type[Exception], ...] = (),
+    negative_ttl: int = 0,
+    cache_attr: str = "cache",
+) -> Callable[[Callable[..., Awaitable[Any]]], CachedMethod]:
+    """
+    缓存异步方法的返回值
+
+    缓存客户端从实例属性 cache_attr 读取, 为 None 时直接调用原方法。
+    返回值注解为 pydantic 模型时按 model_dump(mode="json") 存储、
+    model_validate 还原。
+
+    Args:
+        key: 键模板, 按参数名格式化, 如 "user:profile:{user_id}"
+        ttl: 过期时间 (秒), 默认使用 CacheClient.default_ttl
+        negative_on: 需要负缓存的异常类型 (如 NotFoundError)
+        negative_ttl: 负缓存过期时间 (秒), 为 0 时不缓存异常
+        cache_attr: 实例上缓存客户端的属性名
+
+    Example:
+        @cached("user:profile:{user_id}", ttl=300, negative_on=(NotFoundError,), negative_ttl=30)
+        async def get_profile(self, user_id: str) -> UserProfileResponse: ...
+
+        await self.get_profile.invalidate(user_id=user_id)
+    """
+    if negative_ttl and not negative_on:
+        raise ValueError("negative_ttl requires negative_on")
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> CachedMethod:
+        return CachedMethod(
+            func,
+            key,
+            ttl=ttl,
+            negative_on=negative_on,
+            negative_ttl=negative_ttl,
+            cache_attr=cache_attr,
+        )
+
+    return decorator
@@ -0,0 +1,402 @@
+"""Probabilistic Membership Filters - Bloom / Cuckoo
+
+用于"一定不存在"的快速判定: 返回 False 时值一定不存在, 可跳过数据库查询;
+返回 True 时可能存在 (存在误判), 需回源确认。
+"""
+
+import asyncio
+import contextlib
+import copy
+import hashlib
+import logging
+import math
+import random
+from array import array
+from collections.abc import AsyncIterable, Iterable
+from pathlib import Path
+
+from platform_cache.client import CacheClient
+
+
+logger = logging.getLogger(__name__)
+
+# BITFIELD / 本地批量写入的单批元素数
+_BATCH_SIZE = 1000
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> tuple[int, int]:
+    """按容量与误判率计算 (位数组大小, 哈希函数个数)"""
+    size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(size / capacity * math.log(2)))
+    return size, hashes
+
+
+def _hash_pair(item: str) -> tuple[int, int]:
+    """两个独立的 64 位哈希, 用于双重哈希派生 k 个位置"""
+    digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+async def _iterate(items: AsyncIterable[str] | Iterable[str]) -> AsyncIterable[str]:
+    """统一同步 / 异步可迭代对象"""
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+class _Snapshotting:
+    """本地过滤器的快照: 启动时加载, 运行期间周期写入文件"""
+
+    snapshot_path: Path | None
+    _snapshot_task: asyncio.Task[None] | None
+
+    def _dump(self) -> bytes:
+        raise NotImplementedError
+
+    def _restore(self, data: bytes) -> bool:
+        raise NotImplementedError
+
+    def load_snapshot(self) -> bool:
+        """从快照文件恢复, 文件不存在或参数不匹配时返回 False"""
+        if self.snapshot_path is None or not self.snapshot_path.exists():
+            return False
+        return self._restore(self.snapshot_path.read_bytes())
+
+    async def save_snapshot(self) -> None:
+        """原子写入快照文件"""
+        if self.snapshot_path is None:
+            return
+        data = self._dump()
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+
+        def write() -> None:
+            tmp_path.write_bytes(data)
+            tmp_path.replace(self.snapshot_path)
+
+        await asyncio.to_thread(write)
+
+    async def start_snapshots(self, interval: float = 60.0) -> None:
+        """开始周期写入快照"""
+        if self.snapshot_path is None or self._snapshot_task is not None:
+            return
+
+        async def loop() -> None:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.save_snapshot()
+                except OSError as e:
+                    logger.warning(f"Filter snapshot failed: {e}")
+
+        self._snapshot_task = asyncio.create_task(loop())
+
+    async def stop_snapshots(self) -> None:
+        """停止周期快照并写入最后一次"""
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._snapshot_task
+            self._snapshot_task = None
+        await self.save_snapshot()
+
+
+class BloomFilter(_Snapshotting):
+    """
+    布隆过滤器
+
+    传入 cache 时使用 Redis 位图 (多进程共享, 单次 BITFIELD 完成 k 个位的读写);
+    否则使用进程内 bytearray, 可通过 snapshot_path 周期快照到文件。
+
+    布隆过滤器不支持删除, 需要删除时使用 CuckooFilter 或定期 rebuild。
+
+    Redis 模式下 rebuild 会置位末位作为哨兵。位图被淘汰或清空后哨兵为 0,
+    此时 might_contain 一律返回 True (按可能存在回源), 直到再次 rebuild。
+
+    Args:
+        name: 过滤器名称 (Redis 键为 {prefix}:bloom:{name})
+        capacity: 预期元素数量
+        error_rate: 达到容量时的误判率
+        cache: 缓存客户端 (Redis 位图模式)
+        snapshot_path: 本地模式的快照文件
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        cache: CacheClient | None = None,
+        snapshot_path: str | Path | None = None,
+    ) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size, self.hashes = bloom_parameters(capacity, error_rate)
+        self.cache = cache
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._snapshot_task = None
+        self._key = cache._make_key(f"bloom:{name}") if cache else ""
+        # rebuild 期间的新增同时写入新位图, 避免切换后丢失
+        self._rebuild_key: str | None = None
+        self._bits = bytearray((self.size + 7) // 8) if cache is None else bytearray()
+
+    def _offsets(self, item: str) -> list[int]:
+        h1, h2 = _hash_pair(item)
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    async def add(self, item: str) -> None:
+        """加入元素"""
+        await self.add_many([item])
+
+    async def add_many(self, items: Iterable[str]) -> int:
+        """批量加入元素, 返回数量"""
+        count = 0
+        offsets: list[int] = []
+        for item in items:
+            offsets.extend(self._offsets(item))
+            count += 1
+            if len(offsets) >= _BATCH_SIZE * self.hashes:
+                await self._set_bits(offsets)
+                offsets = []
+        if offsets:
+            await self._set_bits(offsets)
+        return count
+
+    async def might_contain(self, item: str) -> bool:
+        """是否可能存在 (False 表示一定不存在)"""
+        offsets = self._offsets(item)
+        if self.cache is None:
+            return all(self._bits[offset >> 3] & (1 << (offset & 7)) for offset in offsets)
+
+        op = self.cache.redis.bitfield(self._key)
+        op.get("u1", self.size - 1)
+        for offset in offsets:
+            op.get("u1", offset)
+        sentinel, *bits = await op.execute()
+        # 哨兵为 0: 位图未由 rebuild 建立 (被淘汰 / 清空), 无法判定一定不存在
+        return not sentinel or all(bits)
+
+    async def is_initialized(self) -> bool:
+        """Redis 位图是否已由 rebuild 建立 (本地模式: 是否已有任何位被置位)"""
+        if self.cache is None:
+            return any(self._bits)
+        op = self.cache.redis.bitfield(self._key)
+        op.get("u1", self.size - 1)
+        (sentinel,) = await op.execute()
+        return bool(sentinel)
+
+    async def rebuild(self, items: AsyncIterable[str] | Iterable[str]) -> int:
+        """
+        从数据源重建 (如数据库全量扫描), 完成后原子替换
+
+        Returns:
+            写入的元素数量
+        """
+        if self.cache is None:
+            bits = bytearray(len(self._bits))
+            count = 0
+            async for item in _iterate(items):
+                for offset in self._offsets(item):
+                    bits[offset >> 3] |= 1 << (offset & 7)
+                count += 1
+            self._bits = bits
+            return count
+
+        rebuild_key = f"{self._key}:rebuild"
+        await self.cache.redis.delete(rebuild_key)
+        self._rebuild_key = rebuild_key
+        try:
+            count = 0
+            offsets: list[int] = []
+            async for item in _iterate(items):
+                offsets.extend(self._offsets(item))
+                count += 1
+                if len(offsets) >= _BATCH_SIZE * self.hashes:
+                    await self._set_bits(offsets, rebuild_key)
+                    offsets = []
+            # 写入末位哨兵, 标记位图已完整建立; 空数据源时也保证键存在
+            offsets.append(self.size - 1)
+            await self._set_bits(offsets, rebuild_key)
+            await self.cache.redis.rename(rebuild_key, self._key)
+        finally:
+            self._rebuild_key = None
+        return count
+
+    async def clear(self) -> None:
+        """清空"""
+        if self.cache is None:
+            self._bits = bytearray(len(self._bits))
+        else:
+            await self.cache.redis.delete(self._key)
+
+    async def _set_bits(self, offsets: list[int], key: str | None = None) -> None:
+        if self.cache is None:
+            for offset in offsets:
+                self._bits[offset >> 3] |= 1 << (offset & 7)
+            return
+
+        keys = [key] if key else [self._key, *filter(None, [self._rebuild_key])]
+        for target in keys:
+            op = self.cache.redis.bitfield(target)
+            for offset in offsets:
+                op.set("u1", offset, 1)
+            await op.execute()
+
+    def _dump(self) -> bytes:
+        header = f"{self.size}:{self.hashes}\n".encode()
+        return header + bytes(self._bits)
+
+    def _restore(self, data: bytes) -> bool:
+        header, _, bits = data.partition(b"\n")
+        if header != f"{self.size}:{self.hashes}".encode() or len(bits) != len(self._bits):
+            return False
+        self._bits = bytearray(bits)
+        return True
+
+
+class CuckooFilter(_Snapshotting):
+    """
+    布谷鸟过滤器 (进程内)
+
+    与布隆过滤器相比支持删除, 且在低误判率下更省空间。
+    每个元素在两个候选桶之一保存 fingerprint_bits 位指纹,
+    插入冲突时随机踢出已有指纹到其备用桶, 最多 max_kicks 次。
+
+    Args:
+        name: 过滤器名称
+        capacity: 预期元素数量
+        error_rate: 误判率 (决定指纹位数, 上限 32 位)
+        bucket_size: 每个桶的槽位数
+        max_kicks: 插入时的最大踢出次数
+        snapshot_path: 快照文件
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        *,
+        bucket_size: int = 4,
+        max_kicks: int = 500,
+        snapshot_path: str | Path | None = None,
+    ) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.bucket_size = bucket_size
+        self.max_kicks = max_kicks
+        self.fingerprint_bits = min(32, max(4, math.ceil(math.log2(2 * bucket_size / error_rate))))
+        # 桶数取 2 的幂, 使 i2 = i1 ^ hash(fp) 可逆
+        self.num_buckets = 1 << max(1, math.ceil(math.log2(capacity / bucket_size / 0.95)))
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._snapshot_task = None
+        self._typecode = "H" if self.fingerprint_bits <= 16 else "I"
+        self._slots = self._empty_slots()
+        self.count = 0
+
+    def _empty_slots(self) -> array:
+        itemsize = array(self._typecode).itemsize
+        return array(self._typecode, bytes(itemsize * self.num_buckets * self.bucket_size))
+
+    def _fingerprint_and_index(self, item: str) -> tuple[int, int]:
+        h1, h2 = _hash_pair(item)
+        fingerprint = (h2 >> 1) & ((1 << self.fingerprint_bits) - 1) or 1
+        return fingerprint, h1 & (self.num_buckets - 1)
+
+    def _alt_index(self, index: int, fingerprint: int) -> int:
+        h, _ = _hash_pair(str(fingerprint))
+        return (index ^ h) & (self.num_buckets - 1)
+
+    def _bucket(self, index: int) -> range:
+        start = index * self.bucket_size
+        return range(start, start + self.bucket_size)
+
+    def _insert_into(self, index: int, fingerprint: int) -> bool:
+        for slot in self._bucket(index):
+            if self._slots[slot] == 0:
+                self._slots[slot] = fingerprint
+                return True
+        return False
+
+    def _add(self, item: str) -> bool:
+        fingerprint, i1 = self._fingerprint_and_index(item)
+        i2 = self._alt_index(i1, fingerprint)
+        if self._insert_into(i1, fingerprint) or self._insert_into(i2, fingerprint):
+            self.count += 1
+            return True
+
+        index = random.choice((i1, i2))  # noqa: S311
+        for _ in range(self.max_kicks):
+            slot = random.choice(self._bucket(index))  # noqa: S311
+            fingerprint, self._slots[slot] = self._slots[slot], fingerprint
+            index = self._alt_index(index, fingerprint)
+            if self._insert_into(index, fingerprint):
+                self.count += 1
+                return True
+        # 已满: 最后被踢出的指纹丢失, 可能产生假阴性, 需扩容后 rebuild
+        logger.warning(f"Cuckoo filter {self.name} is full ({self.count} items)")
+        return False
+
+    async def add(self, item: str) -> bool:
+        """加入元素, 过滤器已满时返回 False"""
+        return self._add(item)
+
+    async def add_many(self, items: Iterable[str]) -> int:
+        """批量加入元素, 返回成功数量"""
+        return sum(1 for item in items if self._add(item))
+
+    async def might_contain(self, item: str) -> bool:
+        """是否可能存在 (False 表示一定不存在)"""
+        fingerprint, i1 = self._fingerprint_and_index(item)
+        i2 = self._alt_index(i1, fingerprint)
+        return any(self._slots[slot] == fingerprint for slot in (*self._bucket(i1), *self._bucket(i2)))
+
+    async def remove(self, item: str) -> bool:
+        """删除元素 (只能删除确实加入过的元素, 否则可能误删其他元素的指纹)"""
+        fingerprint, i1 = self._fingerprint_and_index(item)
+        i2 = self._alt_index(i1, fingerprint)
+        for slot in (*self._bucket(i1), *self._bucket(i2)):
+            if self._slots[slot] == fingerprint:
+                self._slots[slot] = 0
+                self.count -= 1
+                return True
+        return False
+
+    async def is_initialized(self) -> bool:
+        return self.count > 0
+
+    async def rebuild(self, items: AsyncIterable[str] | Iterable[str]) -> int:
+        """从数据源重建, 完成后替换"""
+        fresh = copy.copy(self)
+        fresh._slots = self._empty_slots()
+        fresh.count = 0
+        async for item in _iterate(items):
+            fresh._add(item)
+        self._slots, self.count = fresh._slots, fresh.count
+        return self.count
+
+    async def clear(self) -> None:
+        """清空"""
+        self._slots = self._empty_slots()
+        self.count = 0
+
+    def _dump(self) -> bytes:
+        header = f"{self.num_buckets}:{self.bucket_size}:{self.fingerprint_bits}:{self.count}\n".encode()
+        return header + self._slots.tobytes()
+
+    def _restore(self, data: bytes) -> bool:
+        header, _, slots = data.partition(b"\n")
+        expected = f"{self.num_buckets}:{self.bucket_size}:{self.fingerprint_bits}:"
+        text = header.decode()
+        if not text.startswith(expected):
+            return False
+        restored = array(self._typecode)
+        restored.frombytes(slots)
+        if len(restored) != len(self._slots):
+            return False
+        self._slots = restored
+        self.count = int(text[len(expected) :])
+        return True
@@ -0,0 +1,187 @@
+"""Hot Key Detection - Count-Min Sketch + Space-Saving Top-K"""
+
+import hashlib
+import random
+import time
+from dataclasses import dataclass
+
+from platform_cache.local import LocalCache
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch - 固定内存的频次估计 (只会高估, 不会低估)
+
+    Args:
+        width: 每行计数器数量 (误差约 e / width * 总数)
+        depth: 哈希行数 (误差超限的概率约 e^-depth)
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        self.width = width
+        self.depth = depth
+        self._rows = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[i * 4 : i * 4 + 4], "little") % self.width for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """累加计数, 返回累加后的估计值"""
+        estimate = None
+        for row, index in zip(self._rows, self._indexes(key), strict=True):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate or 0
+
+    def estimate(self, key: str) -> int:
+        """估计频次"""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key), strict=True))
+
+    def clear(self) -> None:
+        for row in self._rows:
+            row[:] = [0] * self.width
+
+
+class SpaceSaving:
+    """
+    Space-Saving 重点元素跟踪 - 最多保留 capacity 个候选键
+
+    表满时新键替换计数最小的键并继承其计数,
+    因此频次超过 总数 / capacity 的键一定会被保留。
+    """
+
+    def __init__(self, capacity: int = 100) -> None:
+        self.capacity = capacity
+        self._counts: dict[str, int] = {}
+
+    def offer(self, key: str, count: int = 1) -> None:
+        """记录一次访问"""
+        if key in self._counts:
+            self._counts[key] += count
+        elif len(self._counts) < self.capacity:
+            self._counts[key] = count
+        else:
+            victim = min(self._counts, key=self._counts.__getitem__)
+            self._counts[key] = self._counts.pop(victim) + count
+
+    def candidates(self) -> list[str]:
+        return list(self._counts)
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
+@dataclass(frozen=True)
+class HotKey:
+    """热点键"""
+
+    key: str
+    # 估计访问速率, 单位为次/秒, 已按采样率还原
+    rate: float
+
+    def to_dict(self) -> dict[str, float | str]:
+        return {"key": self.key, "rate": round(self.rate, 2)}
+
+
+class HotKeyDetector:
+    """
+    热点键检测器 - 采样访问键, 以 Count-Min Sketch 估计频次、Space-Saving 维护候选
+
+    内存占用固定: depth * width 个计数器 + capacity 个候选键。
+    统计按 window 秒滚动, 速率 = 当前窗口估计次数 / 采样率 / 已过秒数。
+
+    设置 promote_rate 后, 速率超过该值的键会被提升到短 TTL 的进程内缓存,
+    读请求不再访问 Redis; 其他节点的写入最多在 promote_ttl 秒后可见。
+
+    Args:
+        sample_rate: 采样比例 (0, 1]
+        top_k: 报告的热点键数量
+        window: 统计窗口 (秒)
+        width: Count-Min Sketch 宽度
+        depth: Count-Min Sketch 深度
+        capacity: Space-Saving 候选数量 (应大于 top_k)
+        promote_rate: 自动提升到本地缓存的速率阈值 (次/秒), None 表示不提升
+        promote_ttl: 提升后本地缓存的 TTL (秒)
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.01,
+        top_k: int = 20,
+        *,
+        window: float = 60.0,
+        width: int = 2048,
+        depth: int = 4,
+        capacity: int = 100,
+        promote_rate: float | None = None,
+        promote_ttl: float = 1.0,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.top_k = top_k
+        self.window = window
+        self.promote_rate = promote_rate
+        self.sketch = CountMinSketch(width, depth)
+        self.heavy_hitters = SpaceSaving(capacity)
+        self.promoted: LocalCache | None = None
+        if promote_rate is not None:
+            self.promoted = LocalCache(max_entries=top_k, ttl=promote_ttl)
+        self._hot: set[str] = set()
+        self._window_start = time.monotonic()
+
+    def _rate(self, count: int, now: float) -> float:
+        elapsed = max(now - self._window_start, 1.0)
+        return count / self.sample_rate / elapsed
+
+    def record(self, key: str) -> None:
+        """记录一次访问 (按 sample_rate 采样)"""
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:  # noqa: S311
+            return
+
+        now = time.monotonic()
+        if now - self._window_start >= self.window:
+            self._rotate(now)
+
+        count = self.sketch.add(key)
+        self.heavy_hitters.offer(key)
+        if self.promote_rate is not None and key not in self._hot and self._rate(count, now) >= self.promote_rate:
+            self._hot.add(key)
+
+    def is_hot(self, key: str) -> bool:
+        """键是否已被判定为热点 (仅在启用 promote_rate 时有效)"""
+        return key in self._hot
+
+    def hot_keys(self) -> list[HotKey]:
+        """当前窗口的 Top-K 热点键, 按速率降序"""
+        now = time.monotonic()
+        ranked = sorted(
+            ((self.sketch.estimate(key), key) for key in self.heavy_hitters.candidates()),
+            reverse=True,
+        )
+        return [HotKey(key, self._rate(count, now)) for count, key in ranked[: self.top_k]]
+
+    def forget(self, keys: list[str], pattern: str | None = None) -> None:
+        """丢弃已提升键的本地副本 (本节点写入或删除时调用)"""
+        if self.promoted is None:
+            return
+        for key in keys:
+            self.promoted.delete(key)
+        if pattern:
+            self.promoted.delete_pattern(pattern)
+
+    def clear(self) -> None:
+        """清空所有统计与提升的本地副本"""
+        self.sketch.clear()
+        self.heavy_hitters.clear()
+        self._hot.clear()
+        if self.promoted is not None:
+            self.promoted.clear()
+        self._window_start = time.monotonic()
+
+    def _rotate(self, now: float) -> None:
+        """开始新窗口 (已提升的副本按自身 TTL 过期)"""
+        self.sketch.clear()
+        self.heavy_hitters.clear()
+        self._hot.clear()
+        self._window_start = now
@@ -0,0 +1,130 @@
+"""In-Process Local Cache (L1)"""
+
+import fnmatch
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class CacheStats:
+    """缓存命中统计 (L1 本地 / L2 Redis)"""
+
+    l1_hits: int = 0
+    l1_misses: int = 0
+    l2_hits: int = 0
+    l2_misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def l1_hit_ratio(self) -> float:
+        """L1 命中率"""
+        total = self.l1_hits + self.l1_misses
+        return self.l1_hits / total if total else 0.0
+
+    @property
+    def l2_hit_ratio(self) -> float:
+        """L2 命中率"""
+        total = self.l2_hits + self.l2_misses
+        return self.l2_hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为字典"""
+        return {
+            **asdict(self),
+            "l1_hit_ratio": round(self.l1_hit_ratio, 4),
+            "l2_hit_ratio": round(self.l2_hit_ratio, 4),
+        }
+
+
+class LocalCache:
+    """进程内 LRU + TTL 缓存 - 同时受条目数和字节数限制
+
+    缓存的是解码后的对象本身, 调用方不应修改返回值。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 30.0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (expires_at, size, value)
+        self._data: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    @property
+    def size_bytes(self) -> int:
+        """当前占用字节数 (按编码后长度估算)"""
+        return self._bytes
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """获取缓存, 过期或不存在时返回 default"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= time.monotonic():
+            self._remove(key)
+            return default
+        self._data.move_to_end(key)
+        return entry[2]
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        size: int,
+        ttl: float | None = None,
+    ) -> None:
+        """写入缓存, 超过单条上限的值不缓存"""
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+        expire = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._remove(key)
+        self._data[key] = (time.monotonic() + expire, size, value)
+        self._bytes += size
+        self._evict()
+
+    def delete(self, key: str) -> bool:
+        """删除缓存"""
+        return self._remove(key)
+
+    def delete_pattern(self, pattern: str) -> int:
+        """删除匹配 glob 模式的缓存"""
+        keys = [k for k in self._data if fnmatch.fnmatchcase(k, pattern)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._data.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> bool:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1]
+        return True
+
+    def _evict(self) -> None:
+        """按 LRU 顺序淘汰直到满足限制"""
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size, _) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
@@ -0,0 +1,245 @@
+"""Redis Connection Manager - Named Blocking Pools"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from platform_cache.memory import InMemoryRedis, is_memory_url
+
+
+try:
+    from platform_observability.metrics import default_registry
+except ImportError:  # 未安装 platform-cache[metrics] 时不导出连接池指标
+    default_registry = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolConfig:
+    """连接池配置"""
+
+    max_connections: int = 50
+    # 获取连接的最长等待时间 (秒), 超时抛出 ConnectionError
+    timeout: float = 5.0
+    # 启动时预建的连接数
+    warmup: int = 0
+    decode_responses: bool = True
+    socket_timeout: float | None = 5.0
+
+
+@dataclass
+class PoolStats:
+    """连接池运行统计"""
+
+    max_connections: int
+    in_use: int = 0
+    idle: int = 0
+    acquired: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    @property
+    def avg_wait_ms(self) -> float:
+        return self.wait_seconds_total * 1000 / self.acquired if self.acquired else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": self.in_use,
+            "idle": self.idle,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.avg_wait_ms, 3),
+            "max_wait_ms": round(self.wait_seconds_max * 1000, 3),
+        }
+
+
+def default_pools(
+    max_connections: int = 50,
+    timeout: float = 5.0,
+    warmup: int = 0,
+) -> dict[str, PoolConfig]:
+    """默认连接池: cache (缓存) / streams (事件流) / ratelimit (限流, 等待更短)"""
+    return {
+        "cache": PoolConfig(max_connections, timeout, warmup),
+        # XREADGROUP BLOCK 需要长于 block 时间的读超时
+        "streams": PoolConfig(max(1, max_connections // 2), timeout, min(warmup, 2), socket_timeout=None),
+        "ratelimit": PoolConfig(max(1, max_connections // 2), min(timeout, 1.0), warmup),
+    }
+
+
+class _PoolMetrics:
+    """Prometheus 指标 (需安装 platform-observability, 否则为空操作)"""
+
+    def __init__(self) -> None:
+        self.enabled = default_registry is not None
+        if not self.enabled:
+            return
+
+        self.wait = default_registry.histogram(
+            "redis_pool_wait_seconds",
+            "Time spent waiting for a Redis connection",
+            ["pool"],
+            buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+        )
+        self.in_use = default_registry.gauge(
+            "redis_pool_connections_in_use",
+            "Redis connections checked out of the pool",
+            ["pool"],
+        )
+        self.idle = default_registry.gauge(
+            "redis_pool_connections_idle",
+            "Idle Redis connections in the pool",
+            ["pool"],
+        )
+        self.max = default_registry.gauge(
+            "redis_pool_max_connections",
+            "Configured Redis pool size",
+            ["pool"],
+        )
+        self.timeouts = default_registry.counter(
+            "redis_pool_timeouts_total",
+            "Redis connection acquisitions that timed out",
+            ["pool"],
+        )
+
+
+class InstrumentedBlockingConnectionPool(BlockingConnectionPool):
+    """记录等待时间与占用情况的阻塞连接池"""
+
+    def __init__(self, pool_name: str, metrics: _PoolMetrics | None = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.pool_name = pool_name
+        self.metrics = metrics
+        self.stats = PoolStats(max_connections=self.max_connections)
+
+    async def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except RedisConnectionError:
+            if time.perf_counter() - start >= (self.timeout or 0):
+                self.stats.timeouts += 1
+                if self.metrics is not None and self.metrics.enabled:
+                    self.metrics.timeouts.inc(pool=self.pool_name)
+            raise
+
+        wait = time.perf_counter() - start
+        self.stats.acquired += 1
+        self.stats.wait_seconds_total += wait
+        self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, wait)
+        if self.metrics is not None and self.metrics.enabled:
+            self.metrics.wait.observe(wait, pool=self.pool_name)
+        self._update_usage()
+        return connection
+
+    async def release(self, connection: Any) -> None:
+        await super().release(connection)
+        self._update_usage()
+
+    def _update_usage(self) -> None:
+        self.stats.in_use = len(self._in_use_connections)
+        self.stats.idle = len(self._available_connections)
+        if self.metrics is not None and self.metrics.enabled:
+            self.metrics.in_use.set(self.stats.in_use, pool=self.pool_name)
+            self.metrics.idle.set(self.stats.idle, pool=self.pool_name)
+
+
+class RedisManager:
+    """
+    Redis 连接管理器 - 按用途持有独立的命名连接池
+
+    各连接池使用 BlockingConnectionPool: 连接耗尽时在 timeout 内等待空闲连接,
+    而不是像默认连接池那样无上限地新建连接。等待时间、占用数与超时次数
+    记录在 stats() 中, 安装 platform-observability 时同时导出 Prometheus 指标。
+
+    url 为 memory:// (或 memory://<name>) 时各连接池共享同一进程内键空间
+    (见 InMemoryRedis), 用于单节点部署与脱离 Redis 的压测。
+
+    Args:
+        url: Redis URL
+        pools: 连接池名称 -> 配置, 默认为 cache / streams / ratelimit
+
+    Example:
+        manager = RedisManager(settings.redis_url)
+        await manager.warm_up()
+        cache = CacheClient(manager.client("cache"))
+    """
+
+    def __init__(self, url: str, pools: dict[str, PoolConfig] | None = None) -> None:
+        self.url = url
+        self.pools = pools or default_pools()
+        self._metrics = _PoolMetrics()
+        self._clients: dict[str, Redis] = {}
+        self.in_memory = is_memory_url(url)
+        for name, config in self.pools.items():
+            if self.in_memory:
+                self._clients[name] = InMemoryRedis.from_url(url, decode_responses=config.decode_responses)
+                continue
+            pool = InstrumentedBlockingConnectionPool.from_url(
+                url,
+                pool_name=name,
+                metrics=self._metrics,
+                max_connections=config.max_connections,
+                timeout=config.timeout,
+                decode_responses=config.decode_responses,
+                socket_connect_timeout=5,
+                socket_timeout=config.socket_timeout,
+                retry_on_timeout=True,
+            )
+            if self._metrics.enabled:
+                self._metrics.max.set(config.max_connections, pool=name)
+            self._clients[name] = Redis(connection_pool=pool)
+
+    def client(self, name: str = "cache") -> Redis:
+        """获取命名连接池对应的客户端"""
+        try:
+            return self._clients[name]
+        except KeyError:
+            raise KeyError(f"Unknown Redis pool: {name}") from None
+
+    async def warm_up(self) -> None:
+        """按 PoolConfig.warmup 预建连接, 避免首批请求承担建连延迟"""
+        if self.in_memory:
+            return
+        for name, config in self.pools.items():
+            count = min(config.warmup, config.max_connections)
+            if count <= 0:
+                continue
+            pool = self._clients[name].connection_pool
+            results = await asyncio.gather(
+                *(pool.get_connection("PING") for _ in range(count)),
+                return_exceptions=True,
+            )
+            opened = 0
+            for result in results:
+                if isinstance(result, BaseException):
+                    continue
+                await pool.release(result)
+                opened += 1
+            if opened < count:
+                # Redis 暂不可用时不阻止启动, 连接在首次使用时建立
+                logger.warning(f"Redis pool '{name}' warm-up opened {opened}/{count} connections")
+            else:
+                logger.info(f"Redis pool '{name}' warmed up with {count} connections")
+
+    def stats(self) -> dict[str, PoolStats]:
+        """各连接池的运行统计 (进程内后端无连接池, 返回空字典)"""
+        if self.in_memory:
+            return {}
+        return {name: client.connection_pool.stats for name, client in self._clients.items()}
+
+    async def close(self) -> None:
+        """关闭所有连接池"""
+        for client in self._clients.values():
+            await client.aclose()
+            if not self.in_memory:
+                await client.connection_pool.disconnect()
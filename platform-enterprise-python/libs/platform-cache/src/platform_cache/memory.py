@@ -0,0 +1,1336 @@
+"""In-Memory Redis Backend - Single-Node Mode"""
+
+import asyncio
+import bisect
+import fnmatch
+import hashlib
+import math
+import re
+import time
+from collections.abc import AsyncIterator, Callable
+from datetime import timedelta
+from typing import Any
+
+from redis.exceptions import DataError, NoScriptError, ResponseError
+
+
+MEMORY_SCHEME = "memory://"
+
+_WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+# 近似裁剪 (MAXLEN ~) 时允许超出的条目数, 摊薄裁剪开销
+_TRIM_SLACK = 100
+
+_MAX_ID = (2**64 - 1, 2**64 - 1)
+
+StreamId = tuple[int, int]
+
+# 脚本处理函数: (client, keys, args) -> 返回值
+ScriptHandler = Callable[["InMemoryRedis", list[str], list[Any]], Any]
+
+_SCRIPT_HANDLERS: dict[str, ScriptHandler] = {}
+
+
+def is_memory_url(url: str) -> bool:
+    """是否为进程内后端 URL (memory:// 或 memory://<name>)"""
+    return url.startswith(MEMORY_SCHEME)
+
+
+def register_script_handler(script: str, handler: ScriptHandler) -> None:
+    """
+    为 Lua 脚本注册等价的 Python 实现 (进程内后端不执行 Lua)
+
+    handler 同步执行, 期间不会穿插其他命令, 与 Redis 中脚本的原子性一致。
+    handler 通过 client.run_command() 调用命令, 参数与 redis-py 方法一致。
+    """
+    _SCRIPT_HANDLERS[_sha1(script)] = handler
+
+
+def _sha1(script: str) -> str:
+    return hashlib.sha1(script.encode(), usedforsecurity=False).hexdigest()
+
+
+def _encode(value: Any) -> bytes:
+    """按 redis-py 的规则编码参数"""
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode()
+    if isinstance(value, bool):
+        raise DataError("Invalid input of type: 'bool'. Convert to a bytes, string, int or float first.")
+    if isinstance(value, int | float):
+        return repr(value).encode()
+    if isinstance(value, memoryview | bytearray):
+        return bytes(value)
+    raise DataError(f"Invalid input of type: '{type(value).__name__}'. Convert to a bytes, string, int or float first.")
+
+
+def _key(name: str | bytes) -> str:
+    return name.decode() if isinstance(name, bytes) else name
+
+
+def _seconds(value: int | float | timedelta) -> float:
+    return value.total_seconds() if isinstance(value, timedelta) else float(value)
+
+
+def _to_int(value: bytes) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ResponseError("ERR value is not an integer or out of range") from None
+
+
+def _matcher(pattern: str | bytes | None) -> Callable[[str], Any] | None:
+    """将 Redis glob 模式编译为匹配函数"""
+    if pattern is None:
+        return None
+    return re.compile(fnmatch.translate(_key(pattern)), re.DOTALL).match
+
+
+def _format_id(stream_id: StreamId) -> str:
+    return f"{stream_id[0]}-{stream_id[1]}"
+
+
+def _parse_id(value: Any, default_seq: int = 0) -> StreamId:
+    text = value.decode() if isinstance(value, bytes) else str(value)
+    ms, _, seq = text.partition("-")
+    try:
+        return int(ms), int(seq) if seq else default_seq
+    except ValueError:
+        raise ResponseError("ERR Invalid stream ID specified as stream command argument") from None
+
+
+def _parse_range(value: Any, upper: bool) -> StreamId:
+    """解析 XRANGE / XPENDING 的范围边界 (支持 - + 与 ( 开区间)"""
+    text = value.decode() if isinstance(value, bytes) else str(value)
+    if text == "-":
+        return (0, 0)
+    if text == "+":
+        return _MAX_ID
+    if text.startswith("("):
+        ms, seq = _parse_id(text[1:], _MAX_ID[1] if upper else 0)
+        if upper:
+            return (ms, seq - 1) if seq else (ms - 1, _MAX_ID[1])
+        return (ms, seq + 1) if seq < _MAX_ID[1] else (ms + 1, 0)
+    return _parse_id(text, _MAX_ID[1] if upper else 0)
+
+
+class _TimerWheel:
+    """
+    时间轮 - 按过期时刻将键放入 slots 个槽位之一, 每 tick 秒推进一格
+
+    调度与推进均为 O(1) (每格的键数摊销), 不为每个键创建定时任务。
+    过期时刻超过一圈的键在经过槽位时重新放回;
+    TTL 被修改的键留在旧槽位中的记录在推进时按实际过期时刻校正。
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512) -> None:
+        self.tick = tick
+        self._slots: list[set[str]] = [set() for _ in range(slots)]
+        self._cursor = int(time.monotonic() / tick)
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """登记键的过期时刻 (time.monotonic())"""
+        tick = max(math.ceil(deadline / self.tick), self._cursor + 1)
+        self._slots[tick % len(self._slots)].add(key)
+
+    def advance(self, now: float) -> list[str]:
+        """推进到 now, 返回经过槽位中的候选键"""
+        target = int(now / self.tick)
+        steps = min(target - self._cursor, len(self._slots))
+        due: list[str] = []
+        for tick in range(target - steps + 1, target + 1):
+            slot = self._slots[tick % len(self._slots)]
+            if slot:
+                due.extend(slot)
+                slot.clear()
+        self._cursor = max(self._cursor, target)
+        return due
+
+    def clear(self) -> None:
+        for slot in self._slots:
+            slot.clear()
+
+
+class _ConsumerGroup:
+    """消费者组状态"""
+
+    __slots__ = ("consumers", "entries_read", "last_id", "pending")
+
+    def __init__(self, last_id: StreamId) -> None:
+        self.last_id = last_id
+        # 待确认列表 (PEL): 消息 ID -> [消费者, 投递时刻 (ms), 投递次数]
+        self.pending: dict[StreamId, list[Any]] = {}
+        # 消费者 -> 最近活动时刻 (ms)
+        self.consumers: dict[bytes, float] = {}
+        self.entries_read = 0
+
+
+class _Stream:
+    """Stream 状态 (条目按 ID 有序)"""
+
+    __slots__ = ("entries", "entries_added", "groups", "ids", "last_id")
+
+    def __init__(self) -> None:
+        self.ids: list[StreamId] = []
+        self.entries: dict[StreamId, dict[bytes, bytes]] = {}
+        self.last_id: StreamId = (0, 0)
+        self.entries_added = 0
+        self.groups: dict[bytes, _ConsumerGroup] = {}
+
+    def trim(self, count: int) -> int:
+        """删除最早的 count 条"""
+        if count <= 0:
+            return 0
+        for stream_id in self.ids[:count]:
+            del self.entries[stream_id]
+        del self.ids[:count]
+        return count
+
+    def range(self, start: StreamId, end: StreamId) -> list[StreamId]:
+        return self.ids[bisect.bisect_left(self.ids, start) : bisect.bisect_right(self.ids, end)]
+
+
+class MemoryStore:
+    """
+    进程内键空间 - 同一 memory://<name> 的所有客户端共享
+
+    仅在单个事件循环中使用 (与 asyncio 客户端相同), 所有命令同步执行,
+    因此单条命令、Pipeline 与脚本天然具备原子性。
+    过期采用惰性删除 (访问时检查) + 时间轮后台清理。
+
+    Args:
+        tick: 时间轮推进间隔 (秒), 即过期键被后台回收的最大延迟
+        slots: 时间轮槽位数
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512) -> None:
+        self.data: dict[str, Any] = {}
+        # 键 -> 过期时刻 (time.monotonic())
+        self.expires: dict[str, float] = {}
+        self.wheel = _TimerWheel(tick, slots)
+        self.channels: dict[bytes, set[_PubSub]] = {}
+        self.scripts: set[str] = set()
+        self._stream_waiters: dict[str, set[asyncio.Future[None]]] = {}
+        self._reaper: asyncio.Task[None] | None = None
+        self.expired_keys = 0
+
+    # ==================== 过期 ====================
+
+    def lookup(self, key: str) -> Any | None:
+        """读取键值 (已过期则删除并返回 None)"""
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.remove(key)
+            self.expired_keys += 1
+            return None
+        return self.data.get(key)
+
+    def remove(self, key: str) -> bool:
+        self.expires.pop(key, None)
+        return self.data.pop(key, None) is not None
+
+    def set_expiry(self, key: str, seconds: float) -> None:
+        deadline = time.monotonic() + seconds
+        self.expires[key] = deadline
+        self.wheel.schedule(key, deadline)
+        self._ensure_reaper()
+
+    def persist(self, key: str) -> bool:
+        return self.expires.pop(key, None) is not None
+
+    def remaining(self, key: str) -> float | None:
+        """剩余生存时间 (秒), 无过期时间返回 None"""
+        deadline = self.expires.get(key)
+        return None if deadline is None else deadline - time.monotonic()
+
+    def expire_due(self) -> int:
+        """回收时间轮上已到期的键, 返回回收数量"""
+        now = time.monotonic()
+        expired = 0
+        for key in self.wheel.advance(now):
+            deadline = self.expires.get(key)
+            if deadline is None:
+                continue
+            if deadline <= now:
+                self.remove(key)
+                expired += 1
+            else:
+                self.wheel.schedule(key, deadline)
+        self.expired_keys += expired
+        return expired
+
+    def _ensure_reaper(self) -> None:
+        """按需启动后台回收任务 (没有运行中的事件循环时只做惰性过期)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._reaper is not None and not self._reaper.done() and self._reaper.get_loop() is loop:
+            return
+        self._reaper = loop.create_task(self._reap())
+
+    async def _reap(self) -> None:
+        while self.expires:
+            await asyncio.sleep(self.wheel.tick)
+            self.expire_due()
+
+    def flush(self) -> None:
+        self.data.clear()
+        self.expires.clear()
+        self.wheel.clear()
+
+    # ==================== Stream 阻塞读取 ====================
+
+    def notify_stream(self, key: str) -> None:
+        for waiter in self._stream_waiters.pop(key, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def wait_streams(self, keys: list[str], timeout: float | None) -> bool:
+        """等待任一 Stream 写入新条目, 超时返回 False"""
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        for key in keys:
+            self._stream_waiters.setdefault(key, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            for key in keys:
+                waiters = self._stream_waiters.get(key)
+                if waiters is not None:
+                    waiters.discard(waiter)
+                    if not waiters:
+                        del self._stream_waiters[key]
+
+
+_stores: dict[str, MemoryStore] = {}
+
+
+def get_memory_store(name: str = "") -> MemoryStore:
+    """获取 (或创建) 命名的进程内键空间"""
+    store = _stores.get(name)
+    if store is None:
+        store = _stores[name] = MemoryStore()
+    return store
+
+
+class InMemoryRedis:
+    """
+    进程内 Redis 替代 - 实现 CacheClient / 限流器 / 事件发布与消费用到的命令子集
+
+    支持: 字符串 (TTL / INCR / BITFIELD)、哈希、集合、SCAN、Pub/Sub、Pipeline、
+    Stream (消费者组 / 待确认列表 / XACK / XCLAIM / 阻塞 XREADGROUP)。
+    Lua 脚本需通过 register_script_handler() 注册等价的 Python 实现。
+
+    命令签名与返回值与 redis.asyncio.Redis 一致, 可直接传给 CacheClient、
+    EventPublisher、EventConsumer。数据仅存在于当前进程, 只适用于单节点部署与基准测试。
+
+    Args:
+        store: 键空间, 默认为 memory:// 对应的共享键空间
+        decode_responses: 是否将返回值解码为 str
+
+    Example:
+        redis = InMemoryRedis.from_url("memory://", decode_responses=True)
+        cache = CacheClient(redis)
+    """
+
+    def __init__(self, store: MemoryStore | None = None, decode_responses: bool = False) -> None:
+        self.store = store if store is not None else get_memory_store()
+        self.decode_responses = decode_responses
+
+    @classmethod
+    def from_url(cls, url: str, decode_responses: bool = False, **kwargs: Any) -> "InMemoryRedis":
+        """按 memory://<name> 创建客户端 (其余连接参数忽略)"""
+        if not is_memory_url(url):
+            raise ValueError(f"Not a memory:// URL: {url}")
+        return cls(get_memory_store(url[len(MEMORY_SCHEME) :].strip("/")), decode_responses)
+
+    def __getattr__(self, name: str) -> Any:
+        command = _COMMANDS.get(name)
+        if command is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        async def run(*args: Any, **kwargs: Any) -> Any:
+            return command(self, *args, **kwargs)
+
+        run.__name__ = name
+        # 缓存包装函数, 后续调用不再经过 __getattr__
+        self.__dict__[name] = run
+        return run
+
+    def run_command(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """同步执行命令 (供脚本处理函数使用)"""
+        command = _COMMANDS.get(name.lower())
+        if command is None:
+            raise ResponseError(f"ERR unknown command '{name}'")
+        return command(self, *args, **kwargs)
+
+    def _out(self, value: bytes | None) -> Any:
+        if value is None or not self.decode_responses:
+            return value
+        return value.decode()
+
+    def _key_out(self, key: str) -> str | bytes:
+        return key if self.decode_responses else key.encode()
+
+    def _typed(self, name: str | bytes, kind: type) -> Any | None:
+        """读取指定类型的值, 类型不符时抛出 WRONGTYPE"""
+        value = self.store.lookup(_key(name))
+        if value is not None and not isinstance(value, kind):
+            raise ResponseError(_WRONGTYPE)
+        return value
+
+    # ==================== 通用 ====================
+
+    def _cmd_ping(self) -> bool:
+        return True
+
+    def _cmd_time(self) -> tuple[int, int]:
+        now = time.time()
+        return int(now), int(now * 1_000_000) % 1_000_000
+
+    def _cmd_delete(self, *names: str | bytes) -> int:
+        deleted = 0
+        for name in names:
+            key = _key(name)
+            if self.store.lookup(key) is not None:
+                self.store.remove(key)
+                deleted += 1
+        return deleted
+
+    _cmd_unlink = _cmd_delete
+
+    def _cmd_exists(self, *names: str | bytes) -> int:
+        return sum(1 for name in names if self.store.lookup(_key(name)) is not None)
+
+    def _cmd_type(self, name: str | bytes) -> str | bytes:
+        value = self.store.lookup(_key(name))
+        kind = {
+            bytes: "string",
+            bytearray: "string",
+            dict: "hash",
+            set: "set",
+            _Stream: "stream",
+        }.get(type(value), "none")
+        return kind if self.decode_responses else kind.encode()
+
+    def _cmd_expire(
+        self,
+        name: str | bytes,
+        time: int | timedelta,
+        nx: bool = False,
+        xx: bool = False,
+        gt: bool = False,
+        lt: bool = False,
+    ) -> bool:
+        return self._expire(_key(name), _seconds(time), nx, xx, gt, lt)
+
+    def _cmd_pexpire(
+        self,
+        name: str | bytes,
+        time: int | timedelta,
+        nx: bool = False,
+        xx: bool = False,
+        gt: bool = False,
+        lt: bool = False,
+    ) -> bool:
+        ms = time.total_seconds() * 1000 if isinstance(time, timedelta) else float(time)
+        return self._expire(_key(name), ms / 1000, nx, xx, gt, lt)
+
+    def _expire(self, key: str, seconds: float, nx: bool, xx: bool, gt: bool, lt: bool) -> bool:
+        if self.store.lookup(key) is None:
+            return False
+        current = self.store.remaining(key)
+        if nx and current is not None:
+            return False
+        if xx and current is None:
+            return False
+        # 无过期时间视为无限长
+        if gt and (current is None or seconds <= current):
+            return False
+        if lt and current is not None and seconds >= current:
+            return False
+        if seconds <= 0:
+            self.store.remove(key)
+        else:
+            self.store.set_expiry(key, seconds)
+        return True
+
+    def _cmd_persist(self, name: str | bytes) -> bool:
+        key = _key(name)
+        return self.store.lookup(key) is not None and self.store.persist(key)
+
+    def _cmd_ttl(self, name: str | bytes) -> int:
+        key = _key(name)
+        if self.store.lookup(key) is None:
+            return -2
+        remaining = self.store.remaining(key)
+        return -1 if remaining is None else max(0, round(remaining))
+
+    def _cmd_pttl(self, name: str | bytes) -> int:
+        key = _key(name)
+        if self.store.lookup(key) is None:
+            return -2
+        remaining = self.store.remaining(key)
+        return -1 if remaining is None else max(0, round(remaining * 1000))
+
+    def _cmd_rename(self, src: str | bytes, dst: str | bytes) -> bool:
+        src_key, dst_key = _key(src), _key(dst)
+        value = self.store.lookup(src_key)
+        if value is None:
+            raise ResponseError("ERR no such key")
+        remaining = self.store.remaining(src_key)
+        self.store.remove(src_key)
+        self.store.remove(dst_key)
+        self.store.data[dst_key] = value
+        if remaining is not None:
+            self.store.set_expiry(dst_key, remaining)
+        return True
+
+    def _cmd_keys(self, pattern: str | bytes = "*") -> list[Any]:
+        match = _matcher(pattern)
+        return [
+            self._key_out(key) for key in list(self.store.data) if match(key) and self.store.lookup(key) is not None
+        ]
+
+    def _cmd_dbsize(self) -> int:
+        return len(self.store.data)
+
+    def _cmd_flushdb(self, asynchronous: bool = False) -> bool:
+        self.store.flush()
+        return True
+
+    _cmd_flushall = _cmd_flushdb
+
+    async def scan_iter(
+        self,
+        match: str | bytes | None = None,
+        count: int | None = None,
+        _type: str | None = None,
+    ) -> AsyncIterator[Any]:
+        """遍历键空间 (基于快照, 遍历期间新增的键可能不出现)"""
+        matcher = _matcher(match)
+        for index, key in enumerate(list(self.store.data)):
+            if count and index and index % count == 0:
+                # 与 SCAN 分批相同, 给其他协程执行的机会
+                await asyncio.sleep(0)
+            if matcher is not None and not matcher(key):
+                continue
+            value = self.store.lookup(key)
+            if value is None:
+                continue
+            if _type is not None and self._cmd_type(key) != (_type if self.decode_responses else _type.encode()):
+                continue
+            yield self._key_out(key)
+
+    # ==================== 字符串 ====================
+
+    def _cmd_get(self, name: str | bytes) -> Any:
+        value = self._typed(name, bytes | bytearray)
+        return None if value is None else self._out(bytes(value))
+
+    def _cmd_mget(self, keys: Any, *args: Any) -> list[Any]:
+        names = [keys] if isinstance(keys, str | bytes) else list(keys)
+        return [self._cmd_get(name) for name in [*names, *args]]
+
+    def _cmd_set(
+        self,
+        name: str | bytes,
+        value: Any,
+        ex: int | timedelta | None = None,
+        px: int | timedelta | None = None,
+        nx: bool = False,
+        xx: bool = False,
+        keepttl: bool = False,
+        get: bool = False,
+    ) -> Any:
+        key = _key(name)
+        old = self.store.lookup(key)
+        if get and old is not None and not isinstance(old, bytes | bytearray):
+            raise ResponseError(_WRONGTYPE)
+        previous = self._out(bytes(old)) if get and old is not None else None
+        if (nx and old is not None) or (xx and old is None):
+            return previous if get else None
+
+        remaining = self.store.remaining(key) if keepttl else None
+        self.store.remove(key)
+        self.store.data[key] = _encode(value)
+        if ex is not None:
+            self.store.set_expiry(key, _seconds(ex))
+        elif px is not None:
+            self.store.set_expiry(key, px.total_seconds() if isinstance(px, timedelta) else px / 1000)
+        elif remaining is not None:
+            self.store.set_expiry(key, remaining)
+        return previous if get else True
+
+    def _cmd_setex(self, name: str | bytes, time: int | timedelta, value: Any) -> bool:
+        return self._cmd_set(name, value, ex=time)
+
+    def _cmd_incrby(self, name: str | bytes, amount: int = 1) -> int:
+        key = _key(name)
+        value = self._typed(key, bytes | bytearray)
+        result = (0 if value is None else _to_int(value)) + amount
+        self.store.data[key] = str(result).encode()
+        return result
+
+    _cmd_incr = _cmd_incrby
+
+    def _cmd_decrby(self, name: str | bytes, amount: int = 1) -> int:
+        return self._cmd_incrby(name, -amount)
+
+    _cmd_decr = _cmd_decrby
+
+    def bitfield(self, key: str | bytes, default_overflow: str | None = None) -> "_BitField":
+        """BITFIELD 构造器 (支持 GET / SET / INCRBY, 溢出按 WRAP 处理)"""
+        return _BitField(self, _key(key))
+
+    # ==================== 哈希 ====================
+
+    def _cmd_hget(self, name: str | bytes, key: str | bytes) -> Any:
+        mapping = self._typed(name, dict)
+        return None if mapping is None else self._out(mapping.get(_encode(key)))
+
+    def _cmd_hmget(self, name: str | bytes, keys: Any, *args: Any) -> list[Any]:
+        fields = [keys] if isinstance(keys, str | bytes) else list(keys)
+        mapping = self._typed(name, dict) or {}
+        return [self._out(mapping.get(_encode(field))) for field in [*fields, *args]]
+
+    def _cmd_hgetall(self, name: str | bytes) -> dict[Any, Any]:
+        mapping = self._typed(name, dict) or {}
+        return {self._out(field): self._out(value) for field, value in mapping.items()}
+
+    def _cmd_hset(
+        self,
+        name: str | bytes,
+        key: str | bytes | None = None,
+        value: Any = None,
+        mapping: dict[Any, Any] | None = None,
+        items: list[Any] | None = None,
+    ) -> int:
+        pairs: list[tuple[Any, Any]] = []
+        if key is not None:
+            pairs.append((key, value))
+        if mapping:
+            pairs.extend(mapping.items())
+        if items:
+            pairs.extend(zip(items[::2], items[1::2], strict=True))
+        if not pairs:
+            raise DataError("'hset' with no key value pairs")
+
+        hash_key = _key(name)
+        current = self._typed(hash_key, dict)
+        if current is None:
+            current = self.store.data[hash_key] = {}
+        added = 0
+        for field, field_value in pairs:
+            encoded = _encode(field)
+            added += encoded not in current
+            current[encoded] = _encode(field_value)
+        return added
+
+    def _cmd_hdel(self, name: str | bytes, *keys: str | bytes) -> int:
+        hash_key = _key(name)
+        mapping = self._typed(hash_key, dict)
+        if mapping is None:
+            return 0
+        deleted = sum(1 for field in keys if mapping.pop(_encode(field), None) is not None)
+        if not mapping:
+            self.store.remove(hash_key)
+        return deleted
+
+    def _cmd_hincrby(self, name: str | bytes, key: str | bytes, amount: int = 1) -> int:
+        hash_key = _key(name)
+        mapping = self._typed(hash_key, dict)
+        if mapping is None:
+            mapping = self.store.data[hash_key] = {}
+        field = _encode(key)
+        result = _to_int(mapping.get(field, b"0")) + amount
+        mapping[field] = str(result).encode()
+        return result
+
+    def _cmd_hexists(self, name: str | bytes, key: str | bytes) -> bool:
+        return _encode(key) in (self._typed(name, dict) or {})
+
+    def _cmd_hlen(self, name: str | bytes) -> int:
+        return len(self._typed(name, dict) or {})
+
+    # ==================== 集合 ====================
+
+    def _cmd_sadd(self, name: str | bytes, *values: Any) -> int:
+        key = _key(name)
+        members = self._typed(key, set)
+        if members is None:
+            members = self.store.data[key] = set()
+        before = len(members)
+        members.update(_encode(value) for value in values)
+        return len(members) - before
+
+    def _cmd_srem(self, name: str | bytes, *values: Any) -> int:
+        key = _key(name)
+        members = self._typed(key, set)
+        if members is None:
+            return 0
+        before = len(members)
+        members.difference_update(_encode(value) for value in values)
+        if not members:
+            self.store.remove(key)
+        return before - len(members)
+
+    def _cmd_smembers(self, name: str | bytes) -> set[Any]:
+        return {self._out(member) for member in self._typed(name, set) or ()}
+
+    def _cmd_sismember(self, name: str | bytes, value: Any) -> bool:
+        return _encode(value) in (self._typed(name, set) or ())
+
+    def _cmd_scard(self, name: str | bytes) -> int:
+        return len(self._typed(name, set) or ())
+
+    async def sscan_iter(
+        self,
+        name: str | bytes,
+        match: str | bytes | None = None,
+        count: int | None = None,
+    ) -> AsyncIterator[Any]:
+        """遍历集合成员"""
+        matcher = _matcher(match)
+        for member in list(self._typed(name, set) or ()):
+            if matcher is None or matcher(member.decode(errors="replace")):
+                yield self._out(member)
+
+    # ==================== Pub/Sub ====================
+
+    def _cmd_publish(self, channel: str | bytes, message: Any) -> int:
+        subscribers = self.store.channels.get(_encode(channel), ())
+        data = _encode(message)
+        for pubsub in subscribers:
+            pubsub.deliver(_encode(channel), data)
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False, **kwargs: Any) -> "_PubSub":
+        return _PubSub(self, ignore_subscribe_messages)
+
+    # ==================== Pipeline / 脚本 ====================
+
+    def pipeline(self, transaction: bool = True, shard_hint: Any = None) -> "_Pipeline":
+        """命令在 execute() 时依次同步执行, transaction 参数仅为兼容保留"""
+        return _Pipeline(self)
+
+    def register_script(self, script: str) -> "_Script":
+        return _Script(self, script)
+
+    def _cmd_script_load(self, script: str) -> str:
+        sha = _sha1(script)
+        self.store.scripts.add(sha)
+        return sha
+
+    def _cmd_evalsha(self, sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+        # 与 Redis 一致, 未经 SCRIPT LOAD / EVAL 缓存的脚本返回 NOSCRIPT
+        if sha not in self.store.scripts:
+            raise NoScriptError("No matching script. Please use EVAL.")
+        handler = _SCRIPT_HANDLERS.get(sha)
+        if handler is None:
+            raise ResponseError("ERR Lua scripting is not supported by the in-memory backend")
+        keys = [_key(key) for key in keys_and_args[:numkeys]]
+        return handler(self, keys, list(keys_and_args[numkeys:]))
+
+    def _cmd_eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        sha = _sha1(script)
+        self.store.scripts.add(sha)
+        return self._cmd_evalsha(sha, numkeys, *keys_and_args)
+
+    # ==================== Stream ====================
+
+    def _stream(self, name: str | bytes, create: bool = False) -> _Stream | None:
+        key = _key(name)
+        stream = self._typed(key, _Stream)
+        if stream is None and create:
+            stream = self.store.data[key] = _Stream()
+        return stream
+
+    def _group(self, name: str | bytes, groupname: str | bytes, command: str) -> tuple[_Stream, _ConsumerGroup]:
+        stream = self._stream(name)
+        group = stream.groups.get(_encode(groupname)) if stream is not None else None
+        if stream is None or group is None:
+            raise ResponseError(
+                f"NOGROUP No such key '{_key(name)}' or consumer group '{_key(groupname)}' in {command}"
+            )
+        return stream, group
+
+    def _entry_out(self, stream: _Stream, stream_id: StreamId) -> tuple[Any, Any]:
+        fields = stream.entries.get(stream_id)
+        if fields is not None:
+            fields = {self._out(field): self._out(value) for field, value in fields.items()}
+        return self._out(_format_id(stream_id).encode()), fields
+
+    def _cmd_xadd(
+        self,
+        name: str | bytes,
+        fields: dict[Any, Any],
+        id: str | bytes = "*",
+        maxlen: int | None = None,
+        approximate: bool = True,
+        nomkstream: bool = False,
+        minid: str | bytes | None = None,
+        limit: int | None = None,
+    ) -> Any:
+        if not fields:
+            raise DataError("XADD requires at least one field/value pair")
+        stream = self._stream(name, create=not nomkstream)
+        if stream is None:
+            return None
+
+        if id in ("*", b"*"):
+            now_ms = int(_now_ms())
+            last_ms, last_seq = stream.last_id
+            stream_id = (now_ms, 0) if now_ms > last_ms else (last_ms, last_seq + 1)
+        else:
+            stream_id = _parse_id(id)
+            if stream_id <= stream.last_id:
+                raise ResponseError("ERR The ID specified in XADD is equal or smaller than the target stream top item")
+
+        stream.ids.append(stream_id)
+        stream.entries[stream_id] = {_encode(field): _encode(value) for field, value in fields.items()}
+        stream.last_id = stream_id
+        stream.entries_added += 1
+        self._trim(stream, maxlen, minid, approximate)
+        self.store.notify_stream(_key(name))
+        return self._out(_format_id(stream_id).encode())
+
+    def _trim(
+        self,
+        stream: _Stream,
+        maxlen: int | None,
+        minid: str | bytes | None,
+        approximate: bool,
+    ) -> int:
+        excess = 0
+        if maxlen is not None:
+            excess = len(stream.ids) - maxlen
+        elif minid is not None:
+            excess = bisect.bisect_left(stream.ids, _parse_id(minid))
+        # 近似裁剪: 超出不多时推迟, 批量删除
+        if approximate and excess < _TRIM_SLACK:
+            return 0
+        return stream.trim(excess)
+
+    def _cmd_xtrim(
+        self,
+        name: str | bytes,
+        maxlen: int | None = None,
+        approximate: bool = True,
+        minid: str | bytes | None = None,
+        limit: int | None = None,
+    ) -> int:
+        stream = self._stream(name)
+        return 0 if stream is None else self._trim(stream, maxlen, minid, approximate)
+
+    def _cmd_xlen(self, name: str | bytes) -> int:
+        stream = self._stream(name)
+        return 0 if stream is None else len(stream.ids)
+
+    def _cmd_xdel(self, name: str | bytes, *ids: Any) -> int:
+        stream = self._stream(name)
+        if stream is None:
+            return 0
+        deleted = 0
+        for value in ids:
+            stream_id = _parse_id(value)
+            if stream.entries.pop(stream_id, None) is not None:
+                stream.ids.remove(stream_id)
+                deleted += 1
+        return deleted
+
+    def _cmd_xrange(
+        self,
+        name: str | bytes,
+        min: Any = "-",
+        max: Any = "+",
+        count: int | None = None,
+    ) -> list[Any]:
+        stream = self._stream(name)
+        if stream is None:
+            return []
+        ids = stream.range(_parse_range(min, upper=False), _parse_range(max, upper=True))
+        return [self._entry_out(stream, stream_id) for stream_id in ids[:count]]
+
+    def _cmd_xrevrange(
+        self,
+        name: str | bytes,
+        max: Any = "+",
+        min: Any = "-",
+        count: int | None = None,
+    ) -> list[Any]:
+        stream = self._stream(name)
+        if stream is None:
+            return []
+        ids = stream.range(_parse_range(min, upper=False), _parse_range(max, upper=True))[::-1]
+        return [self._entry_out(stream, stream_id) for stream_id in ids[:count]]
+
+    def _cmd_xgroup_create(
+        self,
+        name: str | bytes,
+        groupname: str | bytes,
+        id: Any = "$",
+        mkstream: bool = False,
+        entries_read: int | None = None,
+    ) -> bool:
+        stream = self._stream(name, create=mkstream)
+        if stream is None:
+            raise ResponseError(
+                "ERR The XGROUP subcommand requires the key to exist. "
+                "Note that for CREATE you may want to use the MKSTREAM option to create an empty stream automatically."
+            )
+        group_key = _encode(groupname)
+        if group_key in stream.groups:
+            raise ResponseError("BUSYGROUP Consumer Group name already exists")
+        last_id = stream.last_id if id in ("$", b"$") else _parse_id(id)
+        stream.groups[group_key] = _ConsumerGroup(last_id)
+        return True
+
+    def _cmd_xgroup_destroy(self, name: str | bytes, groupname: str | bytes) -> int:
+        stream = self._stream(name)
+        if stream is None:
+            return 0
+        return int(stream.groups.pop(_encode(groupname), None) is not None)
+
+    def _cmd_xgroup_setid(self, name: str | bytes, groupname: str | bytes, id: Any) -> bool:
+        stream, group = self._group(name, groupname, "XGROUP SETID")
+        group.last_id = stream.last_id if id in ("$", b"$") else _parse_id(id)
+        return True
+
+    def _read_group(
+        self,
+        groupname: str | bytes,
+        consumername: str | bytes,
+        streams: dict[Any, Any],
+        count: int | None,
+        noack: bool,
+    ) -> list[Any]:
+        now_ms = _now_ms()
+        consumer = _encode(consumername)
+        results: list[Any] = []
+        for name, start in streams.items():
+            stream, group = self._group(name, groupname, "XREADGROUP with GROUP option")
+            group.consumers[consumer] = now_ms
+
+            if start in (">", b">"):
+                ids = stream.ids[bisect.bisect_right(stream.ids, group.last_id) :][:count]
+                if not ids:
+                    continue
+                group.last_id = ids[-1]
+                group.entries_read += len(ids)
+                if not noack:
+                    for stream_id in ids:
+                        group.pending[stream_id] = [consumer, now_ms, 1]
+            else:
+                # 读取本消费者的待确认历史 (已删除的条目字段为 None)
+                after = _parse_id(start)
+                ids = sorted(
+                    stream_id
+                    for stream_id, (owner, _, _) in group.pending.items()
+                    if owner == consumer and stream_id > after
+                )[:count]
+
+            results.append([self._key_out(_key(name)), [self._entry_out(stream, stream_id) for stream_id in ids]])
+        return results
+
+    def _cmd_xreadgroup(
+        self,
+        groupname: str | bytes,
+        consumername: str | bytes,
+        streams: dict[Any, Any],
+        count: int | None = None,
+        block: int | None = None,
+        noack: bool = False,
+    ) -> list[Any]:
+        return self._read_group(groupname, consumername, streams, count, noack)
+
+    async def xreadgroup(
+        self,
+        groupname: str | bytes,
+        consumername: str | bytes,
+        streams: dict[Any, Any],
+        count: int | None = None,
+        block: int | None = None,
+        noack: bool = False,
+    ) -> list[Any]:
+        """从消费者组读取; block 毫秒内无新条目时返回空列表 (block=0 表示一直等待)"""
+        results = self._read_group(groupname, consumername, streams, count, noack)
+        if results or block is None:
+            return results
+
+        keys = [_key(name) for name, start in streams.items() if start in (">", b">")]
+        if not keys:
+            return results
+        deadline = None if block == 0 else time.monotonic() + block / 1000
+        while True:
+            timeout = None if deadline is None else deadline - time.monotonic()
+            if timeout is not None and timeout <= 0:
+                return []
+            if not await self.store.wait_streams(keys, timeout):
+                return []
+            results = self._read_group(groupname, consumername, streams, count, noack)
+            if results:
+                return results
+
+    def _cmd_xack(self, name: str | bytes, groupname: str | bytes, *ids: Any) -> int:
+        stream = self._stream(name)
+        group = stream.groups.get(_encode(groupname)) if stream is not None else None
+        if group is None:
+            return 0
+        return sum(1 for value in ids if group.pending.pop(_parse_id(value), None) is not None)
+
+    def _cmd_xpending(self, name: str | bytes, groupname: str | bytes) -> dict[str, Any]:
+        _, group = self._group(name, groupname, "XPENDING")
+        if not group.pending:
+            return {"pending": 0, "min": None, "max": None, "consumers": []}
+        per_consumer: dict[bytes, int] = {}
+        for owner, _, _ in group.pending.values():
+            per_consumer[owner] = per_consumer.get(owner, 0) + 1
+        return {
+            "pending": len(group.pending),
+            "min": self._out(_format_id(min(group.pending)).encode()),
+            "max": self._out(_format_id(max(group.pending)).encode()),
+            "consumers": [
+                {"name": self._out(owner), "pending": pending} for owner, pending in sorted(per_consumer.items())
+            ],
+        }
+
+    def _cmd_xpending_range(
+        self,
+        name: str | bytes,
+        groupname: str | bytes,
+        min: Any,
+        max: Any,
+        count: int,
+        consumername: str | bytes | None = None,
+        idle: int | None = None,
+    ) -> list[dict[str, Any]]:
+        _, group = self._group(name, groupname, "XPENDING")
+        low, high = _parse_range(min, upper=False), _parse_range(max, upper=True)
+        owner_filter = _encode(consumername) if consumername is not None else None
+        now_ms = _now_ms()
+        entries: list[dict[str, Any]] = []
+        for stream_id in sorted(group.pending):
+            if stream_id < low:
+                continue
+            if stream_id > high or len(entries) >= count:
+                break
+            owner, delivered_at, deliveries = group.pending[stream_id]
+            since = int(now_ms - delivered_at)
+            if owner_filter is not None and owner != owner_filter:
+                continue
+            if idle is not None and since < idle:
+                continue
+            entries.append(
+                {
+                    "message_id": self._out(_format_id(stream_id).encode()),
+                    "consumer": self._out(owner),
+                    "time_since_delivered": since,
+                    "times_delivered": deliveries,
+                }
+            )
+        return entries
+
+    def _cmd_xclaim(
+        self,
+        name: str | bytes,
+        groupname: str | bytes,
+        consumername: str | bytes,
+        min_idle_time: int,
+        message_ids: list[Any],
+        idle: int | None = None,
+        time: int | None = None,
+        retrycount: int | None = None,
+        force: bool = False,
+        justid: bool = False,
+    ) -> list[Any]:
+        stream, group = self._group(name, groupname, "XCLAIM")
+        consumer = _encode(consumername)
+        now_ms = _now_ms()
+        group.consumers[consumer] = now_ms
+        claimed: list[Any] = []
+        for value in message_ids:
+            stream_id = _parse_id(value)
+            entry = group.pending.get(stream_id)
+            if entry is None:
+                if not force or stream_id not in stream.entries:
+                    continue
+                entry = group.pending[stream_id] = [consumer, now_ms, 0]
+            elif now_ms - entry[1] < min_idle_time:
+                continue
+            if stream_id not in stream.entries:
+                # 条目已被裁剪或删除
+                del group.pending[stream_id]
+                continue
+
+            entry[0] = consumer
+            entry[1] = time if time is not None else now_ms - (idle or 0)
+            if retrycount is not None:
+                entry[2] = retrycount
+            elif not justid:
+                entry[2] += 1
+            if justid:
+                claimed.append(self._out(_format_id(stream_id).encode()))
+            else:
+                claimed.append(self._entry_out(stream, stream_id))
+        return claimed
+
+    def _cmd_xinfo_stream(self, name: str | bytes, full: bool = False) -> dict[str, Any]:
+        stream = self._stream(name)
+        if stream is None:
+            raise ResponseError("ERR no such key")
+        return {
+            "length": len(stream.ids),
+            "last-generated-id": self._out(_format_id(stream.last_id).encode()),
+            "entries-added": stream.entries_added,
+            "groups": len(stream.groups),
+            "first-entry": self._entry_out(stream, stream.ids[0]) if stream.ids else None,
+            "last-entry": self._entry_out(stream, stream.ids[-1]) if stream.ids else None,
+        }
+
+    def _cmd_xinfo_groups(self, name: str | bytes) -> list[dict[str, Any]]:
+        stream = self._stream(name)
+        if stream is None:
+            raise ResponseError("ERR no such key")
+        return [
+            {
+                "name": self._out(group_name),
+                "consumers": len(group.consumers),
+                "pending": len(group.pending),
+                "last-delivered-id": self._out(_format_id(group.last_id).encode()),
+                "entries-read": group.entries_read,
+            }
+            for group_name, group in stream.groups.items()
+        ]
+
+    # ==================== 生命周期 ====================
+
+    async def aclose(self, close_connection_pool: bool | None = None) -> None:
+        """无连接可关闭 (键空间由同名客户端共享, 不随客户端释放)"""
+
+    close = aclose
+
+
+def _now_ms() -> float:
+    return time.time() * 1000
+
+
+_COMMANDS: dict[str, Callable[..., Any]] = {
+    name.removeprefix("_cmd_"): func for name, func in vars(InMemoryRedis).items() if name.startswith("_cmd_")
+}
+
+
+class _Pipeline:
+    """Pipeline 替代 - 缓存命令, execute() 时依次执行"""
+
+    def __init__(self, client: InMemoryRedis) -> None:
+        self.client = client
+        self._commands: list[tuple[Callable[..., Any], tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        command = _COMMANDS.get(name)
+        if command is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        def queue(*args: Any, **kwargs: Any) -> "_Pipeline":
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    async def __aenter__(self) -> "_Pipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.reset()
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        commands, self._commands = self._commands, []
+        results: list[Any] = []
+        for command, args, kwargs in commands:
+            try:
+                results.append(command(self.client, *args, **kwargs))
+            except ResponseError as e:
+                results.append(e)
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def reset(self) -> None:
+        self._commands = []
+
+    async def aclose(self) -> None:
+        self.reset()
+
+
+class _Script:
+    """register_script() 的返回值 - 调用已注册的 Python 实现"""
+
+    def __init__(self, client: InMemoryRedis, script: str) -> None:
+        self.client = client
+        self.script = script
+        self.sha = _sha1(script)
+
+    async def __call__(
+        self,
+        keys: list[Any] | None = None,
+        args: list[Any] | None = None,
+        client: InMemoryRedis | None = None,
+    ) -> Any:
+        keys = list(keys or [])
+        target = client if client is not None else self.client
+        return target.run_command("eval", self.script, len(keys), *keys, *(args or []))
+
+
+class _BitField:
+    """BITFIELD 构造器 - 操作在 execute() 时依次执行"""
+
+    def __init__(self, client: InMemoryRedis, key: str) -> None:
+        self.client = client
+        self.key = key
+        self._ops: list[tuple[str, str, Any, int]] = []
+
+    def get(self, fmt: str, offset: int | str) -> "_BitField":
+        self._ops.append(("get", fmt, offset, 0))
+        return self
+
+    def set(self, fmt: str, offset: int | str, value: int) -> "_BitField":
+        self._ops.append(("set", fmt, offset, value))
+        return self
+
+    def incrby(self, fmt: str, offset: int | str, increment: int, overflow: str | None = None) -> "_BitField":
+        self._ops.append(("incrby", fmt, offset, increment))
+        return self
+
+    def reset(self) -> None:
+        self._ops = []
+
+    async def execute(self) -> list[int]:
+        ops, self._ops = self._ops, []
+        buf = self.client._typed(self.key, bytes | bytearray)
+        results: list[int] = []
+        if buf is None and all(op == "get" for op, *_ in ops):
+            return [0] * len(ops)
+        if not isinstance(buf, bytearray):
+            buf = bytearray(buf or b"")
+            self.client.store.data[self.key] = buf
+
+        for op, fmt, offset, value in ops:
+            signed, bits = fmt[0] == "i", int(fmt[1:])
+            position = int(offset[1:]) * bits if isinstance(offset, str) and offset.startswith("#") else int(offset)
+            old = _read_bits(buf, position, bits, signed)
+            if op == "get":
+                results.append(old)
+                continue
+            new = value if op == "set" else old + value
+            _write_bits(buf, position, bits, new)
+            results.append(old if op == "set" else _read_bits(buf, position, bits, signed))
+        return results
+
+
+def _read_bits(buf: bytearray, offset: int, bits: int, signed: bool) -> int:
+    """读取从 offset 位开始的 bits 位整数 (大端位序, 与 Redis 一致)"""
+    end = offset + bits
+    first, last = offset >> 3, (end - 1) >> 3
+    chunk = bytes(buf[first : last + 1]).ljust(last - first + 1, b"\0")
+    value = (int.from_bytes(chunk, "big") >> ((last + 1) * 8 - end)) & ((1 << bits) - 1)
+    if signed and value >> (bits - 1):
+        value -= 1 << bits
+    return value
+
+
+def _write_bits(buf: bytearray, offset: int, bits: int, value: int) -> None:
+    end = offset + bits
+    first, last = offset >> 3, (end - 1) >> 3
+    if len(buf) <= last:
+        buf.extend(b"\0" * (last + 1 - len(buf)))
+    width = last - first + 1
+    shift = width * 8 - (end - first * 8)
+    mask = ((1 << bits) - 1) << shift
+    current = int.from_bytes(buf[first : last + 1], "big")
+    current = (current & ~mask) | ((value << shift) & mask)
+    buf[first : last + 1] = current.to_bytes(width, "big")
+
+
+class _PubSub:
+    """Pub/Sub 替代 - 同一键空间内的发布直接投递到订阅者队列"""
+
+    def __init__(self, client: InMemoryRedis, ignore_subscribe_messages: bool = False) -> None:
+        self.client = client
+        self.ignore_subscribe_messages = ignore_subscribe_messages
+        self.channels: set[bytes] = set()
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    def deliver(self, channel: bytes, data: bytes) -> None:
+        self._queue.put_nowait(
+            {
+                "type": "message",
+                "pattern": None,
+                "channel": self.client._out(channel),
+                "data": self.client._out(data),
+            }
+        )
+
+    def _notice(self, kind: str, channel: bytes) -> None:
+        if not self.ignore_subscribe_messages:
+            self._queue.put_nowait(
+                {
+                    "type": kind,
+                    "pattern": None,
+                    "channel": self.client._out(channel),
+                    "data": len(self.channels),
+                }
+            )
+
+    async def subscribe(self, *channels: Any) -> None:
+        for channel in channels:
+            encoded = _encode(channel)
+            self.channels.add(encoded)
+            self.client.store.channels.setdefault(encoded, set()).add(self)
+            self._notice("subscribe", encoded)
+
+    async def unsubscribe(self, *channels: Any) -> None:
+        targets = [_encode(channel) for channel in channels] or list(self.channels)
+        for channel in targets:
+            self.channels.discard(channel)
+            subscribers = self.client.store.channels.get(channel)
+            if subscribers is not None:
+                subscribers.discard(self)
+                if not subscribers:
+                    del self.client.store.channels[channel]
+            self._notice("unsubscribe", channel)
+
+    async def get_message(
+        self,
+        ignore_subscribe_messages: bool = False,
+        timeout: float | None = 0.0,
+    ) -> dict[str, Any] | None:
+        try:
+            if not timeout:
+                message = self._queue.get_nowait()
+            else:
+                message = await asyncio.wait_for(self._queue.get(), timeout)
+        except (asyncio.QueueEmpty, TimeoutError):
+            return None
+        if ignore_subscribe_messages and message["type"] != "message":
+            return None
+        return message
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while self.channels or not self._queue.empty():
+            yield await self._queue.get()
+
+    async def aclose(self) -> None:
+        await self.unsubscribe()
+        self._queue = asyncio.Queue()
+
+    reset = aclose
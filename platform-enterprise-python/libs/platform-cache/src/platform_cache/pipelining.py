@@ -0,0 +1,140 @@
+"""Auto-Pipelining - Coalesce Concurrent Redis Commands"""
+
+import asyncio
+from typing import Any
+
+from redis.asyncio import Redis
+
+
+# 可合并到 Pipeline 的命令 (单键 / 无阻塞 / 无游标)
+PIPELINED_COMMANDS = frozenset(
+    {
+        "get",
+        "set",
+        "setex",
+        "mget",
+        "exists",
+        "delete",
+        "unlink",
+        "incr",
+        "incrby",
+        "decr",
+        "decrby",
+        "expire",
+        "ttl",
+        "pttl",
+        "hget",
+        "hset",
+        "hmget",
+        "hgetall",
+        "hdel",
+        "sadd",
+        "srem",
+        "smembers",
+        "publish",
+    }
+)
+
+
+class AutoPipeline:
+    """
+    自动 Pipeline - 将同一事件循环 tick (或 window 秒) 内发出的命令合并为一次往返
+
+    对 PIPELINED_COMMANDS 中的命令返回可等待的结果,
+    其余属性 (pipeline / pubsub / scan_iter / register_script 等) 直接转发给底层客户端,
+    因此可作为 Redis 的替代传给 CacheClient。
+
+    单个命令失败只影响对应调用方; 整批执行失败 (如连接断开) 时该批所有调用方收到同一异常。
+
+    Args:
+        redis: 底层 Redis 客户端
+        window: 收集命令的时间窗口 (秒), 0 表示仅合并同一 tick 内的命令
+        max_batch: 单次 Pipeline 的最大命令数, 达到后立即发送
+    """
+
+    def __init__(self, redis: Redis, window: float = 0.0, max_batch: int = 1000) -> None:
+        self.redis = redis
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: list[tuple[str, tuple[Any, ...], dict[str, Any], asyncio.Future[Any]]] = []
+        self._flush_handle: asyncio.Handle | None = None
+        self._inflight: set[asyncio.Task[None]] = set()
+        self.batches = 0
+        self.commands = 0
+
+    def __getattr__(self, name: str) -> Any:
+        if name in PIPELINED_COMMANDS:
+            return lambda *args, **kwargs: self._enqueue(name, args, kwargs)
+        return getattr(self.redis, name)
+
+    @property
+    def avg_batch_size(self) -> float:
+        """平均每次往返合并的命令数"""
+        return self.commands / self.batches if self.batches else 0.0
+
+    def _enqueue(
+        self,
+        name: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> asyncio.Future[Any]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._queue.append((name, args, kwargs, future))
+
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.window > 0:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        """取出当前批次并在后台执行"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._queue:
+            return
+        batch, self._queue = self._queue, []
+        task = asyncio.create_task(self._execute(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _execute(
+        self,
+        batch: list[tuple[str, tuple[Any, ...], dict[str, Any], asyncio.Future[Any]]],
+    ) -> None:
+        self.batches += 1
+        self.commands += len(batch)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for name, args, kwargs, _ in batch:
+                    getattr(pipe, name)(*args, **kwargs)
+                results = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (*_, future), result in zip(batch, results, strict=True):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def flush(self) -> None:
+        """立即发送排队的命令并等待所有批次完成"""
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """发送剩余命令后关闭底层客户端"""
+        await self.flush()
+        await self.redis.aclose()
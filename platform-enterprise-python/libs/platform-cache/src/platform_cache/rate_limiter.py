@@ -1,12 +1,197 @@
 """Rate Limiter Implementation"""
 
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any
+
 from platform_cache.client import CacheClient
+from platform_cache.memory import InMemoryRedis, register_script_handler
+from platform_cache.sharding import ShardedCacheClient
+
+
+logger = logging.getLogger(__name__)
+
+# 加权双窗口滑动计数 (单个 Hash: s=当前窗口起点, c=当前窗口计数, p=上一窗口计数)
+# KEYS[1] 为限流键
+# ARGV: limit, window_ms, cost
+# 返回 {allowed, remaining, reset_ms}
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local start = now - (now % window)
+
+local state = redis.call('HMGET', key, 's', 'c', 'p')
+local s = tonumber(state[1]) or start
+local c = tonumber(state[2]) or 0
+local p = tonumber(state[3]) or 0
+
+if s ~= start then
+    if start - s == window then
+        p = c
+    else
+        p = 0
+    end
+    c = 0
+    s = start
+end
+
+local elapsed = now - start
+local estimated = p * (window - elapsed) / window + c
+local allowed = 0
+if estimated + cost <= limit then
+    allowed = 1
+    c = c + cost
+    estimated = estimated + cost
+end
+
+redis.call('HSET', key, 's', s, 'c', c, 'p', p)
+redis.call('PEXPIRE', key, window * 2)
+
+local remaining = math.max(0, math.floor(limit - estimated))
+local reset_ms = window - elapsed
+if allowed == 0 then
+    if c + cost <= limit and p > 0 then
+        -- 等待上一窗口权重衰减到足以容纳本次请求
+        local needed = window * (1 - (limit - c - cost) / p)
+        reset_ms = math.max(1, math.ceil(needed - elapsed))
+    elseif c > 0 then
+        -- 当前窗口已满, 需进入下一窗口并等待其权重衰减
+        local needed = window * (1 - math.max(0, limit - cost) / c)
+        reset_ms = (window - elapsed) + math.ceil(needed)
+    end
+end
+
+return {allowed, remaining, reset_ms}
+"""
+
+
+# 令牌桶 (Hash: tokens=剩余令牌, last_update=上次补充时间)
+# KEYS[1] 为桶键
+# ARGV: capacity, refill_rate, tokens
+# 返回: {acquired, available, wait_seconds}, wait_seconds 为 -1 表示永远无法满足
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', key, 'tokens', 'last_update')
+local available = tonumber(state[1]) or capacity
+local last_update = tonumber(state[2]) or now
+
+available = math.min(capacity, available + math.max(0, now - last_update) * rate)
+
+local acquired = 0
+local wait = 0
+if available >= requested then
+    available = available - requested
+    acquired = 1
+elseif requested > capacity then
+    wait = -1
+else
+    wait = (requested - available) / rate
+end
+
+redis.call('HSET', key, 'tokens', tostring(available), 'last_update', tostring(now))
+redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000) + 1000)
+
+return {acquired, tostring(available), tostring(wait)}
+"""  # noqa: S105
+
+
+def _sliding_window_local(redis: InMemoryRedis, keys: list[str], args: list[Any]) -> list[int]:
+    """SLIDING_WINDOW_SCRIPT 的 Python 实现 (memory:// 后端)"""
+    key = keys[0]
+    limit, window, cost = int(args[0]), int(args[1]), int(args[2])
+
+    seconds, micros = redis.run_command("time")
+    now = seconds * 1000 + micros // 1000
+    start = now - now % window
+
+    state = redis.run_command("hmget", key, ["s", "c", "p"])
+    s = int(state[0]) if state[0] is not None else start
+    c = float(state[1]) if state[1] is not None else 0
+    p = float(state[2]) if state[2] is not None else 0
+
+    if s != start:
+        p = c if start - s == window else 0
+        c = 0
+        s = start
+
+    elapsed = now - start
+    estimated = p * (window - elapsed) / window + c
+    allowed = 0
+    if estimated + cost <= limit:
+        allowed = 1
+        c += cost
+        estimated += cost
+
+    redis.run_command("hset", key, mapping={"s": s, "c": int(c), "p": int(p)})
+    redis.run_command("pexpire", key, window * 2)
+
+    remaining = max(0, math.floor(limit - estimated))
+    reset_ms = window - elapsed
+    if not allowed:
+        if c + cost <= limit and p > 0:
+            needed = window * (1 - (limit - c - cost) / p)
+            reset_ms = max(1, math.ceil(needed - elapsed))
+        elif c > 0:
+            needed = window * (1 - max(0, limit - cost) / c)
+            reset_ms = (window - elapsed) + math.ceil(needed)
+
+    return [allowed, remaining, int(reset_ms)]
+
+
+def _token_bucket_local(redis: InMemoryRedis, keys: list[str], args: list[Any]) -> list[Any]:
+    """TOKEN_BUCKET_SCRIPT 的 Python 实现 (memory:// 后端)"""
+    key = keys[0]
+    capacity, rate, requested = float(args[0]), float(args[1]), float(args[2])
+
+    seconds, micros = redis.run_command("time")
+    now = seconds + micros / 1_000_000
+
+    state = redis.run_command("hmget", key, ["tokens", "last_update"])
+    available = float(state[0]) if state[0] is not None else capacity
+    last_update = float(state[1]) if state[1] is not None else now
+
+    available = min(capacity, available + max(0.0, now - last_update) * rate)
+
+    acquired = 0
+    wait = 0.0
+    if available >= requested:
+        available -= requested
+        acquired = 1
+    elif requested > capacity:
+        wait = -1.0
+    else:
+        wait = (requested - available) / rate
+
+    redis.run_command("hset", key, mapping={"tokens": str(available), "last_update": str(now)})
+    redis.run_command("pexpire", key, math.ceil(capacity / rate * 1000) + 1000)
+
+    return [acquired, str(available), str(wait)]
+
+
+register_script_handler(SLIDING_WINDOW_SCRIPT, _sliding_window_local)
+register_script_handler(TOKEN_BUCKET_SCRIPT, _token_bucket_local)
 
 
 class RateLimiter:
     """速率限制器 - 基于滑动窗口算法"""
 
-    def __init__(self, cache: CacheClient) -> None:
+    def __init__(self, cache: CacheClient | ShardedCacheClient) -> None:
         self.cache = cache
 
     async def is_allowed(
@@ -48,11 +233,131 @@ class RateLimiter:
         return await self.cache.delete(f"ratelimit:{key}")
 
 
+def _nodes(cache: CacheClient | ShardedCacheClient) -> list[CacheClient]:
+    """缓存客户端背后的各节点; 分片客户端为各分片, 单节点即自身"""
+    if isinstance(cache, ShardedCacheClient):
+        return list(cache.shards.values())
+    return [cache]
+
+
+class SlidingWindowRateLimiter:
+    """滑动窗口限流器 - 加权双窗口计数, 单次 EVALSHA 完成判定
+
+    以 Redis 服务器时间为准, 原子执行, 窗口边界处不会放过 2 倍突发。
+    传入 ShardedCacheClient 时脚本在限流键所属的分片上执行。
+    """
+
+    def __init__(self, cache: CacheClient | ShardedCacheClient, key_prefix: str = "ratelimit:sw") -> None:
+        self.cache = cache
+        self.key_prefix = key_prefix
+        self._script = _nodes(cache)[0].redis.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def load(self) -> str:
+        """预加载脚本到所有节点 (应用启动时调用), 返回 SHA"""
+        for node in _nodes(self.cache):
+            self._script.sha = await node.redis.script_load(SLIDING_WINDOW_SCRIPT)
+        return self._script.sha
+
+    async def is_allowed(
+        self,
+        key: str,
+        max_requests: int,
+        window_seconds: float,
+        cost: int = 1,
+    ) -> tuple[bool, int, int]:
+        """
+        检查是否允许请求
+
+        Args:
+            key: 限流键 (如 user_id 或 ip_address)
+            max_requests: 窗口内最大请求数
+            window_seconds: 时间窗口 (秒)
+            cost: 本次请求消耗的配额
+
+        Returns:
+            (is_allowed, remaining_requests, reset_seconds), 与 RateLimiter.is_allowed 契约一致
+        """
+        node = self.cache.for_key(f"{self.key_prefix}:{key}")
+        full_key = node._make_key(f"{self.key_prefix}:{key}")
+        if node.hot_keys is not None:
+            node.hot_keys.record(full_key)
+        allowed, remaining, reset_ms = await self._script(
+            keys=[full_key],
+            args=[max_requests, int(window_seconds * 1000), cost],
+            client=node.redis,
+        )
+        return bool(allowed), int(remaining), max(1, math.ceil(int(reset_ms) / 1000))
+
+    async def reset(self, key: str) -> bool:
+        """重置限流计数器"""
+        return await self.cache.delete(f"{self.key_prefix}:{key}")
+
+
+@dataclass(frozen=True)
+class TokenBucketResult:
+    """令牌桶获取结果"""
+
+    acquired: bool
+    available: float
+    # 获取失败时需等待的秒数; 请求数超过桶容量时为 inf
+    wait_time: float
+
+
 class TokenBucketLimiter:
-    """令牌桶限流器"""
+    """令牌桶限流器 - 单次 Lua 脚本原子完成补充与扣减, 以 Redis 服务器时间为准"""
 
-    def __init__(self, cache: CacheClient) -> None:
+    def __init__(self, cache: CacheClient | ShardedCacheClient) -> None:
         self.cache = cache
+        self._script = _nodes(cache)[0].redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def load(self) -> str:
+        """预加载脚本到所有节点 (应用启动时调用), 返回 SHA"""
+        for node in _nodes(self.cache):
+            self._script.sha = await node.redis.script_load(TOKEN_BUCKET_SCRIPT)
+        return self._script.sha
+
+    async def try_acquire(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        tokens: int = 1,
+    ) -> TokenBucketResult:
+        """
+        尝试获取令牌
+
+        Args:
+            key: 限流键
+            capacity: 桶容量
+            refill_rate: 每秒补充的令牌数
+            tokens: 请求的令牌数
+
+        Returns:
+            TokenBucketResult
+
+        Raises:
+            ValueError: capacity 或 refill_rate 不为正数 (脚本按 capacity / refill_rate 计算桶的过期时间),
+                或 tokens 不为正数 (否则会向桶内加入令牌)
+        """
+        if capacity <= 0 or refill_rate <= 0:
+            raise ValueError(f"capacity and refill_rate must be positive, got {capacity} and {refill_rate}")
+        if tokens <= 0:
+            raise ValueError(f"tokens must be positive, got {tokens}")
+        node = self.cache.for_key(f"bucket:{key}")
+        full_key = node._make_key(f"bucket:{key}")
+        if node.hot_keys is not None:
+            node.hot_keys.record(full_key)
+        acquired, available, wait_time = await self._script(
+            keys=[full_key],
+            args=[capacity, refill_rate, tokens],
+            client=node.redis,
+        )
+        wait = float(wait_time)
+        return TokenBucketResult(
+            acquired=bool(acquired),
+            available=float(available),
+            wait_time=math.inf if wait < 0 else wait,
+        )
 
     async def acquire(
         self,
@@ -73,35 +378,247 @@ class TokenBucketLimiter:
         Returns:
             (acquired, available_tokens)
         """
-        import time
+        result = await self.try_acquire(key, capacity, refill_rate, tokens)
+        return result.acquired, int(result.available)
+
+    async def wait_acquire(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        tokens: int = 1,
+        max_wait: float = 1.0,
+    ) -> bool:
+        """获取令牌, 不足时按 wait_time 等待后重试, 总等待不超过 max_wait 秒"""
+        deadline = time.monotonic() + max_wait
+        while True:
+            result = await self.try_acquire(key, capacity, refill_rate, tokens)
+            if result.acquired:
+                return True
+            remaining = deadline - time.monotonic()
+            if result.wait_time > remaining:
+                return False
+            await asyncio.sleep(result.wait_time)
+
+
+@dataclass
+class ApproximateLimiterStats:
+    """近似限流器统计"""
+
+    admitted: int = 0
+    rejected: int = 0
+    # 无需访问 Redis 即完成的判定数
+    local_decisions: int = 0
+    syncs: int = 0
+    # 同步后发现全局计数已超出上限的放行数
+    over_admitted: int = 0
+
+    @property
+    def decisions(self) -> int:
+        return self.admitted + self.rejected
+
+    @property
+    def error_rate(self) -> float:
+        """超额放行数 / 放行总数"""
+        return self.over_admitted / self.admitted if self.admitted else 0.0
+
+    @property
+    def local_ratio(self) -> float:
+        return self.local_decisions / self.decisions if self.decisions else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "local_decisions": self.local_decisions,
+            "syncs": self.syncs,
+            "over_admitted": self.over_admitted,
+            "error_rate": self.error_rate,
+            "local_ratio": self.local_ratio,
+        }
+
+
+@dataclass
+class _LocalWindow:
+    """单个限流键在当前固定窗口内的本地状态"""
+
+    window_start: int
+    max_requests: int
+    window_seconds: int
+    # 上次同步时得到的全局计数
+    global_count: int = 0
+    # 已本地放行、尚未同步到 Redis 的请求数
+    pending: int = 0
+    # 下次同步前可本地放行的额度
+    budget: int = 0
+    sync_task: asyncio.Task | None = None
+
+
+class ApproximateRateLimiter:
+    """近似限流器 - 本地预聚合计数, 批量同步增量到 Redis
+
+    每个进程在本地按固定窗口计数, 并从全局剩余额度中领取一份本地额度
+    (remaining * local_share)。额度内的请求直接在本地放行, 不访问网络;
+    额度用尽、累计 sync_every 个未同步请求或每 sync_interval 秒,
+    通过一次 INCRBY + EXPIRE 管道将增量写入 Redis 并刷新额度。
+
+    N 个进程同时领取额度时, 单窗口最多超额放行约
+    N * remaining * local_share 个请求 (随剩余额度收敛), 实际超额比例见 stats.error_rate。
+
+    Args:
+        cache: 缓存客户端
+        sync_interval: 后台同步间隔 (秒)
+        sync_every: 单键累计多少个未同步请求后强制同步
+        local_share: 每次同步领取的本地额度占全局剩余额度的比例
+        key_prefix: Redis 键前缀
+    """
+
+    def __init__(
+        self,
+        cache: CacheClient | ShardedCacheClient,
+        sync_interval: float = 0.1,
+        sync_every: int = 100,
+        local_share: float = 0.1,
+        key_prefix: str = "ratelimit:approx",
+    ) -> None:
+        self.cache = cache
+        self.sync_interval = sync_interval
+        self.sync_every = sync_every
+        self.local_share = local_share
+        self.key_prefix = key_prefix
+        self.stats = ApproximateLimiterStats()
+        self._windows: dict[str, _LocalWindow] = {}
+        # 窗口切换时尚有未同步增量的旧窗口
+        self._retired: list[tuple[str, _LocalWindow]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    async def is_allowed(
+        self,
+        key: str,
+        max_requests: int,
+        window_seconds: int,
+    ) -> tuple[bool, int, int]:
+        """
+        检查是否允许请求 (与 RateLimiter.is_allowed 契约一致)
+
+        Args:
+            key: 限流键 (如 user_id 或 ip_address)
+            max_requests: 窗口内最大请求数
+            window_seconds: 时间窗口 (秒)
+
+        Returns:
+            (is_allowed, remaining_requests, reset_seconds)
+        """
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
 
-        bucket_key = f"bucket:{key}"
         now = time.time()
+        window_start = int(now // window_seconds) * window_seconds
+        reset = max(1, math.ceil(window_start + window_seconds - now))
+
+        node = self.cache.for_key(f"{self.key_prefix}:{key}:{window_start}")
+        if node.hot_keys is not None:
+            # 本地判定不访问 Redis, 但每次请求仍计入热点统计
+            node.hot_keys.record(node._make_key(f"{self.key_prefix}:{key}:{window_start}"))
+
+        state = self._windows.get(key)
+        synced = False
+        if state is None or state.window_start != window_start:
+            if state is not None and state.pending:
+                self._retired.append((key, state))
+            state = _LocalWindow(window_start, max_requests, window_seconds)
+            self._windows[key] = state
+            await self._sync(key, state)
+            synced = True
+        elif state.global_count >= max_requests:
+            # 全局计数只增不减, 本窗口内已无额度, 直接本地拒绝
+            pass
+        elif state.budget <= 0 or state.pending >= self.sync_every:
+            await self._sync(key, state)
+            synced = True
+
+        if not synced:
+            self.stats.local_decisions += 1
+
+        if state.budget > 0:
+            state.budget -= 1
+            state.pending += 1
+            self.stats.admitted += 1
+            remaining = max(0, max_requests - state.global_count - state.pending)
+            return True, remaining, reset
+
+        self.stats.rejected += 1
+        return False, 0, reset
+
+    async def reset(self, key: str) -> bool:
+        """重置限流计数器 (仅清除本进程状态与当前窗口的全局计数)"""
+        state = self._windows.pop(key, None)
+        if state is None:
+            return False
+        return await self.cache.delete(f"{self.key_prefix}:{key}:{state.window_start}")
+
+    async def flush(self) -> None:
+        """将所有未同步的增量写入 Redis"""
+        retired, self._retired = self._retired, []
+        for key, state in retired:
+            await self._sync(key, state)
+
+        now = time.time()
+        for key, state in list(self._windows.items()):
+            if state.pending:
+                await self._sync(key, state)
+            elif state.window_start + state.window_seconds <= now:
+                # 已过期且无增量, 回收本地状态
+                self._windows.pop(key, None)
+
+    async def close(self) -> None:
+        """停止后台同步并写入剩余增量 (应用关闭时调用)"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        """后台周期同步"""
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.flush()
+            except Exception:
+                # Redis 暂不可用时保留增量, 下个周期重试
+                logger.warning("Rate limiter sync failed", exc_info=True)
+
+    async def _sync(self, key: str, state: _LocalWindow) -> None:
+        """同步单键增量; 同一键的并发同步合并为一次"""
+        if state.sync_task is None:
+            state.sync_task = asyncio.create_task(self._do_sync(key, state))
+        task = state.sync_task
+        try:
+            await asyncio.shield(task)
+        finally:
+            if state.sync_task is task and task.done():
+                state.sync_task = None
+
+    async def _do_sync(self, key: str, state: _LocalWindow) -> None:
+        delta, state.pending = state.pending, 0
+        node = self.cache.for_key(f"{self.key_prefix}:{key}:{state.window_start}")
+        full_key = node._make_key(f"{self.key_prefix}:{key}:{state.window_start}")
+        try:
+            async with node.redis.pipeline(transaction=False) as pipe:
+                pipe.incrby(full_key, delta)
+                pipe.expire(full_key, state.window_seconds * 2)
+                total, _ = await pipe.execute()
+        except Exception:
+            state.pending += delta
+            raise
+        self.stats.syncs += 1
+
+        total = int(total)
+        self.stats.over_admitted += min(delta, max(0, total - state.max_requests))
+        state.global_count = total
 
-        # 获取当前桶状态
-        bucket = await self.cache.hgetall(bucket_key)
-
-        if bucket:
-            last_update = float(bucket.get("last_update", now))
-            available = float(bucket.get("tokens", capacity))
-
-            # 计算补充的令牌
-            elapsed = now - last_update
-            refilled = elapsed * refill_rate
-            available = min(capacity, available + refilled)
-        else:
-            available = capacity
-
-        # 尝试获取令牌
-        if available >= tokens:
-            available -= tokens
-            acquired = True
-        else:
-            acquired = False
-
-        # 更新桶状态
-        await self.cache.hset(bucket_key, "tokens", available)
-        await self.cache.hset(bucket_key, "last_update", now)
-        await self.cache.expire(bucket_key, 3600)  # 1小时过期
-
-        return acquired, int(available)
+        # 同步期间本地新放行的请求已计入 pending, 从额度中扣除
+        left = max(0, state.max_requests - total - state.pending)
+        state.budget = min(left, math.ceil(left * self.local_share)) if left else 0
@@ -0,0 +1,223 @@
+"""Cache Value Serializers
+
+存储格式: 1 字节头 + 负载
+    头 = 0x80 | (压缩算法 << 4) | 编解码器 ID
+
+json.dumps 的输出只含 ASCII 字符, 首字节总是 < 0x80,
+因此没有头的旧值会按 JSON 文本解码, 切换编解码器无需清空缓存。
+"""
+
+import json
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+
+# 可选依赖, 由 platform-cache 的 orjson / msgpack / zstd / lz4 extra 提供; 未安装时在使用处报错
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None  # type: ignore[assignment]
+
+
+HEADER_FLAG = 0x80
+CODEC_MASK = 0x0F
+COMPRESSION_SHIFT = 4
+COMPRESSION_MASK = 0x07
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+
+
+def _require(module: Any, name: str, extra: str) -> Any:
+    """确认可选依赖已安装"""
+    if module is None:
+        raise ImportError(f"{name} is required, install platform-cache[{extra}]", name=name)
+    return module
+
+
+def _default(obj: Any) -> Any:
+    """非原生类型的兜底转换 (与 json.dumps(default=str) 行为一致)"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+class Codec(ABC):
+    """编解码器基类"""
+
+    codec_id: int
+    name: str
+
+    @abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """编码"""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """解码"""
+
+
+class JsonCodec(Codec):
+    """标准库 JSON"""
+
+    codec_id = 1
+    name = "json"
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(Codec):
+    """orjson (需安装 platform-cache[orjson])"""
+
+    codec_id = 2
+    name = "orjson"
+
+    def __init__(self) -> None:
+        self._orjson = _require(orjson, "orjson", "orjson")
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def encode(self, value: Any) -> bytes:
+        return self._orjson.dumps(value, default=_default, option=self._option)
+
+    def decode(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """MessagePack (需安装 platform-cache[msgpack])"""
+
+    codec_id = 3
+    name = "msgpack"
+
+    def __init__(self) -> None:
+        self._msgpack = _require(msgpack, "msgpack", "msgpack")
+
+    def encode(self, value: Any) -> bytes:
+        return self._msgpack.packb(value, default=_default, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+CODECS: dict[str, type[Codec]] = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+class Serializer:
+    """
+    缓存值序列化器 - 编解码 + 阈值压缩 + 格式头
+
+    Args:
+        codec: 写入使用的编解码器 (json / orjson / msgpack 或 Codec 实例)
+        compression: 压缩算法 (None / "zstd" / "lz4")
+        compress_threshold: 编码后超过该字节数才压缩
+        compress_level: 压缩级别
+    """
+
+    def __init__(
+        self,
+        codec: str | Codec = "json",
+        compression: str | None = None,
+        compress_threshold: int = 1024,
+        compress_level: int = 3,
+    ) -> None:
+        self.codec = CODECS[codec]() if isinstance(codec, str) else codec
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.compression = COMPRESSION_NONE
+        self._codecs: dict[int, Codec] = {self.codec.codec_id: self.codec}
+        self._zstd_compressor: Any = None
+        self._zstd_decompressor: Any = None
+
+        if compression == "zstd":
+            self.compression = COMPRESSION_ZSTD
+            self._zstd_compressor = _require(zstandard, "zstandard", "zstd").ZstdCompressor(level=compress_level)
+        elif compression == "lz4":
+            _require(lz4_frame, "lz4", "lz4")
+            self.compression = COMPRESSION_LZ4
+        elif compression is not None:
+            raise ValueError(f"Unsupported compression: {compression}")
+
+    def dumps(self, value: Any) -> bytes:
+        """序列化为带头字节串"""
+        payload = self.codec.encode(value)
+        compression = COMPRESSION_NONE
+        if self.compression and len(payload) > self.compress_threshold:
+            payload = self._compress(payload)
+            compression = self.compression
+        header = HEADER_FLAG | (compression << COMPRESSION_SHIFT) | self.codec.codec_id
+        return bytes((header,)) + payload
+
+    def loads(self, data: bytes | str) -> Any:
+        """反序列化, 兼容无头的旧 JSON 值"""
+        if isinstance(data, str):
+            return json.loads(data)
+        header = data[0]
+        if not header & HEADER_FLAG:
+            return json.loads(data)
+
+        payload = data[1:]
+        compression = (header >> COMPRESSION_SHIFT) & COMPRESSION_MASK
+        if compression:
+            payload = self._decompress(compression, payload)
+        return self._get_codec(header & CODEC_MASK).decode(payload)
+
+    def _get_codec(self, codec_id: int) -> Codec:
+        """按 ID 获取解码器 (迁移期间可读取其他编解码器写入的值)"""
+        codec = self._codecs.get(codec_id)
+        if codec is None:
+            for codec_cls in CODECS.values():
+                if codec_cls.codec_id == codec_id:
+                    codec = codec_cls()
+                    self._codecs[codec_id] = codec
+                    break
+            else:
+                raise ValueError(f"Unknown codec id: {codec_id}")
+        return codec
+
+    def _compress(self, payload: bytes) -> bytes:
+        if self.compression == COMPRESSION_ZSTD:
+            return self._zstd_compressor.compress(payload)
+        return lz4_frame.compress(payload, compression_level=self.compress_level)
+
+    def _decompress(self, compression: int, payload: bytes) -> bytes:
+        if compression == COMPRESSION_ZSTD:
+            if self._zstd_decompressor is None:
+                self._zstd_decompressor = _require(zstandard, "zstandard", "zstd").ZstdDecompressor()
+            return self._zstd_decompressor.decompress(payload)
+        if compression == COMPRESSION_LZ4:
+            return _require(lz4_frame, "lz4", "lz4").decompress(payload)
+        raise ValueError(f"Unknown compression id: {compression}")
@@ -0,0 +1,364 @@
+"""Sharded Cache Client - Consistent Hashing"""
+
+import asyncio
+import bisect
+import hashlib
+from collections.abc import Callable, Iterable
+from dataclasses import fields
+from typing import Any
+from urllib.parse import urlsplit
+
+from platform_cache.client import CacheClient, Loader, create_redis_client
+from platform_cache.local import CacheStats, LocalCache
+from platform_cache.serializers import Serializer
+
+
+def hash_slot_key(key: str) -> str:
+    """提取哈希标签: 键中首个非空 {...} 的内容参与哈希 (与 Redis Cluster 规则一致)"""
+    start = key.find("{")
+    if start != -1:
+        end = key.find("}", start + 1)
+        if end > start + 1:
+            return key[start + 1 : end]
+    return key
+
+
+def _node_name(url: str) -> str:
+    """
+    去除密码后的 Redis URL, 用作节点名称
+
+    节点名称会出现在日志、指标与调试端点中; 去除密码后轮换密码也不改变键分布。
+    """
+    parts = urlsplit(url)
+    if parts.password is None:
+        return url
+    userinfo, _, host = parts.netloc.rpartition("@")
+    username = userinfo.partition(":")[0]
+    netloc = f"{username}@{host}" if username else host
+    return parts._replace(netloc=netloc).geturl()
+
+
+def _hash(value: str) -> int:
+    """跨进程稳定的 64 位哈希 (内置 hash() 会随进程随机化)"""
+    return int.from_bytes(hashlib.md5(value.encode(), usedforsecurity=False).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    一致性哈希环
+
+    每个节点在环上放置 vnodes 个虚拟节点; 增删一个节点时
+    只有约 1/N 的键改变归属。
+
+    Args:
+        nodes: 节点名称
+        vnodes: 每个节点的虚拟节点数
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 160) -> None:
+        self.vnodes = vnodes
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        self._nodes: set[str] = set()
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self) -> list[str]:
+        return sorted(self._nodes)
+
+    def add_node(self, node: str) -> None:
+        """加入节点"""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self.vnodes):
+            point = _hash(f"{node}#{i}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove_node(self, node: str) -> None:
+        """移除节点"""
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners, strict=True) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def get_node(self, key: str) -> str:
+        """获取键所属节点 (支持哈希标签)"""
+        if not self._points:
+            raise LookupError("Hash ring is empty")
+        index = bisect.bisect(self._points, _hash(hash_slot_key(key)))
+        if index == len(self._points):
+            index = 0
+        return self._owners[index]
+
+
+class ShardedCacheClient:
+    """分片缓存客户端 - 按一致性哈希将键分布到多个 Redis
+
+    提供 CacheClient 的读写、批量、标签与防击穿方法, 但没有 redis、prefix 等
+    单节点属性; 需要直接访问 Redis 的组件 (如限流器) 应通过 for_key() 取得
+    键所属分片的 CacheClient。
+
+    键名中的 {tag} 决定分片, 如 "user:{42}:profile" 与 "user:{42}:settings"
+    落在同一节点。多键操作按分片分组后并发执行。
+    模式删除与标签失效需广播到所有分片。
+
+    Args:
+        shards: 节点名称 -> CacheClient (各分片应使用相同 prefix)
+        vnodes: 每个节点的虚拟节点数
+    """
+
+    def __init__(self, shards: dict[str, CacheClient], vnodes: int = 160) -> None:
+        self.shards = dict(shards)
+        self.ring = HashRing(self.shards, vnodes=vnodes)
+
+    def add_shard(self, name: str, client: CacheClient) -> None:
+        """加入分片 (约 1/N 的键会迁移到新节点, 迁移期间表现为缓存未命中)"""
+        self.shards[name] = client
+        self.ring.add_node(name)
+
+    def remove_shard(self, name: str) -> CacheClient | None:
+        """移除分片, 返回被移除的客户端"""
+        self.ring.remove_node(name)
+        return self.shards.pop(name, None)
+
+    def for_key(self, key: str) -> CacheClient:
+        """获取键所属分片的 CacheClient"""
+        return self.shards[self.ring.get_node(key)]
+
+    def _group(self, keys: Iterable[str]) -> dict[str, list[str]]:
+        """按分片分组"""
+        groups: dict[str, list[str]] = {}
+        for key in keys:
+            groups.setdefault(self.ring.get_node(key), []).append(key)
+        return groups
+
+    @property
+    def stats(self) -> CacheStats:
+        """所有分片的缓存命中统计之和"""
+        total = CacheStats()
+        for client in self.shards.values():
+            shard_stats = client.stats
+            for field in fields(CacheStats):
+                setattr(
+                    total,
+                    field.name,
+                    getattr(total, field.name) + getattr(shard_stats, field.name),
+                )
+        return total
+
+    # ==================== 单键操作 ====================
+
+    async def get(self, key: str) -> Any | None:
+        """获取缓存"""
+        return await self.for_key(key).get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+        tags: list[str] | None = None,
+    ) -> bool:
+        """设置缓存 (标签成员记录在键所在分片)"""
+        return await self.for_key(key).set(key, value, ttl=ttl, tags=tags)
+
+    async def set_nx(
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+    ) -> bool:
+        """设置缓存 (仅当键不存在时)"""
+        return await self.for_key(key).set_nx(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> bool:
+        """删除缓存"""
+        return await self.for_key(key).delete(key)
+
+    async def exists(self, key: str) -> bool:
+        """检查键是否存在"""
+        return await self.for_key(key).exists(key)
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        """自增"""
+        return await self.for_key(key).incr(key, amount)
+
+    async def decr(self, key: str, amount: int = 1) -> int:
+        """自减"""
+        return await self.for_key(key).decr(key, amount)
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        """设置过期时间"""
+        return await self.for_key(key).expire(key, seconds)
+
+    async def ttl(self, key: str) -> int:
+        """获取剩余过期时间"""
+        return await self.for_key(key).ttl(key)
+
+    async def hget(self, name: str, key: str) -> Any | None:
+        """获取哈希字段"""
+        return await self.for_key(name).hget(name, key)
+
+    async def hset(self, name: str, key: str, value: Any) -> int:
+        """设置哈希字段"""
+        return await self.for_key(name).hset(name, key, value)
+
+    async def hgetall(self, name: str) -> dict[str, Any]:
+        """获取所有哈希字段"""
+        return await self.for_key(name).hgetall(name)
+
+    async def hdel(self, name: str, *keys: str) -> int:
+        """删除哈希字段"""
+        return await self.for_key(name).hdel(name, *keys)
+
+    async def hget_many(self, name: str, keys: list[str]) -> dict[str, Any]:
+        """批量获取哈希字段 (整个哈希位于同一分片)"""
+        return await self.for_key(name).hget_many(name, keys)
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Loader,
+        ttl: int | None = None,
+        *,
+        beta: float = 1.0,
+        stale_ttl: int = 0,
+        lease_ttl: float = 10.0,
+    ) -> Any:
+        """读取缓存, 未命中时调用 loader 回源并写回 (见 CacheClient.get_or_set)"""
+        return await self.for_key(key).get_or_set(
+            key,
+            loader,
+            ttl,
+            beta=beta,
+            stale_ttl=stale_ttl,
+            lease_ttl=lease_ttl,
+        )
+
+    # ==================== 多键操作 (按分片并发) ====================
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """批量获取缓存, 仅返回命中的键"""
+        groups = self._group(keys)
+        results = await asyncio.gather(*(self.shards[node].get_many(group) for node, group in groups.items()))
+        merged: dict[str, Any] = {}
+        for result in results:
+            merged.update(result)
+        return merged
+
+    async def set_many(
+        self,
+        mapping: dict[str, Any],
+        ttl: int | None = None,
+        ttls: dict[str, int] | None = None,
+        tags: list[str] | None = None,
+    ) -> bool:
+        """批量设置缓存"""
+        groups = self._group(mapping)
+        results = await asyncio.gather(
+            *(
+                self.shards[node].set_many(
+                    {key: mapping[key] for key in group},
+                    ttl=ttl,
+                    ttls=ttls,
+                    tags=tags,
+                )
+                for node, group in groups.items()
+            )
+        )
+        return all(results)
+
+    async def delete_many(self, keys: list[str]) -> int:
+        """批量删除缓存"""
+        groups = self._group(keys)
+        results = await asyncio.gather(*(self.shards[node].delete_many(group) for node, group in groups.items()))
+        return sum(results)
+
+    async def delete_pattern(self, pattern: str) -> int:
+        """删除匹配模式的缓存 (所有分片)"""
+        results = await asyncio.gather(*(client.delete_pattern(pattern) for client in self.shards.values()))
+        return sum(results)
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """删除标签下的所有缓存 (所有分片)"""
+        results = await asyncio.gather(*(client.invalidate_tag(tag) for client in self.shards.values()))
+        return sum(results)
+
+    async def invalidate_tags(self, tags: list[str]) -> int:
+        """删除多个标签下的所有缓存"""
+        deleted = 0
+        for tag in tags:
+            deleted += await self.invalidate_tag(tag)
+        return deleted
+
+    async def prune_tag(self, tag: str) -> int:
+        """移除标签集合中已过期的成员 (所有分片)"""
+        results = await asyncio.gather(*(client.prune_tag(tag) for client in self.shards.values()))
+        return sum(results)
+
+    # ==================== 生命周期 ====================
+
+    async def start_invalidation_listener(self) -> None:
+        """订阅所有分片的失效频道"""
+        for client in self.shards.values():
+            await client.start_invalidation_listener()
+
+    async def stop_invalidation_listener(self) -> None:
+        """停止订阅所有分片的失效频道"""
+        for client in self.shards.values():
+            await client.stop_invalidation_listener()
+
+    async def close(self) -> None:
+        """关闭所有分片连接"""
+        for client in self.shards.values():
+            await client.close()
+
+
+def create_sharded_cache(
+    urls: list[str] | dict[str, str],
+    *,
+    prefix: str = "platform",
+    default_ttl: int = 300,
+    max_connections: int = 50,
+    vnodes: int = 160,
+    serializer: Serializer | None = None,
+    local_cache_factory: Callable[[], LocalCache] | None = None,
+) -> ShardedCacheClient:
+    """
+    按 Redis URL 列表创建分片缓存客户端
+
+    Args:
+        urls: 各分片的 Redis URL, 或节点名称 -> URL。
+            传入列表时以去除密码后的 URL 作为节点名称, 顺序不影响键分布
+        prefix: 键前缀
+        default_ttl: 默认过期时间 (秒)
+        max_connections: 每个分片的最大连接数
+        vnodes: 每个节点的虚拟节点数
+        serializer: 值序列化器
+        local_cache_factory: 返回 LocalCache 的工厂函数, 为每个分片创建独立的 L1
+    """
+    if isinstance(urls, dict):
+        named = dict(urls)
+    else:
+        named = {_node_name(url): url for url in urls}
+        if len(named) != len(urls):
+            raise ValueError("Shard URLs must be unique after removing passwords")
+
+    shards: dict[str, CacheClient] = {}
+    for name, url in named.items():
+        redis = create_redis_client(url, max_connections=max_connections, serializer=serializer)
+        local: LocalCache | None = local_cache_factory() if local_cache_factory else None
+        shards[name] = CacheClient(
+            redis,
+            prefix=prefix,
+            default_ttl=default_ttl,
+            local_cache=local,
+            serializer=serializer,
+        )
+    return ShardedCacheClient(shards, vnodes=vnodes)
@@ -8,7 +8,7 @@ from platform_core.exceptions import (
     UnauthorizedError,
     ValidationError,
 )
-from platform_core.schemas import ApiResponse, PaginatedData, ResponseMeta
+from platform_core.schemas import ApiResponse, CursorPaginatedData, PaginatedData, ResponseMeta
 
 __version__ = "1.0.0"
 
@@ -23,5 +23,6 @@ __all__ = [
     # Schemas
     "ApiResponse",
     "PaginatedData",
+    "CursorPaginatedData",
     "ResponseMeta",
 ]
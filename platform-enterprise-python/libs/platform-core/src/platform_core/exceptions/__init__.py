@@ -5,6 +5,7 @@ from platform_core.exceptions.base import (
     ForbiddenError,
     NotFoundError,
     PlatformException,
+    RateLimitError,
     UnauthorizedError,
     ValidationError,
 )
@@ -16,4 +17,5 @@ __all__ = [
     "UnauthorizedError",
     "ForbiddenError",
     "ConflictError",
+    "RateLimitError",
 ]
@@ -1,7 +1,12 @@
 """Platform Core Schemas"""
 
 from platform_core.schemas.base import BaseSchema
-from platform_core.schemas.pagination import PaginatedData, PaginationParams
+from platform_core.schemas.pagination import (
+    CursorPaginatedData,
+    CursorParams,
+    PaginatedData,
+    PaginationParams,
+)
 from platform_core.schemas.response import ApiResponse, ErrorResponse, ResponseMeta
 
 __all__ = [
@@ -11,4 +16,6 @@ __all__ = [
     "ResponseMeta",
     "PaginatedData",
     "PaginationParams",
+    "CursorPaginatedData",
+    "CursorParams",
 ]
@@ -29,35 +29,76 @@ class PaginatedData(BaseModel, Generic[DataT]):
     """分页数据"""
 
     items: list[DataT] = Field(description="数据列表")
-    total: int = Field(description="总数量")
+    total: int | None = Field(description="总数量, 未统计时为空")
     page: int = Field(description="当前页码")
     page_size: int = Field(description="每页数量")
-    total_pages: int = Field(description="总页数")
+    total_pages: int | None = Field(description="总页数, 未统计总数时为空")
+    has_more: bool | None = Field(default=None, description="是否有下一页 (按多取一行判断)")
+    estimated: bool = Field(default=False, description="总数是否为估算值")
 
     @classmethod
     def create(
         cls,
         items: list[DataT],
-        total: int,
+        total: int | None,
         page: int,
         page_size: int,
+        *,
+        has_more: bool | None = None,
+        estimated: bool = False,
     ) -> "PaginatedData[DataT]":
         """创建分页数据"""
-        total_pages = (total + page_size - 1) // page_size if page_size > 0 else 0
+        total_pages = None
+        if total is not None:
+            total_pages = (total + page_size - 1) // page_size if page_size > 0 else 0
         return cls(
             items=items,
             total=total,
             page=page,
             page_size=page_size,
             total_pages=total_pages,
+            has_more=has_more,
+            estimated=estimated,
         )
 
     @property
     def has_next(self) -> bool:
         """是否有下一页"""
-        return self.page < self.total_pages
+        if self.has_more is not None:
+            return self.has_more
+        return self.total_pages is not None and self.page < self.total_pages
 
     @property
     def has_prev(self) -> bool:
         """是否有上一页"""
         return self.page > 1
+
+
+class CursorParams(BaseModel):
+    """游标分页参数"""
+
+    cursor: str | None = Field(default=None, description="上一页返回的 next_cursor, 首页为空")
+    limit: int = Field(default=20, ge=1, le=100, description="每页数量")
+
+
+class CursorPaginatedData(BaseModel, Generic[DataT]):
+    """游标分页数据 (无总数与页码, 适用于深分页与无限滚动)"""
+
+    items: list[DataT] = Field(description="数据列表")
+    next_cursor: str | None = Field(default=None, description="下一页游标, 没有更多数据时为空")
+    limit: int = Field(description="每页数量")
+
+    @classmethod
+    def create(
+        cls,
+        items: list[DataT],
+        next_cursor: str | None,
+        limit: int,
+    ) -> "CursorPaginatedData[DataT]":
+        """创建游标分页数据"""
+        return cls(items=items, next_cursor=next_cursor, limit=limit)
+
+    @property
+    def has_more(self) -> bool:
+        """是否有下一页"""
+        return self.next_cursor is not None
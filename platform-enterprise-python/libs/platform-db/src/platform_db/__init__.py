@@ -1,8 +1,48 @@
 """Platform DB - 数据库抽象层"""
 
-from platform_db.base import Base, SoftDeleteMixin, TenantMixin, TimestampMixin
-from platform_db.repository import BaseRepository
-from platform_db.session import DatabaseManager, get_db_session
+from platform_db.base import (
+    INCLUDE_DELETED,
+    Base,
+    SoftDeleteMixin,
+    TenantMixin,
+    TimestampMixin,
+    active_index,
+    include_deleted,
+)
+from platform_db.counting import CountCache, CountStrategy, default_count_cache, estimate_count
+from platform_db.entity_cache import (
+    EntityCache,
+    EntityCacheOptions,
+    JsonEntityCodec,
+    get_entity_cache,
+    init_entity_cache,
+)
+from platform_db.instrumentation import (
+    QueryInstrumentation,
+    QueryStats,
+    QueryStatsMiddleware,
+    current_query_stats,
+    fingerprint,
+)
+from platform_db.pagination import (
+    CursorCodec,
+    CursorPage,
+    InvalidCursorError,
+    OffsetPage,
+    encode_cursor,
+    get_cursor_codec,
+    init_cursor_codec,
+    keyset_paginate,
+)
+from platform_db.replicas import LocalStickyStore, RedisStickyStore, StickyStore
+from platform_db.repository import BaseRepository, UpsertResult
+from platform_db.session import (
+    DatabaseManager,
+    get_db_session,
+    run_after_commit,
+    wait_after_commit,
+)
+from platform_db.statements import StatementRegistry, default_statement_registry, prebuilt
 
 __version__ = "1.0.0"
 
@@ -11,7 +51,41 @@ __all__ = [
     "TimestampMixin",
     "SoftDeleteMixin",
     "TenantMixin",
+    "INCLUDE_DELETED",
+    "include_deleted",
+    "active_index",
     "BaseRepository",
+    "UpsertResult",
+    "StatementRegistry",
+    "default_statement_registry",
+    "prebuilt",
+    "CountStrategy",
+    "CountCache",
+    "default_count_cache",
+    "estimate_count",
+    "OffsetPage",
+    "EntityCache",
+    "EntityCacheOptions",
+    "JsonEntityCodec",
+    "init_entity_cache",
+    "get_entity_cache",
+    "QueryInstrumentation",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "current_query_stats",
+    "fingerprint",
+    "CursorCodec",
+    "CursorPage",
+    "InvalidCursorError",
+    "init_cursor_codec",
+    "get_cursor_codec",
+    "keyset_paginate",
+    "encode_cursor",
     "DatabaseManager",
+    "StickyStore",
+    "LocalStickyStore",
+    "RedisStickyStore",
     "get_db_session",
+    "run_after_commit",
+    "wait_after_commit",
 ]
@@ -3,8 +3,15 @@
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import MetaData, func
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import Executable, Index, MetaData, event, func, text
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    ORMExecuteState,
+    Session,
+    mapped_column,
+    with_loader_criteria,
+)
 
 
 # 命名约定
@@ -49,10 +56,16 @@ class TimestampMixin:
 
 
 class SoftDeleteMixin:
-    """软删除混入"""
+    """
+    软删除混入
+
+    ORM 查询 (含 session.get 与关系加载) 与 ORM UPDATE / DELETE 语句默认附加 NOT is_deleted 条件,
+    需要读取或修改已删除记录时使用 include_deleted()。is_deleted 本身选择性很低, 不单独建索引;
+    唯一约束与热点查找列请使用 active_index() 建立部分索引。
+    """
 
     deleted_at: Mapped[datetime | None] = mapped_column(default=None)
-    is_deleted: Mapped[bool] = mapped_column(default=False, index=True)
+    is_deleted: Mapped[bool] = mapped_column(default=False)
 
     def soft_delete(self) -> None:
         """软删除"""
@@ -65,6 +78,83 @@ class SoftDeleteMixin:
         self.is_deleted = False
 
 
+# 执行选项: 为 True 时不过滤已软删除的记录
+INCLUDE_DELETED = "include_deleted"
+
+
+def include_deleted[StmtT: Executable](stmt: StmtT) -> StmtT:
+    """
+    使语句包含已软删除的记录
+
+    Example:
+        await session.execute(include_deleted(select(User).where(User.email == email)))
+        await session.get(User, user_id, execution_options={INCLUDE_DELETED: True})
+    """
+    return stmt.execution_options(**{INCLUDE_DELETED: True})
+
+
+def active_index(name: str, *columns: str, unique: bool = False) -> Index:
+    """
+    仅覆盖未删除记录的部分索引 (WHERE NOT is_deleted)
+
+    查询条件与默认的软删除过滤一致, 规划器可直接使用该索引; 唯一索引允许已删除记录的值被重新使用。
+    MySQL 不支持部分索引, 会建立普通索引。
+    """
+    where = text("NOT is_deleted")
+    return Index(name, *columns, unique=unique, postgresql_where=where, sqlite_where=where)
+
+
+# 软删除过滤选项, 构建一次复用, 避免每次执行重新构建选项与计算其缓存键
+_SOFT_DELETE_CRITERIA = with_loader_criteria(
+    SoftDeleteMixin,
+    lambda cls: ~cls.is_deleted,
+    include_aliases=True,
+)
+
+# 执行选项: 语句已预先附加软删除过滤, 执行时不再改写 (见 filter_deleted)
+_DELETED_FILTERED = "soft_delete_filtered"
+
+# 执行选项: 语句附带的预先过滤变体, 未指定 include_deleted 时执行该变体 (见 with_filtered_variant)
+_FILTERED_VARIANT = "soft_delete_filtered_variant"
+
+
+def filter_deleted[StmtT: Executable](stmt: StmtT) -> StmtT:
+    """
+    预先为语句附加软删除过滤
+
+    执行时钩子不再改写语句, 复用的语句对象因此只计算一次缓存键。
+    附加后 include_deleted() 不再生效; 需要同时支持 include_deleted() 时使用 with_filtered_variant()。
+    """
+    return stmt.options(_SOFT_DELETE_CRITERIA).execution_options(**{_DELETED_FILTERED: True})
+
+
+def with_filtered_variant[StmtT: Executable](stmt: StmtT) -> StmtT:
+    """
+    为语句附带预先过滤的变体
+
+    返回的语句本身不含软删除过滤: 默认执行时钩子改为执行附带的过滤变体 (只计算一次缓存键),
+    指定 include_deleted 时按原语句执行, 因此 include_deleted() 仍然生效。
+    """
+    return stmt.execution_options(**{_FILTERED_VARIANT: filter_deleted(stmt)})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _filter_soft_deleted(state: ORMExecuteState) -> None:
+    """为 ORM 查询以及 ORM UPDATE / DELETE 语句附加软删除过滤条件"""
+    if (
+        (state.is_select or state.is_update or state.is_delete)
+        and not state.is_column_load
+        and not state.is_relationship_load
+        and not state.execution_options.get(INCLUDE_DELETED, False)
+        and not state.execution_options.get(_DELETED_FILTERED, False)
+    ):
+        variant = state.execution_options.get(_FILTERED_VARIANT)
+        if variant is not None:
+            state.statement = variant
+        else:
+            state.statement = state.statement.options(_SOFT_DELETE_CRITERIA)
+
+
 class TenantMixin:
     """多租户混入"""
 
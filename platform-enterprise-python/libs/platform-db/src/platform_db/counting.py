@@ -0,0 +1,177 @@
+"""Count Strategies - Exact, Planner Estimate and Cached Counts"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import ClauseElement, ColumnElement, Executable, Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+
+from platform_db.base import INCLUDE_DELETED, SoftDeleteMixin
+
+
+logger = logging.getLogger(__name__)
+
+
+class CountStrategy(str, Enum):
+    """总数统计策略"""
+
+    # SELECT count(*), 精确但需扫描全部匹配行
+    EXACT = "exact"
+    # 查询规划器估算 (PostgreSQL reltuples / EXPLAIN, MySQL TABLE_ROWS), 不支持时退化为精确统计
+    ESTIMATE = "estimate"
+    # 精确值缓存 TTL 秒, 过期后先返回旧值并在后台刷新
+    CACHED = "cached"
+    # 不统计总数, 仅多取一行判断是否有下一页
+    NONE = "none"
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <stmt>, 沿用原语句的绑定参数"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: Any, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+async def estimate_count(
+    session: AsyncSession,
+    model: type,
+    where: Sequence[ColumnElement[bool]] = (),
+    *,
+    exact_below: int = 1000,
+    include_deleted: bool = False,
+) -> int | None:
+    """
+    按查询规划器的统计信息估算行数
+
+    无过滤条件时读取表统计 (PostgreSQL pg_class.reltuples / MySQL information_schema.TABLES),
+    有过滤条件时取 EXPLAIN 的行数估计 (仅 PostgreSQL)。估算值低于 exact_below 时
+    精确统计的代价本就很低, 直接执行 count(*) 以免小表上的估算偏差。
+
+    表统计包含已软删除的行, 因此软删除模型总是附加 NOT is_deleted 并走 EXPLAIN
+    (EXPLAIN 不经过 ORM 执行钩子, 需显式加入该条件); include_deleted 为真时不附加。
+
+    Returns:
+        估算行数, 方言不支持或表尚未 ANALYZE 时返回 None
+    """
+    dialect = session.get_bind().dialect.name
+    table = model.__table__
+    if issubclass(model, SoftDeleteMixin) and not include_deleted:
+        where = (*where, ~model.is_deleted)
+    estimate: float | None = None
+
+    if dialect == "postgresql":
+        if where:
+            plan = await session.scalar(_Explain(select(model).where(*where)))
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+        else:
+            name = f"{table.schema}.{table.name}" if table.schema else table.name
+            estimate = await session.scalar(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:name)"),
+                {"name": name},
+            )
+            # PostgreSQL 14+ 在从未 VACUUM / ANALYZE 的表上返回 -1
+            if estimate is not None and estimate < 0:
+                estimate = None
+    elif dialect == "mysql" and not where:
+        estimate = await session.scalar(
+            text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE()) AND TABLE_NAME = :name"
+            ),
+            {"schema": table.schema, "name": table.name},
+        )
+
+    if estimate is None:
+        return None
+    if estimate < exact_below:
+        return await session.scalar(
+            select(func.count()).select_from(model).where(*where),
+            execution_options={INCLUDE_DELETED: True} if include_deleted else {},
+        )
+    return int(estimate)
+
+
+class CountCache:
+    """
+    精确总数缓存 (进程内, stale-while-revalidate)
+
+    ttl 内直接返回缓存值; 过期但未超过 max_stale 时返回旧值, 并在后台用独立会话刷新
+    (同一语句同时只有一个刷新任务); 没有缓存或超过 max_stale 时同步统计。
+
+    Args:
+        ttl: 新鲜期 (秒)
+        max_stale: 允许返回旧值的最长时间 (秒)
+        max_entries: 最多缓存的语句数 (LRU 淘汰)
+    """
+
+    def __init__(self, ttl: float = 60.0, max_stale: float = 600.0, max_entries: int = 1024) -> None:
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+
+    @staticmethod
+    def _key(stmt: Select[Any], session: AsyncSession) -> str:
+        compiled = stmt.compile(session.get_bind())
+        return f"{compiled}|{sorted(compiled.params.items())!r}"
+
+    def _store(self, key: str, value: int) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, session: AsyncSession, stmt: Select[Any]) -> int:
+        """获取 count 语句的结果"""
+        key = self._key(stmt, session)
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+                return value
+            engine = session.bind
+            if age < self.max_stale and isinstance(engine, AsyncEngine):
+                if key not in self._refreshing:
+                    self._refreshing[key] = asyncio.create_task(self._refresh(key, engine, stmt))
+                return value
+
+        value = (await session.execute(stmt)).scalar_one()
+        self._store(key, value)
+        return value
+
+    async def _refresh(self, key: str, engine: AsyncEngine, stmt: Select[Any]) -> None:
+        # 经 ORM 会话执行, 与同步统计一样应用软删除等执行钩子
+        try:
+            async with AsyncSession(engine) as session:
+                self._store(key, (await session.execute(stmt)).scalar_one())
+        except Exception:
+            logger.warning("Background count refresh failed", exc_info=True)
+        finally:
+            self._refreshing.pop(key, None)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._entries.clear()
+
+
+# 默认总数缓存
+default_count_cache = CountCache()
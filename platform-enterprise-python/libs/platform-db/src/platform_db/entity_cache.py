@@ -0,0 +1,304 @@
+"""Second-Level Entity Cache"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Protocol
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, Session, make_transient_to_detached
+
+
+logger = logging.getLogger(__name__)
+
+# 失效后写入的占位值, 占位期间读取视为未命中且不回填,
+# 防止延迟副本或并发事务把旧数据重新写回缓存
+_TOMBSTONE = "!"
+
+# session.info 键
+_PENDING_KEYS = "entity_cache_pending"
+_WRITTEN = "entity_cache_written"
+
+
+class EntityCodec(Protocol):
+    """实体编解码器 (与 platform_cache.Codec 接口兼容)"""
+
+    def encode(self, value: Any) -> bytes: ...
+
+    def decode(self, data: bytes) -> Any: ...
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JsonEntityCodec:
+    """标准库 JSON 编解码器"""
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+@dataclass(frozen=True)
+class EntityCacheOptions:
+    """
+    模型级缓存声明, 设置为模型的 __entity_cache__ 类属性即启用
+
+    Args:
+        ttl: 缓存时间 (秒)
+        codec: 编解码器, 默认为 JSON; 二进制编解码器 (如 msgpack) 需配合 decode_responses=False 的客户端
+        version: 结构版本, 模型字段变更时递增以废弃旧缓存
+
+    Example:
+        class NotificationTemplate(Base):
+            __entity_cache__ = EntityCacheOptions(ttl=600)
+    """
+
+    ttl: int = 300
+    codec: EntityCodec | None = None
+    version: int = 1
+
+
+def _converter(python_type: type) -> Callable[[Any], Any] | None:
+    """编解码后丢失类型的列 (日期、Decimal、UUID、枚举) 的还原函数"""
+    if python_type in (datetime, date, time):
+        return python_type.fromisoformat
+    if python_type in (Decimal, UUID) or issubclass(python_type, Enum):
+        return python_type
+    return None
+
+
+class _ModelCodec:
+    """单个模型的编解码: 列属性字典 <-> 缓存值"""
+
+    def __init__(self, model: type, options: EntityCacheOptions, default_codec: EntityCodec) -> None:
+        self.model = model
+        self.options = options
+        self.codec = options.codec or default_codec
+        mapper: Mapper[Any] = inspect(model)
+        self.keys = [attr.key for attr in mapper.column_attrs]
+        self.converters: dict[str, tuple[type, Callable[[Any], Any]]] = {}
+        for attr in mapper.column_attrs:
+            try:
+                python_type = attr.columns[0].type.python_type
+            except NotImplementedError:
+                continue
+            converter = _converter(python_type)
+            if converter is not None:
+                self.converters[attr.key] = (python_type, converter)
+
+    def dumps(self, instance: Any) -> bytes | None:
+        """编码实例, 存在未加载 (已过期) 的列时返回 None"""
+        state = inspect(instance).dict
+        if any(key not in state for key in self.keys):
+            return None
+        return self.codec.encode({key: state[key] for key in self.keys})
+
+    def loads(self, data: bytes | str) -> Any:
+        """解码为游离 (detached) 实例"""
+        values = self.codec.decode(data.encode() if isinstance(data, str) else data)
+        for key, (python_type, converter) in self.converters.items():
+            value = values.get(key)
+            if value is not None and not isinstance(value, python_type):
+                values[key] = converter(value)
+        instance = self.model(**values)
+        make_transient_to_detached(instance)
+        return instance
+
+
+class EntityCache:
+    """
+    二级实体缓存 - 按主键缓存声明了 __entity_cache__ 的模型
+
+    命中时返回由缓存值重建的实例; 未命中的实例从数据库加载后以 SET NX 回填。
+    刷新 (flush) 中修改或删除的实例在事务提交后失效。
+    失效写入短期占位值, 占位期间不回填, 避免延迟副本或并发事务回填旧值。
+
+    Args:
+        redis: redis.asyncio.Redis 兼容客户端
+        prefix: 键前缀
+        tombstone_ttl: 失效占位时间 (秒), 应不小于副本最大复制延迟
+        codec: 默认编解码器
+    """
+
+    def __init__(
+        self,
+        redis: Any,
+        prefix: str = "entity",
+        tombstone_ttl: int = 5,
+        codec: EntityCodec | None = None,
+    ) -> None:
+        self.redis = redis
+        self.prefix = prefix
+        self.tombstone_ttl = tombstone_ttl
+        self.codec = codec or JsonEntityCodec()
+        self._models: dict[type, _ModelCodec | None] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def model_codec(self, model: type) -> _ModelCodec | None:
+        """模型的编解码器, 未声明缓存时返回 None"""
+        try:
+            return self._models[model]
+        except KeyError:
+            options = getattr(model, "__entity_cache__", None)
+            codec = _ModelCodec(model, options, self.codec) if options is not None else None
+            self._models[model] = codec
+            return codec
+
+    def key(self, model: type, id: Any) -> str:
+        """缓存键"""
+        codec = self.model_codec(model)
+        version = codec.options.version if codec is not None else 1
+        return f"{self.prefix}:{model.__table__.name}:v{version}:{id}"
+
+    async def get_many(self, model: type, ids: Sequence[Any]) -> dict[Any, Any]:
+        """批量读取, 返回命中的 id -> 游离实例"""
+        codec = self.model_codec(model)
+        if codec is None or not ids:
+            return {}
+        try:
+            values = await self.redis.mget([self.key(model, id) for id in ids])
+        except Exception:
+            # 缓存不可用时退化为直接访问数据库
+            logger.warning("Entity cache read failed", exc_info=True)
+            return {}
+        found = {}
+        for id, value in zip(ids, values, strict=True):
+            if value is None or value in (_TOMBSTONE, _TOMBSTONE.encode()):
+                continue
+            try:
+                found[id] = codec.loads(value)
+            except Exception:
+                logger.warning(f"Discarding undecodable cache entry for {model.__name__}({id})", exc_info=True)
+        return found
+
+    async def set_many(self, instances: Iterable[Any]) -> None:
+        """回填缓存 (占位值或已有值存在时不覆盖)"""
+        pipe = self.redis.pipeline(transaction=False)
+        queued = 0
+        for instance in instances:
+            codec = self.model_codec(type(instance))
+            if codec is None:
+                continue
+            data = codec.dumps(instance)
+            if data is None:
+                continue
+            pipe.set(self.key(type(instance), instance.id), data, ex=codec.options.ttl, nx=True)
+            queued += 1
+        if queued:
+            try:
+                await pipe.execute()
+            except Exception:
+                logger.warning("Entity cache write failed", exc_info=True)
+
+    async def invalidate(self, model: type, ids: Iterable[Any], session: AsyncSession | None = None) -> None:
+        """
+        失效缓存
+
+        Args:
+            model: 模型类
+            ids: 主键列表
+            session: 所在会话, 提交后会再次失效 (覆盖提交前被并发读取回填的旧值)
+        """
+        if self.model_codec(model) is None:
+            return
+        keys = [self.key(model, id) for id in ids]
+        if not keys:
+            return
+        if session is not None:
+            session.sync_session.info.setdefault(_PENDING_KEYS, set()).update(keys)
+            session.sync_session.info.setdefault(_WRITTEN, set()).add(model)
+        try:
+            await self._write_tombstones(keys)
+        except Exception:
+            logger.warning("Entity cache invalidation failed", exc_info=True)
+
+    async def _write_tombstones(self, keys: Iterable[str]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(key, _TOMBSTONE, ex=self.tombstone_ttl)
+        await pipe.execute()
+
+    def _schedule_tombstones(self, keys: set[str]) -> None:
+        """在同步事件钩子中调度失效 (运行于事件循环线程)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._write_tombstones(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Entity cache invalidation failed", exc_info=task.exception())
+
+    def _after_flush(self, session: Session, _flush_context: Any) -> None:
+        keys = set()
+        written = session.info.setdefault(_WRITTEN, set())
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            model = type(instance)
+            written.add(model)
+            if instance not in session.new and self.model_codec(model) is not None:
+                keys.add(self.key(model, inspect(instance).identity[0]))
+        if keys:
+            session.info.setdefault(_PENDING_KEYS, set()).update(keys)
+
+    def _after_commit(self, session: Session) -> None:
+        session.info.pop(_WRITTEN, None)
+        keys = session.info.pop(_PENDING_KEYS, None)
+        if keys:
+            self._schedule_tombstones(keys)
+
+    def _after_rollback(self, session: Session) -> None:
+        session.info.pop(_WRITTEN, None)
+        session.info.pop(_PENDING_KEYS, None)
+
+
+def session_has_writes(session: AsyncSession, model: type) -> bool:
+    """会话当前事务是否已写入过该模型 (此时读到的数据可能未提交, 不应回填缓存)"""
+    return model in session.sync_session.info.get(_WRITTEN, ())
+
+
+# 全局实体缓存, 未初始化时仓储直接访问数据库
+_state: dict[str, EntityCache] = {}
+
+
+def init_entity_cache(redis: Any, **kwargs: Any) -> EntityCache:
+    """初始化全局实体缓存并注册会话事件"""
+    previous = _state.get("cache")
+    if previous is not None:
+        _remove_listeners(previous)
+    cache = _state["cache"] = EntityCache(redis, **kwargs)
+    event.listen(Session, "after_flush", cache._after_flush)
+    event.listen(Session, "after_commit", cache._after_commit)
+    event.listen(Session, "after_rollback", cache._after_rollback)
+    return cache
+
+
+def _remove_listeners(cache: EntityCache) -> None:
+    event.remove(Session, "after_flush", cache._after_flush)
+    event.remove(Session, "after_commit", cache._after_commit)
+    event.remove(Session, "after_rollback", cache._after_rollback)
+
+
+def get_entity_cache() -> EntityCache | None:
+    """获取全局实体缓存 (未初始化时返回 None)"""
+    return _state.get("cache")
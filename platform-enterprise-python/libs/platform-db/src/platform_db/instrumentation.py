@@ -0,0 +1,346 @@
+"""Query Instrumentation - Per-Request Statement Stats, N+1 Detection, Slow Queries"""
+
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+try:
+    from platform_observability.metrics import default_registry
+except ImportError:  # 未安装 platform-observability 时指标为空操作
+    default_registry = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_CAST = re.compile(r"::\w+(?:\[\])?")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> tuple[str, str]:
+    """
+    归一化 SQL: 字面量与绑定参数替换为 ?, IN 列表与多行 VALUES 折叠
+
+    Returns:
+        (指纹 ID, 归一化 SQL)
+    """
+    sql = _WHITESPACE.sub(" ", statement).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _CAST.sub("", sql)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _LIST.sub("(?)", sql)
+    sql = _ROWS.sub("(?), ...", sql)
+    return hashlib.blake2b(sql.encode(), digest_size=6).hexdigest(), sql
+
+
+@dataclass
+class QueryStats:
+    """单个请求 (或 track 作用域) 内的语句统计"""
+
+    name: str = ""
+    count: int = 0
+    # 数据库耗时, 单位为秒
+    total_time: float = 0.0
+    by_fingerprint: dict[str, int] = field(default_factory=dict)
+
+    def record(self, fingerprint_id: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.by_fingerprint[fingerprint_id] = self.by_fingerprint.get(fingerprint_id, 0) + 1
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("platform_db_query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    """当前请求的语句统计 (不在 track 作用域内时返回 None)"""
+    return _current_stats.get()
+
+
+class _FingerprintWindow:
+    """单个指纹最近 window 次执行耗时的环形缓冲"""
+
+    __slots__ = ("calls", "samples", "sql")
+
+    def __init__(self, sql: str, window: int) -> None:
+        self.sql = sql
+        self.samples: deque[float] = deque(maxlen=window)
+        self.calls = 0
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _QueryMetrics:
+    """Prometheus 指标 (需安装 platform-observability, 否则为空操作)"""
+
+    def __init__(self) -> None:
+        self.enabled = default_registry is not None
+        if not self.enabled:
+            return
+
+        self.duration = default_registry.histogram(
+            "db_query_duration_seconds",
+            "SQL statement execution time by fingerprint",
+            ["fingerprint"],
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+        )
+        self.request_queries = default_registry.histogram(
+            "db_request_queries",
+            "SQL statements issued per request",
+            buckets=(1, 2, 3, 5, 10, 20, 50, 100, 200),
+        )
+        self.request_time = default_registry.histogram(
+            "db_request_time_seconds",
+            "Total database time per request",
+        )
+        self.slow = default_registry.counter(
+            "db_slow_queries_total",
+            "SQL statements slower than the slow-query threshold",
+            ["fingerprint"],
+        )
+        self.n_plus_one = default_registry.counter(
+            "db_n_plus_one_total",
+            "Requests repeating one statement fingerprint above the N+1 threshold",
+            ["fingerprint"],
+        )
+        self.p50 = default_registry.gauge(
+            "db_query_p50_seconds",
+            "Rolling p50 execution time by fingerprint",
+            ["fingerprint"],
+        )
+        self.p99 = default_registry.gauge(
+            "db_query_p99_seconds",
+            "Rolling p99 execution time by fingerprint",
+            ["fingerprint"],
+        )
+
+    def forget(self, fingerprint_id: str) -> None:
+        """移除指纹的全部序列 (指纹被 LRU 淘汰时调用, 避免标签基数无限增长)"""
+        if not self.enabled:
+            return
+        for metric in (self.duration, self.slow, self.n_plus_one, self.p50, self.p99):
+            metric.remove(fingerprint=fingerprint_id)
+
+
+class QueryInstrumentation:
+    """
+    基于引擎事件的语句埋点
+
+    - 在 track() 作用域 (通常为一个 HTTP 请求) 内累计语句数与数据库耗时, 存放于 contextvar
+    - 同一指纹在一个作用域内执行超过 n_plus_one_threshold 次时记录 N+1 告警
+    - 按指纹保留最近 window 次耗时, 提供滚动 p50 / p99
+    - 超过 slow_query_ms 的语句写入结构化慢查询日志 (只含归一化 SQL, 不含参数值)
+
+    Args:
+        slow_query_ms: 慢查询阈值 (毫秒)
+        n_plus_one_threshold: 单个作用域内同一指纹的最大执行次数
+        window: 每个指纹保留的耗时样本数
+        max_fingerprints: 最多跟踪的指纹数 (LRU 淘汰, 同时移除被淘汰指纹的 Prometheus 序列)
+        export_interval: 向 Prometheus 导出滚动分位数的最小间隔 (秒)
+
+    Example:
+        instrumentation = QueryInstrumentation(slow_query_ms=200)
+        db = DatabaseManager(url, instrumentation=instrumentation)
+        app.add_middleware(QueryStatsMiddleware, instrumentation=instrumentation)
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: float = 200.0,
+        n_plus_one_threshold: int = 10,
+        window: int = 1024,
+        max_fingerprints: int = 1000,
+        export_interval: float = 15.0,
+    ) -> None:
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self.export_interval = export_interval
+        self._fingerprints: OrderedDict[str, _FingerprintWindow] = OrderedDict()
+        self._metrics = _QueryMetrics()
+        self._exported_at = 0.0
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        """为引擎注册事件监听"""
+        sync_engine = engine.sync_engine
+        if event.contains(sync_engine, "before_cursor_execute", self._before_cursor_execute):
+            return
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn: Any, _cursor: Any, _statement: str, *_args: Any) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _handle_error(self, context: Any) -> None:
+        # 执行失败时不会触发 after_cursor_execute, 弹出对应的开始时间
+        if context.connection is not None:
+            starts = context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
+
+    def _after_cursor_execute(self, conn: Any, cursor: Any, statement: str, *_args: Any) -> None:
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        fingerprint_id, sql = fingerprint(statement)
+
+        window = self._fingerprints.get(fingerprint_id)
+        if window is None:
+            window = self._fingerprints[fingerprint_id] = _FingerprintWindow(sql, self.window)
+            if len(self._fingerprints) > self.max_fingerprints:
+                evicted, _ = self._fingerprints.popitem(last=False)
+                self._metrics.forget(evicted)
+        else:
+            self._fingerprints.move_to_end(fingerprint_id)
+        window.samples.append(duration)
+        window.calls += 1
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(fingerprint_id, duration)
+
+        if self._metrics.enabled:
+            self._metrics.duration.observe(duration, fingerprint=fingerprint_id)
+
+        if duration >= self.slow_query_seconds:
+            if self._metrics.enabled:
+                self._metrics.slow.inc(fingerprint=fingerprint_id)
+            logger.warning(
+                "Slow query",
+                extra={
+                    "fingerprint": fingerprint_id,
+                    "sql": sql,
+                    "duration_ms": round(duration * 1000, 2),
+                    "rowcount": getattr(cursor, "rowcount", -1),
+                    "scope": stats.name if stats is not None else None,
+                },
+            )
+
+    @contextmanager
+    def track(self, name: str = "") -> Iterator[QueryStats]:
+        """开启统计作用域, 退出时检测 N+1 并导出指标"""
+        stats = QueryStats(name=name)
+        token = _current_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            _current_stats.reset(token)
+            self._finish(stats)
+
+    def _finish(self, stats: QueryStats) -> None:
+        for fingerprint_id, count in stats.by_fingerprint.items():
+            if count <= self.n_plus_one_threshold:
+                continue
+            if self._metrics.enabled:
+                self._metrics.n_plus_one.inc(fingerprint=fingerprint_id)
+            window = self._fingerprints.get(fingerprint_id)
+            logger.warning(
+                "Possible N+1 query",
+                extra={
+                    "fingerprint": fingerprint_id,
+                    "sql": window.sql if window is not None else None,
+                    "count": count,
+                    "scope": stats.name,
+                },
+            )
+
+        if self._metrics.enabled:
+            self._metrics.request_queries.observe(stats.count)
+            self._metrics.request_time.observe(stats.total_time)
+            now = time.monotonic()
+            if now - self._exported_at >= self.export_interval:
+                self._exported_at = now
+                self.export_percentiles()
+
+    def export_percentiles(self) -> None:
+        """将各指纹的滚动 p50 / p99 写入 Prometheus gauge"""
+        if not self._metrics.enabled:
+            return
+        self._metrics.p50.clear()
+        self._metrics.p99.clear()
+        for fingerprint_id, window in list(self._fingerprints.items()):
+            self._metrics.p50.set(window.percentile(0.50), fingerprint=fingerprint_id)
+            self._metrics.p99.set(window.percentile(0.99), fingerprint=fingerprint_id)
+
+    def snapshot(self, limit: int = 20) -> list[dict[str, Any]]:
+        """按 p99 降序返回指纹统计 (用于调试端点)"""
+        rows = [
+            {
+                "fingerprint": fingerprint_id,
+                "sql": window.sql,
+                "calls": window.calls,
+                "p50_ms": round(window.percentile(0.50) * 1000, 3),
+                "p99_ms": round(window.percentile(0.99) * 1000, 3),
+            }
+            for fingerprint_id, window in list(self._fingerprints.items())
+        ]
+        rows.sort(key=lambda row: row["p99_ms"], reverse=True)
+        return rows[:limit]
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI 中间件 - 每个 HTTP 请求一个统计作用域
+
+    X-DB-Queries / X-DB-Time 响应头会暴露后端查询特征, 仅在 expose_headers 为真时添加 (通常为 debug 模式)。
+
+    Args:
+        app: ASGI 应用
+        instrumentation: 语句埋点
+        expose_headers: 是否添加 X-DB-Queries / X-DB-Time 响应头
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        instrumentation: QueryInstrumentation,
+        expose_headers: bool = False,
+    ) -> None:
+        self.app = app
+        self.instrumentation = instrumentation
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with self.instrumentation.track(f"{scope['method']} {scope['path']}") as stats:
+            if not self.expose_headers:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_with_headers(message: dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(stats.count).encode()))
+                    headers.append((b"x-db-time", f"{stats.total_time * 1000:.2f}ms".encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,221 @@
+"""Keyset (Cursor) Pagination"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, TypeVar
+from uuid import UUID
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+ItemT = TypeVar("ItemT")
+
+# 签名截断长度 (字节), 128 位足以防止伪造
+_SIGNATURE_BYTES = 16
+
+
+class InvalidCursorError(ValueError):
+    """游标格式错误、签名不匹配或与当前排序不符"""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _dump_value(value: Any) -> Any:
+    """将排序键的值转换为可 JSON 序列化的带类型标记形式"""
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    if isinstance(value, UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    if "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    if "d" in value:
+        return date.fromisoformat(value["d"])
+    if "dec" in value:
+        return Decimal(value["dec"])
+    if "uuid" in value:
+        return UUID(value["uuid"])
+    raise InvalidCursorError("Unsupported cursor value")
+
+
+class CursorCodec:
+    """
+    游标编解码器 - 排序键的值经 JSON 序列化后以 HMAC-SHA256 签名, 整体 base64url 编码
+
+    游标对客户端不透明, 篡改或在不同排序之间混用会被拒绝。
+
+    Args:
+        secret: 签名密钥
+    """
+
+    def __init__(self, secret: str | bytes) -> None:
+        self._secret = secret.encode() if isinstance(secret, str) else secret
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret, payload, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+
+    def encode(self, values: Sequence[Any], sort: str = "") -> str:
+        """
+        编码游标
+
+        Args:
+            values: 最后一行的排序键值 (如 [created_at, id])
+            sort: 排序描述, 解码时必须一致
+        """
+        payload = json.dumps(
+            {"s": sort, "v": [_dump_value(value) for value in values]},
+            separators=(",", ":"),
+        ).encode()
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def decode(self, cursor: str, sort: str = "") -> list[Any]:
+        """解码并校验游标, 返回排序键值"""
+        try:
+            payload_part, signature_part = cursor.split(".", 1)
+            payload = _b64decode(payload_part)
+            signature = _b64decode(signature_part)
+        except (ValueError, binascii.Error):
+            raise InvalidCursorError("Malformed cursor") from None
+
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidCursorError("Invalid cursor signature")
+
+        data = json.loads(payload)
+        if data.get("s") != sort:
+            raise InvalidCursorError("Cursor does not match the requested ordering")
+        return [_load_value(value) for value in data["v"]]
+
+
+# 全局游标编解码器, 需要在应用启动时初始化
+_state: dict[str, CursorCodec] = {}
+
+
+def init_cursor_codec(secret: str | bytes) -> CursorCodec:
+    """初始化全局游标编解码器"""
+    codec = _state["codec"] = CursorCodec(secret)
+    return codec
+
+
+def get_cursor_codec() -> CursorCodec:
+    """获取全局游标编解码器"""
+    codec = _state.get("codec")
+    if codec is None:
+        raise RuntimeError("Cursor codec not initialized. Call init_cursor_codec() first.")
+    return codec
+
+
+@dataclass
+class CursorPage(Generic[ItemT]):
+    """游标分页结果"""
+
+    items: list[ItemT] = field(default_factory=list)
+    # 下一页游标, 没有更多数据时为 None
+    next_cursor: str | None = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+@dataclass
+class OffsetPage(Generic[ItemT]):
+    """页码分页结果"""
+
+    items: list[ItemT] = field(default_factory=list)
+    # 总数, CountStrategy.NONE 时为 None
+    total: int | None = None
+    has_more: bool = False
+    # total 是否可能为估算值或缓存值
+    estimated: bool = False
+
+
+def _sort_signature(columns: Sequence[InstrumentedAttribute[Any]], descending: bool) -> str:
+    names = ",".join(f"{column.class_.__tablename__}.{column.key}" for column in columns)
+    return f"{names}:{'desc' if descending else 'asc'}"
+
+
+def encode_cursor(
+    item: Any,
+    order_by: Sequence[InstrumentedAttribute[Any]],
+    *,
+    descending: bool = False,
+    codec: CursorCodec | None = None,
+) -> str:
+    """生成指向 item 之后的游标 (参数需与 keyset_paginate 一致)"""
+    codec = codec or get_cursor_codec()
+    values = [getattr(item, column.key) for column in order_by]
+    return codec.encode(values, _sort_signature(order_by, descending))
+
+
+async def keyset_paginate(
+    session: AsyncSession,
+    stmt: Select[Any],
+    order_by: Sequence[InstrumentedAttribute[Any]],
+    *,
+    after: str | None = None,
+    limit: int = 20,
+    descending: bool = False,
+    codec: CursorCodec | None = None,
+) -> CursorPage[Any]:
+    """
+    按键集 (seek) 方式分页执行 ORM 查询
+
+    以 (排序键..., 唯一键) 的行值比较代替 OFFSET, 配合相同列序的复合索引,
+    任意深度的页都只扫描 limit + 1 行。
+
+    Args:
+        session: 数据库会话
+        stmt: 已带过滤条件的 select(Model)
+        order_by: 排序列, 最后一列必须唯一 (通常为主键)
+        after: 上一页返回的 next_cursor
+        limit: 每页数量
+        descending: 是否降序
+        codec: 游标编解码器, 默认为全局编解码器
+
+    Returns:
+        CursorPage
+    """
+    codec = codec or get_cursor_codec()
+    sort = _sort_signature(order_by, descending)
+    keys = tuple_(*order_by)
+
+    if after is not None:
+        values = codec.decode(after, sort)
+        if len(values) != len(order_by):
+            raise InvalidCursorError("Cursor does not match the requested ordering")
+        boundary = tuple_(*values)
+        stmt = stmt.where(keys < boundary if descending else keys > boundary)
+
+    stmt = stmt.order_by(*(column.desc() if descending else column.asc() for column in order_by))
+    result = await session.execute(stmt.limit(limit + 1))
+    items = list(result.scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1], order_by, descending=descending, codec=codec)
+    return CursorPage(items=items, next_cursor=next_cursor)
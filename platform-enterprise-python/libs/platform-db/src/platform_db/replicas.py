@@ -0,0 +1,176 @@
+"""Read Replica Routing"""
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL 备库状态: 是否处于恢复、WAL 接收进程是否在流复制、回放延迟 (秒)
+# 接收进程断开时已接收的 WAL 很快全部回放, 收放 LSN 相等并不代表没有延迟,
+# 因此须先确认 streaming。无 pg_read_all_stats 权限时 status 不可见 (NULL),
+# 此时只要接收进程存在即视为在流复制。
+_PG_LAG_SQL = text(
+    "SELECT pg_is_in_recovery() AS in_recovery,"
+    " EXISTS (SELECT 1 FROM pg_stat_wal_receiver"
+    " WHERE COALESCE(status, 'streaming') = 'streaming') AS streaming,"
+    " CASE"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END AS lag"
+)
+
+
+@dataclass
+class Replica:
+    """只读副本"""
+
+    url: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    # 最近一次测得的复制延迟 (秒), 尚未检测时为 None
+    lag: float | None = None
+    healthy: bool = True
+    in_flight: int = 0
+    checked_at: float = field(default=0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "url": self.engine.url.render_as_string(hide_password=True),
+            "lag": self.lag,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+        }
+
+
+async def measure_lag(engine: AsyncEngine) -> float:
+    """
+    测量副本的复制延迟 (秒), 不支持的方言返回 0
+
+    Raises:
+        RuntimeError: 复制未在运行 (PostgreSQL WAL 接收进程未在流复制 / MySQL 复制线程停止)
+    """
+    async with engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect == "postgresql":
+            row = (await conn.execute(_PG_LAG_SQL)).one()
+            if not row.in_recovery:
+                return 0.0
+            if not row.streaming:
+                raise RuntimeError("WAL receiver is not streaming")
+            return float(row.lag or 0)
+        if dialect == "mysql":
+            row = (await conn.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+            if row is None:
+                return 0.0
+            seconds = row.get("Seconds_Behind_Source")
+            if seconds is None:
+                raise RuntimeError("Replication is not running")
+            return float(seconds)
+        return 0.0
+
+
+class ReplicaBalancer:
+    """
+    副本负载均衡 - 在健康副本中选择进行中会话最少者, 相同时轮询
+
+    复制延迟超过 max_lag 或检测失败的副本被剔除, 延迟恢复后自动重新加入。
+
+    Args:
+        replicas: 副本列表
+        max_lag: 允许的最大复制延迟 (秒)
+    """
+
+    def __init__(self, replicas: list[Replica], max_lag: float) -> None:
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self._counter = itertools.count()
+
+    def choose(self) -> Replica | None:
+        """选择副本, 没有健康副本时返回 None"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        offset = next(self._counter) % len(healthy)
+        rotated = healthy[offset:] + healthy[:offset]
+        return min(rotated, key=lambda replica: replica.in_flight)
+
+    async def check(self) -> None:
+        """并发检测所有副本的复制延迟并更新健康状态"""
+        results = await asyncio.gather(
+            *(measure_lag(replica.engine) for replica in self.replicas),
+            return_exceptions=True,
+        )
+        for replica, result in zip(self.replicas, results, strict=True):
+            replica.checked_at = time.monotonic()
+            if isinstance(result, BaseException):
+                replica.lag = None
+                healthy = False
+                reason = f"lag check failed: {result!r}"
+            else:
+                replica.lag = result
+                healthy = result <= self.max_lag
+                reason = f"lag {result:.2f}s (max {self.max_lag:.2f}s)"
+
+            if healthy != replica.healthy:
+                action = "restored" if healthy else "ejected"
+                logger.warning(f"Read replica {action}: {replica.to_dict()['url']}, {reason}")
+            replica.healthy = healthy
+
+
+class StickyStore(Protocol):
+    """读己之写标记存储 - 记录近期写入过的主体, 使其读取在窗口期内走主库"""
+
+    async def mark(self, key: str, ttl: float) -> None: ...
+
+    async def is_sticky(self, key: str) -> bool: ...
+
+
+class LocalStickyStore:
+    """进程内标记存储 (单实例部署; 多实例部署请使用 RedisStickyStore)"""
+
+    def __init__(self) -> None:
+        self._expires: dict[str, float] = {}
+
+    async def mark(self, key: str, ttl: float) -> None:
+        now = time.monotonic()
+        self._expires[key] = now + ttl
+        # 顺带清理过期标记, 避免字典无限增长
+        if len(self._expires) > 10_000:
+            self._expires = {k: v for k, v in self._expires.items() if v > now}
+
+    async def is_sticky(self, key: str) -> bool:
+        expires = self._expires.get(key)
+        if expires is None:
+            return False
+        if expires <= time.monotonic():
+            self._expires.pop(key, None)
+            return False
+        return True
+
+
+class RedisStickyStore:
+    """
+    基于 Redis 的标记存储, 同一服务的多个实例共享
+
+    Args:
+        redis: redis.asyncio.Redis 兼容客户端
+        prefix: 键前缀
+    """
+
+    def __init__(self, redis: Any, prefix: str = "db:primary:") -> None:
+        self.redis = redis
+        self.prefix = prefix
+
+    async def mark(self, key: str, ttl: float) -> None:
+        await self.redis.set(f"{self.prefix}{key}", 1, px=max(1, int(ttl * 1000)))
+
+    async def is_sticky(self, key: str) -> bool:
+        return bool(await self.redis.exists(f"{self.prefix}{key}"))
@@ -1,50 +1,323 @@
 """Base Repository Pattern"""
 
+from collections.abc import Callable, Hashable, Iterator
+from dataclasses import dataclass
 from typing import Any, Generic, Sequence, TypeVar
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Executable,
+    Table,
+    UniqueConstraint,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
 
-from platform_db.base import Base
+from platform_db.base import INCLUDE_DELETED, Base
+from platform_db.counting import CountCache, CountStrategy, default_count_cache, estimate_count
+from platform_db.entity_cache import get_entity_cache, session_has_writes
+from platform_db.pagination import CursorCodec, CursorPage, OffsetPage, keyset_paginate
+from platform_db.statements import StatementRegistry, default_statement_registry
 
 
 ModelT = TypeVar("ModelT", bound=Base)
 
+# 单条语句的绑定参数上限
+_MAX_PARAMS = {
+    "postgresql": 32767,
+    "sqlite": 32766,
+    "mysql": 65535,
+}
+_DEFAULT_MAX_PARAMS = 2000
+
+
+def _execution_options(include_deleted: bool) -> dict[str, Any]:
+    """执行选项: include_deleted 为真时不过滤已软删除的记录"""
+    return {INCLUDE_DELETED: True} if include_deleted else {}
+
+
+def _rows_per_statement(dialect: str, columns: int, chunk_size: int) -> int:
+    """在 chunk_size 与方言参数上限之间取每条语句的行数"""
+    limit = _MAX_PARAMS.get(dialect, _DEFAULT_MAX_PARAMS) // max(columns, 1)
+    return max(1, min(chunk_size, limit))
+
+
+def _chunks(items: list[Any], size: int) -> Iterator[list[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _partial_index_where(table: Table, conflict: list[str], dialect: str) -> ColumnElement[bool] | None:
+    """冲突列恰好是某个部分唯一索引的列时返回其索引条件 (存在非部分唯一约束时返回 None)"""
+    target = set(conflict)
+    if {column.name for column in table.primary_key} == target:
+        return None
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and {column.name for column in constraint.columns} == target:
+            return None
+
+    where = None
+    for index in table.indexes:
+        if not index.unique or {column.name for column in index.columns} != target:
+            continue
+        index_where = index.dialect_options[dialect]["where"]
+        if index_where is None:
+            return None
+        where = index_where
+    return where
+
+
+@dataclass
+class UpsertResult:
+    """批量 upsert 结果"""
+
+    inserted: int = 0
+    # 冲突键已存在的行数 (DO NOTHING 时为 0)
+    updated: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.inserted + self.updated
+
 
 class BaseRepository(Generic[ModelT]):
-    """异步仓储基类"""
+    """
+    异步仓储基类
+
+    常用查找 (get_by_id / get_by_ids / get_by / get_all / exists) 使用按模型登记的预构建语句,
+    每次调用只传入参数, 不重新构建语句与计算缓存键。
+    """
 
     model: type[ModelT]
+    statements: StatementRegistry = default_statement_registry
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
-    async def get_by_id(self, id: int) -> ModelT | None:
-        """根据 ID 获取"""
-        return await self.session.get(self.model, id)
+    def _statement[StmtT: Executable](self, name: Hashable, build: Callable[[], StmtT]) -> StmtT:
+        """获取本模型的预构建语句"""
+        return self.statements.get((self.model, name), build)
+
+    def _in_identity_map(self, id: Any) -> bool:
+        key = inspect(self.model).identity_key_from_primary_key([id])
+        return key in self.session.identity_map
+
+    async def _load_by_id(self, id: Any, include_deleted: bool = False) -> ModelT | None:
+        """按主键加载, 已在会话中的实例直接返回 (过期时由 session.get 刷新)"""
+        options = _execution_options(include_deleted)
+        if self._in_identity_map(id):
+            return await self.session.get(self.model, id, execution_options=options)
+        stmt = self._statement("by_id", lambda: select(self.model).where(self.model.id == bindparam("id")))
+        result = await self.session.execute(stmt, {"id": id}, execution_options=options)
+        return result.scalar_one_or_none()
+
+    async def get_by_id(self, id: int, *, include_deleted: bool = False) -> ModelT | None:
+        """
+        根据 ID 获取 (模型声明了 __entity_cache__ 时先查二级缓存)
+
+        include_deleted 为真时包含已软删除的记录, 直接查询数据库。
+        """
+        cache = get_entity_cache()
+        if include_deleted or cache is None or cache.model_codec(self.model) is None or self._in_identity_map(id):
+            return await self._load_by_id(id, include_deleted)
 
-    async def get_by_ids(self, ids: list[int]) -> Sequence[ModelT]:
-        """根据 ID 列表获取"""
+        hits = await cache.get_many(self.model, [id])
+        if id in hits:
+            instance = hits[id]
+            self.session.add(instance)
+            return instance
+
+        instance = await self._load_by_id(id)
+        if instance is not None and not session_has_writes(self.session, self.model):
+            await cache.set_many([instance])
+        return instance
+
+    async def get_by_ids(self, ids: list[int], *, include_deleted: bool = False) -> Sequence[ModelT]:
+        """
+        根据 ID 列表获取 (启用二级缓存时批量读取命中项, 仅从数据库加载未命中项)
+
+        include_deleted 为真时包含已软删除的记录, 直接查询数据库。
+        """
         if not ids:
             return []
-        stmt = select(self.model).where(self.model.id.in_(ids))
-        result = await self.session.execute(stmt)
-        return result.scalars().all()
+        stmt = self._statement(
+            "by_ids",
+            lambda: select(self.model).where(self.model.id.in_(bindparam("ids", expanding=True))),
+        )
+        cache = get_entity_cache()
+        if include_deleted or cache is None or cache.model_codec(self.model) is None:
+            result = await self.session.execute(
+                stmt, {"ids": ids}, execution_options=_execution_options(include_deleted)
+            )
+            return result.scalars().all()
+
+        unique = list(dict.fromkeys(ids))
+        # 已在会话中的实例以会话状态为准
+        cached_ids = [id for id in unique if not self._in_identity_map(id)]
+        found: dict[Any, ModelT] = await cache.get_many(self.model, cached_ids)
+        for instance in found.values():
+            self.session.add(instance)
+
+        missing = [id for id in unique if id not in found]
+        if missing:
+            result = await self.session.execute(stmt, {"ids": missing})
+            loaded = result.scalars().all()
+            found.update((instance.id, instance) for instance in loaded)
+            if not session_has_writes(self.session, self.model):
+                fetched = set(cached_ids)
+                await cache.set_many(instance for instance in loaded if instance.id in fetched)
+        return [found[id] for id in unique if id in found]
 
     async def get_all(
         self,
         *,
         skip: int = 0,
         limit: int = 100,
+        include_deleted: bool = False,
     ) -> Sequence[ModelT]:
-        """获取所有记录（分页）"""
-        stmt = select(self.model).offset(skip).limit(limit)
-        result = await self.session.execute(stmt)
+        """获取所有记录 (OFFSET 分页, 深分页请使用 paginate)"""
+        stmt = self._statement(
+            "all",
+            lambda: select(self.model).offset(bindparam("skip")).limit(bindparam("limit")),
+        )
+        result = await self.session.execute(
+            stmt,
+            {"skip": skip, "limit": limit},
+            execution_options=_execution_options(include_deleted),
+        )
         return result.scalars().all()
 
-    async def count(self) -> int:
-        """统计总数"""
-        stmt = select(func.count()).select_from(self.model)
+    async def get_by(self, *, include_deleted: bool = False, **values: Any) -> ModelT | None:
+        """
+        按列等值查找单条记录, 如 get_by(email=email)
+
+        语句按列名组合预构建; 用于唯一列, 匹配多行时抛出 MultipleResultsFound。
+        include_deleted 为真时包含已软删除的记录。
+        """
+        columns = tuple(sorted(values))
+        stmt = self._statement(
+            ("by", columns),
+            lambda: select(self.model).where(*(getattr(self.model, column) == bindparam(column) for column in columns)),
+        )
+        result = await self.session.execute(stmt, values, execution_options=_execution_options(include_deleted))
+        return result.scalar_one_or_none()
+
+    async def paginate(
+        self,
+        *,
+        order_by: InstrumentedAttribute[Any] | None = None,
+        after: str | None = None,
+        limit: int = 20,
+        descending: bool = False,
+        where: Sequence[ColumnElement[bool]] = (),
+        codec: CursorCodec | None = None,
+    ) -> CursorPage[ModelT]:
+        """
+        游标分页 - 以 (order_by, id) 作为查找键, 耗时与页深无关
+
+        Args:
+            order_by: 排序列 (如 Model.created_at), 为空时仅按 id 排序
+            after: 上一页返回的 next_cursor
+            limit: 每页数量
+            descending: 是否降序
+            where: 过滤条件
+            codec: 游标编解码器, 默认为全局编解码器 (见 init_cursor_codec)
+
+        Returns:
+            CursorPage, next_cursor 为空表示没有更多数据
+        """
+        columns = [self.model.id] if order_by is None or order_by is self.model.id else [order_by, self.model.id]
+        stmt = select(self.model).where(*where)
+        return await keyset_paginate(
+            self.session,
+            stmt,
+            columns,
+            after=after,
+            limit=limit,
+            descending=descending,
+            codec=codec,
+        )
+
+    async def get_page(
+        self,
+        *,
+        page: int = 1,
+        page_size: int = 20,
+        where: Sequence[ColumnElement[bool]] = (),
+        order_by: Sequence[ColumnElement[Any]] = (),
+        count: CountStrategy = CountStrategy.EXACT,
+    ) -> OffsetPage[ModelT]:
+        """
+        页码分页 - 多取一行判断 has_more, 总数按 count 策略统计
+
+        Args:
+            page: 页码 (从 1 开始)
+            page_size: 每页数量
+            where: 过滤条件
+            order_by: 排序, 默认按 id
+            count: 总数统计策略, CountStrategy.NONE 时不统计总数
+
+        Returns:
+            OffsetPage
+        """
+        stmt = (
+            select(self.model)
+            .where(*where)
+            .order_by(*(order_by or (self.model.id,)))
+            .offset((page - 1) * page_size)
+            .limit(page_size + 1)
+        )
+        items = list((await self.session.scalars(stmt)).all())
+        has_more = len(items) > page_size
+
+        if count is CountStrategy.NONE:
+            return OffsetPage(items=items[:page_size], has_more=has_more)
+
+        total = await self.count(where=where, strategy=count)
+        return OffsetPage(
+            items=items[:page_size],
+            total=total,
+            has_more=has_more,
+            estimated=count is not CountStrategy.EXACT,
+        )
+
+    async def count(
+        self,
+        *,
+        where: Sequence[ColumnElement[bool]] = (),
+        strategy: CountStrategy = CountStrategy.EXACT,
+        cache: CountCache | None = None,
+    ) -> int:
+        """
+        统计总数
+
+        Args:
+            where: 过滤条件
+            strategy: 统计策略 (EXACT / ESTIMATE / CACHED)
+            cache: CACHED 策略使用的缓存, 默认为 default_count_cache
+        """
+        stmt = select(func.count()).select_from(self.model).where(*where)
+        if strategy is CountStrategy.ESTIMATE:
+            estimate = await estimate_count(self.session, self.model, where)
+            if estimate is not None:
+                return estimate
+        elif strategy is CountStrategy.CACHED:
+            return await (cache or default_count_cache).get(self.session, stmt)
+        elif strategy is CountStrategy.NONE:
+            raise ValueError("CountStrategy.NONE does not produce a count")
         result = await self.session.execute(stmt)
         return result.scalar_one()
 
@@ -56,14 +329,265 @@ class BaseRepository(Generic[ModelT]):
         await self.session.refresh(instance)
         return instance
 
-    async def create_many(self, data_list: list[dict[str, Any]]) -> list[ModelT]:
-        """批量创建"""
-        instances = [self.model(**data) for data in data_list]
-        self.session.add_all(instances)
-        await self.session.flush()
-        for instance in instances:
-            await self.session.refresh(instance)
-        return instances
+    async def create_many(
+        self,
+        data_list: list[dict[str, Any]],
+        *,
+        chunk_size: int = 1000,
+        return_instances: bool = True,
+        returning: Sequence[InstrumentedAttribute[Any]] | None = None,
+    ) -> list[ModelT] | list[dict[str, Any]]:
+        """
+        批量创建 - 每个分块一条多行 INSERT ... RETURNING
+
+        分块由 SQLAlchemy insertmanyvalues 编译为多行 VALUES。PostgreSQL 借助
+        自增主键作为哨兵列将 RETURNING 按输入顺序对齐; SQLite 同样支持 RETURNING,
+        但没有隐式哨兵列, 改为按同一语句内单调分配的主键排序恢复输入顺序。
+
+        Args:
+            data_list: 待插入的行 (属性名 -> 值)
+            chunk_size: 每条语句的最大行数 (同时受方言绑定参数上限约束)
+            return_instances: 为 False 时不构造 ORM 实例, 仅返回 returning 列的字典
+            returning: return_instances=False 时返回的列, 默认为主键
+
+        Returns:
+            按输入顺序排列的 ORM 实例, 或 returning 列的字典列表
+        """
+        if not data_list:
+            return []
+
+        dialect = self.session.get_bind().dialect
+        columns = max(len(data) for data in data_list)
+        size = _rows_per_statement(dialect.name, columns, chunk_size)
+        options = {"insertmanyvalues_page_size": size}
+        # 无隐式哨兵列时 sort_by_parameter_order 会退化为逐行 INSERT, 改为按主键排序;
+        # 调用方显式给出主键时不能假定其单调, 保留逐行路径
+        sort_by_id = not dialect.insertmanyvalues_implicit_sentinel & InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT
+        sort_by_id = sort_by_id and all("id" not in data for data in data_list)
+
+        if return_instances:
+            stmt = insert(self.model).returning(self.model, sort_by_parameter_order=not sort_by_id)
+            instances: list[ModelT] = []
+            for chunk in _chunks(data_list, size):
+                result = await self.session.scalars(stmt, chunk, execution_options=options)
+                batch = result.all()
+                instances.extend(sorted(batch, key=lambda instance: instance.id) if sort_by_id else batch)
+            return instances
+
+        columns_returned = list(returning or [self.model.id])
+        extra_id = sort_by_id and not any(column.key == "id" for column in columns_returned)
+        if extra_id:
+            columns_returned.append(self.model.id)
+        stmt = insert(self.model).returning(*columns_returned, sort_by_parameter_order=not sort_by_id)
+        rows: list[dict[str, Any]] = []
+        for chunk in _chunks(data_list, size):
+            result = await self.session.execute(stmt, chunk, execution_options=options)
+            batch = [dict(row) for row in result.mappings()]
+            if sort_by_id:
+                batch.sort(key=lambda row: row["id"])
+            if extra_id:
+                for row in batch:
+                    del row["id"]
+            rows.extend(batch)
+        return rows
+
+    async def copy_many(self, data_list: list[dict[str, Any]]) -> int:
+        """
+        通过 PostgreSQL COPY 批量导入 (asyncpg), 适用于数十万行级别的导入
+
+        COPY 不经过 ORM, 也不返回生成的主键; 列默认值中的 Python 标量与
+        无参可调用对象会在客户端补齐, 其余省略的列由数据库默认值填充。
+        所有行应包含相同的键。非 asyncpg 连接时退化为 create_many(return_instances=False)。
+
+        Returns:
+            写入的行数
+        """
+        if not data_list:
+            return 0
+
+        connection = await self.session.connection()
+        if connection.dialect.driver != "asyncpg":
+            await self.create_many(data_list, return_instances=False)
+            return len(data_list)
+
+        mapper = inspect(self.model)
+        table = self.model.__table__
+        keys = list(dict.fromkeys(key for data in data_list for key in data))
+        defaults: dict[str, Any] = {}
+        for attr in mapper.column_attrs:
+            column = attr.columns[0]
+            if attr.key in keys or column.default is None:
+                continue
+            if column.default.is_scalar or column.default.is_callable:
+                keys.append(attr.key)
+                defaults[attr.key] = column.default
+
+        def value(data: dict[str, Any], key: str) -> Any:
+            if key in data:
+                return data[key]
+            default = defaults.get(key)
+            if default is None:
+                return None
+            return default.arg(None) if default.is_callable else default.arg
+
+        records = (tuple(value(data, key) for key in keys) for data in data_list)
+        raw = await connection.get_raw_connection()
+        status = await raw.driver_connection.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=[mapper.column_attrs[key].columns[0].name for key in keys],
+            schema_name=table.schema,
+        )
+        return int(status.split()[-1])
+
+    async def upsert_many(
+        self,
+        rows: list[dict[str, Any]],
+        conflict_cols: Sequence[str],
+        update_cols: Sequence[str] | None = None,
+        *,
+        conflict_where: ColumnElement[bool] | None = None,
+        chunk_size: int = 1000,
+    ) -> UpsertResult:
+        """
+        批量插入或更新 - 每个分块一条 INSERT ... ON CONFLICT DO UPDATE
+
+        PostgreSQL / SQLite 编译为 ON CONFLICT, MySQL 编译为 ON DUPLICATE KEY UPDATE
+        (MySQL 对表上任一唯一键冲突都会触发更新)。同一批次内冲突键重复的行只保留最后一次出现的值;
+        更新时带 onupdate 的列 (如 updated_at) 会一并刷新。语句不经过 ORM 工作单元,
+        会话中已加载的实例不会被刷新; 模型启用了二级缓存时, 被更新的行会失效。
+
+        Args:
+            rows: 待写入的行 (属性名 -> 值)
+            conflict_cols: 冲突判断列 (须有唯一约束或唯一索引)
+            update_cols: 冲突时更新的列, 默认为行中除冲突列与主键外的所有列, 为空时冲突行保持不变
+            conflict_where: 冲突目标为部分唯一索引时的索引条件 (ON CONFLICT ... WHERE)。
+                为空时从 conflict_cols 对应的部分唯一索引 (如 active_index) 推导
+            chunk_size: 每条语句的最大行数 (同时受方言绑定参数上限约束)
+
+        Returns:
+            UpsertResult (新插入行数与已存在行数)
+        """
+        if not rows:
+            return UpsertResult()
+
+        dialect = self.session.get_bind().dialect.name
+        if dialect not in ("postgresql", "sqlite", "mysql"):
+            raise NotImplementedError(f"upsert_many is not supported for dialect '{dialect}'")
+
+        mapper = inspect(self.model)
+        table = self.model.__table__
+        primary_keys = {column.name for column in table.primary_key}
+
+        def column_name(key: str) -> str:
+            return mapper.column_attrs[key].columns[0].name
+
+        conflict = [column_name(key) for key in conflict_cols]
+        if conflict_where is None and dialect != "mysql":
+            conflict_where = _partial_index_where(table, conflict, dialect)
+        unique = {tuple(row[key] for key in conflict_cols): row for row in rows}
+
+        # 多行 VALUES 要求各行的列相同, 按列集合分组
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for row in unique.values():
+            values = {column_name(key): value for key, value in row.items()}
+            groups.setdefault(tuple(values), []).append(values)
+
+        cache = get_entity_cache()
+        cached = cache is not None and cache.model_codec(self.model) is not None
+        result = UpsertResult()
+        for names, group in groups.items():
+            if update_cols is None:
+                updates = [name for name in names if name not in conflict and name not in primary_keys]
+            else:
+                updates = [column_name(key) for key in update_cols]
+            size = _rows_per_statement(dialect, len(names), chunk_size)
+            for chunk in _chunks(group, size):
+                inserted, updated = await self._upsert_chunk(
+                    dialect, table, chunk, conflict, updates, conflict_where=conflict_where
+                )
+                if updated and cached:
+                    condition = self._conflict_condition(table, chunk, conflict, conflict_where)
+                    ids = await self.session.scalars(select(table.c.id).where(condition))
+                    await self._invalidate(ids.all())
+                result.inserted += inserted
+                result.updated += updated
+        return result
+
+    @staticmethod
+    def _conflict_condition(
+        table: Table,
+        chunk: list[dict[str, Any]],
+        conflict: list[str],
+        conflict_where: ColumnElement[bool] | None = None,
+    ) -> ColumnElement[bool]:
+        """匹配分块中冲突键 (且满足部分索引条件) 的 WHERE 条件"""
+        columns = [table.c[name] for name in conflict]
+        keys = [tuple(values[name] for name in conflict) for values in chunk]
+        condition = columns[0].in_([key[0] for key in keys]) if len(columns) == 1 else tuple_(*columns).in_(keys)
+        if conflict_where is not None:
+            condition = and_(condition, conflict_where)
+        return condition
+
+    async def _upsert_chunk(
+        self,
+        dialect: str,
+        table: Table,
+        chunk: list[dict[str, Any]],
+        conflict: list[str],
+        updates: list[str],
+        *,
+        conflict_where: ColumnElement[bool] | None = None,
+    ) -> tuple[int, int]:
+        """执行单个分块的 upsert, 返回 (插入数, 更新数)"""
+        onupdate = {
+            column.name: column.onupdate.arg
+            for column in table.columns
+            if column.onupdate is not None
+            and (column.onupdate.is_scalar or column.onupdate.is_clause_element)
+            and column.name not in chunk[0]
+        }
+
+        if dialect == "postgresql":
+            stmt = postgresql.insert(table).values(chunk)
+            if updates:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=conflict,
+                    index_where=conflict_where,
+                    set_={name: stmt.excluded[name] for name in updates} | onupdate,
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict, index_where=conflict_where)
+            # 新插入的行 xmax 为 0; DO NOTHING 时冲突行不出现在 RETURNING 中
+            result = await self.session.execute(stmt.returning(literal_column("xmax = 0")))
+            flags = result.scalars().all()
+            inserted = sum(1 for flag in flags if flag)
+            return inserted, len(flags) - inserted
+
+        # SQLite / MySQL 无法从语句结果区分插入与更新, 先在同一事务内统计已存在的冲突键
+        condition = self._conflict_condition(table, chunk, conflict, conflict_where)
+        existing = await self.session.scalar(select(func.count()).select_from(table).where(condition))
+
+        if dialect == "sqlite":
+            stmt = sqlite.insert(table).values(chunk)
+            if updates:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=conflict,
+                    index_where=conflict_where,
+                    set_={name: stmt.excluded[name] for name in updates} | onupdate,
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict, index_where=conflict_where)
+        else:
+            stmt = mysql.insert(table).values(chunk)
+            if updates:
+                stmt = stmt.on_duplicate_key_update({name: stmt.inserted[name] for name in updates} | onupdate)
+            else:
+                # 将冲突列赋值为自身, 等价于 DO NOTHING 且不吞掉其他错误 (区别于 INSERT IGNORE)
+                stmt = stmt.on_duplicate_key_update({conflict[0]: table.c[conflict[0]]})
+
+        await self.session.execute(stmt)
+        return len(chunk) - existing, existing if updates else 0
 
     async def update(self, instance: ModelT, data: dict[str, Any]) -> ModelT:
         """更新实例"""
@@ -71,30 +595,136 @@ class BaseRepository(Generic[ModelT]):
             if hasattr(instance, key):
                 setattr(instance, key, value)
         await self.session.flush()
+        await self._invalidate([instance.id])
         await self.session.refresh(instance)
         return instance
 
-    async def update_by_id(self, id: int, data: dict[str, Any]) -> ModelT | None:
-        """根据 ID 更新"""
-        instance = await self.get_by_id(id)
-        if not instance:
+    def _version_column(self) -> InstrumentedAttribute[Any] | None:
+        """乐观锁版本列 (模型 __mapper_args__ 中的 version_id_col)"""
+        mapper = inspect(self.model)
+        if mapper.version_id_col is None:
+            return None
+        return mapper.get_property_by_column(mapper.version_id_col).class_attribute
+
+    async def _check_version_conflict(
+        self, id: int, where: Sequence[ColumnElement[bool]], expected_version: int | None
+    ) -> None:
+        """语句未命中且指定了版本时, 区分记录不存在与版本冲突"""
+        if expected_version is None:
+            return
+        stmt = select(func.count()).select_from(self.model).where(self.model.id == id, *where)
+        if await self.session.scalar(stmt):
+            raise StaleDataError(
+                f"{self.model.__name__}({id}) was modified concurrently (expected version {expected_version})"
+            )
+
+    async def update_by_id(
+        self,
+        id: int,
+        data: dict[str, Any],
+        *,
+        where: Sequence[ColumnElement[bool]] = (),
+        expected_version: int | None = None,
+    ) -> ModelT | None:
+        """
+        根据 ID 更新 - 单条 UPDATE ... RETURNING, 不预先加载实例
+
+        模型配置了 version_id_col 时版本号自增; 传入 expected_version 时仅在版本匹配时更新。
+        不支持 UPDATE ... RETURNING 的方言 (如 MySQL) 退化为 UPDATE 后再 SELECT。
+
+        Args:
+            id: 主键
+            data: 待更新的列 (属性名 -> 值)
+            where: 附加条件 (如归属用户), 不满足时视为不存在
+            expected_version: 期望的当前版本号
+
+        Returns:
+            更新后的实例, 记录不存在 (或不满足 where) 时返回 None
+
+        Raises:
+            StaleDataError: 记录存在但版本号不匹配
+        """
+        conditions = [self.model.id == id, *where]
+        version = self._version_column()
+        values = dict(data)
+        if version is not None:
+            if expected_version is not None:
+                conditions.append(version == expected_version)
+            values[version.key] = version + 1
+
+        if not values:
+            return await self.session.scalar(select(self.model).where(*conditions))
+
+        stmt = update(self.model).where(*conditions).values(values)
+        options = {"synchronize_session": "fetch", "populate_existing": True}
+        if self.session.get_bind().dialect.update_returning:
+            instance = await self.session.scalar(stmt.returning(self.model), execution_options=options)
+        else:
+            result = await self.session.execute(stmt, execution_options={"synchronize_session": "fetch"})
+            instance = None
+            if result.rowcount:
+                instance = await self.session.scalar(
+                    select(self.model).where(self.model.id == id), execution_options={"populate_existing": True}
+                )
+
+        if instance is None:
+            await self._check_version_conflict(id, where, expected_version)
             return None
-        return await self.update(instance, data)
+        await self._invalidate([id])
+        return instance
 
     async def delete(self, instance: ModelT) -> None:
         """删除实例"""
         await self.session.delete(instance)
+        await self._invalidate([instance.id])
+
+    async def _invalidate(self, ids: Sequence[Any]) -> None:
+        """失效二级缓存 (提交后会再次失效)"""
+        cache = get_entity_cache()
+        if cache is not None:
+            await cache.invalidate(self.model, ids, self.session)
 
-    async def delete_by_id(self, id: int) -> bool:
-        """根据 ID 删除"""
-        instance = await self.get_by_id(id)
-        if not instance:
+    async def delete_by_id(
+        self,
+        id: int,
+        *,
+        where: Sequence[ColumnElement[bool]] = (),
+        expected_version: int | None = None,
+    ) -> bool:
+        """
+        根据 ID 删除 - 单条 DELETE, 不预先加载实例
+
+        Args:
+            id: 主键
+            where: 附加条件 (如归属用户)
+            expected_version: 期望的当前版本号 (模型配置了 version_id_col 时生效)
+
+        Returns:
+            是否删除了记录
+
+        Raises:
+            StaleDataError: 记录存在但版本号不匹配
+        """
+        conditions = [self.model.id == id, *where]
+        version = self._version_column()
+        if version is not None and expected_version is not None:
+            conditions.append(version == expected_version)
+
+        result = await self.session.execute(
+            delete(self.model).where(*conditions),
+            execution_options={"synchronize_session": "fetch"},
+        )
+        if not result.rowcount:
+            await self._check_version_conflict(id, where, expected_version)
             return False
-        await self.delete(instance)
+        await self._invalidate([id])
         return True
 
-    async def exists(self, id: int) -> bool:
-        """检查是否存在"""
-        stmt = select(func.count()).where(self.model.id == id)
-        result = await self.session.execute(stmt)
+    async def exists(self, id: int, *, include_deleted: bool = False) -> bool:
+        """检查是否存在 (include_deleted 为真时包含已软删除的记录)"""
+        stmt = self._statement(
+            "exists",
+            lambda: select(func.count()).select_from(self.model).where(self.model.id == bindparam("id")),
+        )
+        result = await self.session.execute(stmt, {"id": id}, execution_options=_execution_options(include_deleted))
         return result.scalar_one() > 0
@@ -1,18 +1,107 @@
 """Database Session Management"""
 
-from collections.abc import AsyncGenerator
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
 from contextlib import asynccontextmanager
+from typing import Any
 
+from sqlalchemy import event, make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+
+from platform_db.instrumentation import QueryInstrumentation
+from platform_db.replicas import LocalStickyStore, Replica, ReplicaBalancer, StickyStore
+
+
+logger = logging.getLogger(__name__)
+
+# 不修改数据的 HTTP 方法, 使用只读会话
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# session.info 键
+_AFTER_COMMIT = "after_commit_callbacks"
+_AFTER_COMMIT_TASKS = "after_commit_tasks"
+
+# 提交后回调任务的强引用, 防止执行中被回收
+_after_commit_tasks: set[asyncio.Task[None]] = set()
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], Awaitable[Any]]) -> None:
+    """
+    注册在当前事务提交后执行的异步回调, 事务回滚时丢弃
+
+    用于缓存失效等需在数据可见后执行的操作: 提交前失效时,
+    并发请求仍会读到旧数据并重新回填缓存。write_session() 提交后等待回调完成。
+
+    Example:
+        run_after_commit(session, lambda: cache.delete(f"user:{user_id}"))
+    """
+    session.sync_session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def _run_callback(callback: Callable[[], Awaitable[Any]]) -> None:
+    try:
+        await callback()
+    except Exception:
+        logger.warning("After-commit callback failed", exc_info=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    callbacks = session.info.pop(_AFTER_COMMIT, None)
+    if not callbacks:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("After-commit callbacks dropped: no running event loop")
+        return
+    tasks = session.info.setdefault(_AFTER_COMMIT_TASKS, [])
+    for callback in callbacks:
+        task = loop.create_task(_run_callback(callback))
+        _after_commit_tasks.add(task)
+        task.add_done_callback(_after_commit_tasks.discard)
+        tasks.append(task)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+async def wait_after_commit(session: AsyncSession) -> None:
+    """等待已提交事务调度的回调执行完成"""
+    tasks = session.sync_session.info.pop(_AFTER_COMMIT_TASKS, None)
+    if tasks:
+        await asyncio.gather(*tasks)
 
 
 class DatabaseManager:
-    """数据库管理器"""
+    """
+    数据库管理器
+
+    配置 replica_urls 后, read_session() 在健康副本间做负载均衡, write_session() 始终使用主库。
+    后台任务每 lag_check_interval 秒检测一次复制延迟, 超过 max_replica_lag 的副本被剔除。
+    写入后 read_your_writes_window 秒内, 同一 sticky_key (通常为用户 ID) 的读取仍走主库。
+
+    Args:
+        database_url: 主库 URL
+        replica_urls: 只读副本 URL 列表
+        max_replica_lag: 副本允许的最大复制延迟 (秒)
+        lag_check_interval: 复制延迟检测间隔 (秒)
+        read_your_writes_window: 写后读主库窗口 (秒), 默认为 max_replica_lag + lag_check_interval
+        sticky_store: 写入标记存储, 默认为进程内存储, 多实例部署应使用 RedisStickyStore
+        instrumentation: 语句埋点, 注册到主库与所有副本引擎
+        prepared_statement_cache_size: asyncpg 每个连接缓存的预备语句数, 应覆盖服务的热点语句数;
+            经 PgBouncer 事务模式连接时需设为 0
+    """
 
     def __init__(
         self,
@@ -21,6 +110,14 @@ class DatabaseManager:
         pool_size: int = 10,
         max_overflow: int = 20,
         pool_pre_ping: bool = True,
+        *,
+        replica_urls: Sequence[str] = (),
+        max_replica_lag: float = 5.0,
+        lag_check_interval: float = 5.0,
+        read_your_writes_window: float | None = None,
+        sticky_store: StickyStore | None = None,
+        instrumentation: QueryInstrumentation | None = None,
+        prepared_statement_cache_size: int = 500,
     ) -> None:
         self.database_url = database_url
         self._engine: AsyncEngine | None = None
@@ -30,45 +127,188 @@ class DatabaseManager:
         self._pool_size = pool_size
         self._max_overflow = max_overflow
         self._pool_pre_ping = pool_pre_ping
+        self.instrumentation = instrumentation
+        self._prepared_statement_cache_size = prepared_statement_cache_size
+
+        self.replica_urls = list(replica_urls)
+        self.max_replica_lag = max_replica_lag
+        self.lag_check_interval = lag_check_interval
+        # 副本延迟可能在两次检测之间涨到上限, 窗口需覆盖两者之和
+        self.read_your_writes_window = (
+            read_your_writes_window if read_your_writes_window is not None else max_replica_lag + lag_check_interval
+        )
+        self.sticky_store: StickyStore = sticky_store or LocalStickyStore()
+        self._balancer: ReplicaBalancer | None = None
+        self._monitor: asyncio.Task[None] | None = None
+
+    def _create_engine(self, url: str) -> AsyncEngine:
+        connect_args: dict[str, Any] = {}
+        if make_url(url).get_driver_name() == "asyncpg":
+            # 默认仅缓存 100 条, 热点语句超出后会反复 PREPARE
+            connect_args["prepared_statement_cache_size"] = self._prepared_statement_cache_size
+        engine = create_async_engine(
+            url,
+            echo=self._echo,
+            pool_size=self._pool_size,
+            max_overflow=self._max_overflow,
+            pool_pre_ping=self._pool_pre_ping,
+            connect_args=connect_args,
+        )
+        if self.instrumentation is not None:
+            self.instrumentation.instrument(engine)
+        return engine
+
+    @staticmethod
+    def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
 
     @property
     def engine(self) -> AsyncEngine:
         """获取数据库引擎"""
         if self._engine is None:
-            self._engine = create_async_engine(
-                self.database_url,
-                echo=self._echo,
-                pool_size=self._pool_size,
-                max_overflow=self._max_overflow,
-                pool_pre_ping=self._pool_pre_ping,
-            )
+            self._engine = self._create_engine(self.database_url)
         return self._engine
 
     @property
     def session_factory(self) -> async_sessionmaker[AsyncSession]:
         """获取会话工厂"""
         if self._session_factory is None:
-            self._session_factory = async_sessionmaker(
-                self.engine,
-                class_=AsyncSession,
-                expire_on_commit=False,
-                autoflush=False,
-            )
+            self._session_factory = self._create_session_factory(self.engine)
         return self._session_factory
 
+    @property
+    def balancer(self) -> ReplicaBalancer | None:
+        """副本负载均衡器 (未配置副本时为 None)"""
+        if self._balancer is None and self.replica_urls:
+            replicas = []
+            for url in self.replica_urls:
+                engine = self._create_engine(url)
+                replicas.append(Replica(url, engine, self._create_session_factory(engine)))
+            self._balancer = ReplicaBalancer(replicas, self.max_replica_lag)
+        return self._balancer
+
+    async def start(self) -> None:
+        """检测一次副本延迟并启动后台检测任务 (未配置副本时为空操作)"""
+        balancer = self.balancer
+        if balancer is None or self._monitor is not None:
+            return
+        await balancer.check()
+        self._monitor = asyncio.create_task(self._monitor_lag(balancer))
+
+    async def _monitor_lag(self, balancer: ReplicaBalancer) -> None:
+        while True:
+            await asyncio.sleep(self.lag_check_interval)
+            try:
+                await balancer.check()
+            except Exception:
+                logger.exception("Read replica lag check failed")
+
     @asynccontextmanager
     async def session(self) -> AsyncGenerator[AsyncSession, None]:
-        """获取数据库会话上下文"""
+        """获取数据库会话上下文 (主库, 等同于 write_session)"""
+        async with self.write_session() as session:
+            yield session
+
+    @asynccontextmanager
+    async def write_session(self, sticky_key: str | None = None) -> AsyncGenerator[AsyncSession, None]:
+        """
+        获取主库会话上下文, 退出时提交, 异常时回滚
+
+        Args:
+            sticky_key: 读己之写标识, 提交了数据库操作后该标识的读取在窗口期内走主库
+        """
         async with self.session_factory() as session:
             try:
                 yield session
+                used = session.in_transaction()
                 await session.commit()
             except Exception:
                 await session.rollback()
                 raise
+            await wait_after_commit(session)
+        if used and sticky_key is not None and self.replica_urls:
+            await self.mark_written(sticky_key)
+
+    @asynccontextmanager
+    async def read_session(self, sticky_key: str | None = None) -> AsyncGenerator[AsyncSession, None]:
+        """
+        获取只读会话上下文 - 优先使用健康副本, 退出时回滚
+
+        没有健康副本, 或 sticky_key 在写后窗口期内时使用主库。
+
+        Args:
+            sticky_key: 读己之写标识
+        """
+        replica = None
+        if self.balancer is not None and not await self._is_sticky(sticky_key):
+            replica = self.balancer.choose()
+
+        if replica is None:
+            async with self.session_factory() as session:
+                try:
+                    yield session
+                finally:
+                    await session.rollback()
+            return
+
+        replica.in_flight += 1
+        try:
+            async with replica.session_factory() as session:
+                try:
+                    yield session
+                finally:
+                    await session.rollback()
+        finally:
+            replica.in_flight -= 1
+
+    @asynccontextmanager
+    async def session_for_method(
+        self, method: str, sticky_key: str | None = None
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """按 HTTP 方法选择会话: GET / HEAD / OPTIONS 使用 read_session, 其余使用 write_session"""
+        context = self.read_session(sticky_key) if method.upper() in SAFE_METHODS else self.write_session(sticky_key)
+        async with context as session:
+            yield session
+
+    async def mark_written(self, sticky_key: str) -> None:
+        """标记 sticky_key 刚刚写入, 窗口期内其读取走主库"""
+        try:
+            await self.sticky_store.mark(sticky_key, self.read_your_writes_window)
+        except Exception:
+            logger.warning("Failed to record read-your-writes marker", exc_info=True)
+
+    async def _is_sticky(self, sticky_key: str | None) -> bool:
+        if sticky_key is None:
+            return False
+        try:
+            return await self.sticky_store.is_sticky(sticky_key)
+        except Exception:
+            # 标记存储不可用时无法确认是否刚写入, 保守地读主库
+            logger.warning("Failed to read read-your-writes marker", exc_info=True)
+            return True
+
+    def replica_status(self) -> list[dict[str, Any]]:
+        """各副本的延迟与健康状态"""
+        if self._balancer is None:
+            return []
+        return [replica.to_dict() for replica in self._balancer.replicas]
 
     async def close(self) -> None:
         """关闭数据库连接"""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._monitor
+            self._monitor = None
+        if self._balancer is not None:
+            for replica in self._balancer.replicas:
+                await replica.engine.dispose()
+            self._balancer = None
         if self._engine is not None:
             await self._engine.dispose()
             self._engine = None
@@ -0,0 +1,65 @@
+"""Prebuilt Statement Registry"""
+
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from sqlalchemy import Executable, Select
+
+from platform_db.base import with_filtered_variant
+
+
+def prebuilt[StmtT: Executable](stmt: StmtT) -> StmtT:
+    """
+    声明可复用的预构建语句
+
+    每次请求重新构建 select() 时, SQLAlchemy 需要重新生成语句对象并计算缓存键才能命中编译缓存;
+    复用同一语句对象时缓存键只计算一次。查询值须以 bindparam() 声明, 执行时通过参数传入。
+    SELECT 语句会附带预先过滤软删除记录的变体, 默认执行该变体; include_deleted() 仍然生效。
+
+    Example:
+        _USER_BY_EMAIL = prebuilt(select(User).where(User.email == bindparam("email")))
+
+        user = (await session.execute(_USER_BY_EMAIL, {"email": email})).scalar_one_or_none()
+        user = (
+            await session.execute(_USER_BY_EMAIL, {"email": email}, execution_options={INCLUDE_DELETED: True})
+        ).scalar_one_or_none()
+    """
+    if isinstance(stmt, Select):
+        return with_filtered_variant(stmt)
+    return stmt
+
+
+class StatementRegistry:
+    """
+    按键登记的预构建语句, 首次访问时构建
+
+    用于依赖运行时参数 (如仓储的模型类) 而无法在模块级声明的语句。
+    """
+
+    def __init__(self) -> None:
+        self._statements: dict[Hashable, Any] = {}
+
+    def get[StmtT: Executable](self, key: Hashable, build: Callable[[], StmtT]) -> StmtT:
+        """
+        获取语句, 未登记时调用 build 构建并经 prebuilt() 处理后登记
+
+        Args:
+            key: 语句键, 通常为 (模型类, 名称)
+            build: 构建函数, 查询值须以 bindparam() 声明
+        """
+        try:
+            return self._statements[key]
+        except KeyError:
+            stmt = self._statements[key] = prebuilt(build())
+            return stmt
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def clear(self) -> None:
+        """清空登记的语句"""
+        self._statements.clear()
+
+
+# 默认语句注册表 (BaseRepository 使用)
+default_statement_registry = StatementRegistry()
@@ -37,6 +37,10 @@ class Counter:
         else:
             self._counter.inc(value)
 
+    def remove(self, **labels: str) -> None:
+        """移除指定标签组合的序列"""
+        self._counter.remove(*(labels[name] for name in self._labels))
+
 
 class Histogram:
     """直方图指标"""
@@ -88,6 +92,10 @@ class Histogram:
             return self._histogram.labels(**labels).time()
         return self._histogram.time()
 
+    def remove(self, **labels: str) -> None:
+        """移除指定标签组合的序列"""
+        self._histogram.remove(*(labels[name] for name in self._labels))
+
 
 class Gauge:
     """仪表盘指标"""
@@ -128,6 +136,14 @@ class Gauge:
         else:
             self._gauge.dec(value)
 
+    def remove(self, **labels: str) -> None:
+        """移除指定标签组合的序列"""
+        self._gauge.remove(*(labels[name] for name in self._labels))
+
+    def clear(self) -> None:
+        """移除所有标签组合 (用于标签集合会变化的指标)"""
+        self._gauge.clear()
+
 
 class MetricsRegistry:
     """指标注册表"""
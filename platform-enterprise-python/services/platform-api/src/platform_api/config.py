@@ -24,16 +24,35 @@ class Settings(BaseSettings):
     auth_service_url: str = "http://localhost:8001"
     user_service_url: str = "http://localhost:8002"
 
-    # Redis 配置
+    # Redis 配置 (memory:// 使用进程内后端, 适用于单节点部署与无 Redis 压测)
     redis_url: str = "redis://localhost:6379/0"
+    redis_max_connections: int = 50
+    redis_pool_timeout: float = 5.0
+    redis_warmup_connections: int = 5
+
+    # 本地 L1 缓存配置 (max_entries 为 0 时禁用)
+    cache_local_max_entries: int = 0
+    cache_local_max_bytes: int = 32 * 1024 * 1024
+    cache_local_ttl: int = 30
+
+    # 热点键检测 (采样率为 0 时禁用; promote_rate 为热点提升到本地缓存的速率阈值)
+    hot_keys_sample_rate: float = 0.0
+    hot_keys_top_k: int = 20
+    hot_keys_promote_rate: float | None = None
+    hot_keys_promote_ttl: float = 1.0
 
     # JWT 配置
     jwt_secret_key: str = Field(default="change-me-in-production")
     jwt_algorithm: str = "HS256"
 
-    # 限流配置
+    # 限流配置, 默认关闭
+    rate_limit_enabled: bool = False
     rate_limit_requests: int = 100
     rate_limit_window: int = 60
+    # 近似限流: 本地预聚合、批量同步到 Redis, 适用于极高请求速率
+    rate_limit_approximate: bool = False
+    # 网关前受信任的反向代理层数, 用于从 X-Forwarded-For 取客户端 IP; 0 表示直接使用对端地址
+    rate_limit_trusted_proxies: int = 0
 
     # CORS 配置
     cors_origins: list[str] = Field(default_factory=lambda: ["*"])
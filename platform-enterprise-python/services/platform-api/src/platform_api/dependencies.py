@@ -7,7 +7,8 @@ from fastapi import Depends, Request
 from httpx import AsyncClient
 from redis.asyncio import Redis
 
-from platform_cache import CacheClient, RateLimiter
+from platform_cache import ApproximateRateLimiter, CacheClient, SlidingWindowRateLimiter
+from platform_core.exceptions import UnauthorizedError
 from platform_core.security import JWTHandler, TokenPayload
 
 from platform_api.config import Settings, settings
@@ -24,18 +25,21 @@ async def get_redis(request: Request) -> Redis:
     return request.app.state.redis
 
 
-async def get_cache(
-    redis: Annotated[Redis, Depends(get_redis)],
-) -> CacheClient:
-    """获取缓存客户端"""
-    return CacheClient(redis, prefix="api")
+async def get_cache(request: Request) -> CacheClient:
+    """获取缓存客户端 (应用级共享, 保证 L1 缓存跨请求复用)"""
+    return request.app.state.cache
 
 
 async def get_rate_limiter(
-    cache: Annotated[CacheClient, Depends(get_cache)],
-) -> RateLimiter:
-    """获取限流器"""
-    return RateLimiter(cache)
+    request: Request,
+) -> SlidingWindowRateLimiter | ApproximateRateLimiter:
+    """
+    获取应用级限流器 (使用 ratelimit 连接池)
+
+    rate_limit_approximate 开启时为 ApproximateRateLimiter, 否则为 SlidingWindowRateLimiter;
+    两者的 is_allowed 均返回 (is_allowed, remaining, reset_seconds)。
+    """
+    return request.app.state.rate_limiter
 
 
 async def get_jwt_handler(
@@ -58,8 +62,6 @@ async def get_current_user(
     jwt_handler: Annotated[JWTHandler, Depends(get_jwt_handler)],
 ) -> TokenPayload:
     """获取当前用户"""
-    from platform_core.exceptions import UnauthorizedError
-
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         raise UnauthorizedError("Missing authorization token")
@@ -90,7 +92,7 @@ async def get_optional_user(
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 RedisDep = Annotated[Redis, Depends(get_redis)]
 CacheDep = Annotated[CacheClient, Depends(get_cache)]
-RateLimiterDep = Annotated[RateLimiter, Depends(get_rate_limiter)]
+RateLimiterDep = Annotated[SlidingWindowRateLimiter | ApproximateRateLimiter, Depends(get_rate_limiter)]
 JWTHandlerDep = Annotated[JWTHandler, Depends(get_jwt_handler)]
 HttpClientDep = Annotated[AsyncClient, Depends(get_http_client)]
 CurrentUserDep = Annotated[TokenPayload, Depends(get_current_user)]
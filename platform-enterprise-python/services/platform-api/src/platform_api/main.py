@@ -7,16 +7,24 @@ import httpx
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from redis.asyncio import Redis
 
-from platform_cache import CacheClient
+from platform_cache import (
+    ApproximateRateLimiter,
+    CacheClient,
+    HotKeyDetector,
+    LocalCache,
+    RedisManager,
+    SlidingWindowRateLimiter,
+    default_pools,
+)
 from platform_core.exceptions import PlatformException
 from platform_core.middleware import RequestIdMiddleware, TimingMiddleware
 from platform_core.schemas import ErrorResponse
+from platform_core.security import JWTHandler
 from platform_observability import configure_logging, configure_tracing
 
 from platform_api.config import settings
-from platform_api.middleware import LoggingMiddleware
+from platform_api.middleware import LoggingMiddleware, RateLimitMiddleware
 from platform_api.routers import api_router
 
 
@@ -39,23 +47,64 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             otlp_endpoint=settings.otlp_endpoint,
         )
 
-    # 初始化 Redis
-    app.state.redis = Redis.from_url(
+    # 初始化 Redis (按用途划分的阻塞连接池)
+    app.state.redis_manager = RedisManager(
         settings.redis_url,
-        decode_responses=True,
+        pools=default_pools(
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            warmup=settings.redis_warmup_connections,
+        ),
     )
+    await app.state.redis_manager.warm_up()
+    app.state.redis = app.state.redis_manager.client("cache")
 
     # 初始化 HTTP 客户端
     app.state.http_client = httpx.AsyncClient(timeout=30.0)
 
     # 初始化缓存
-    app.state.cache = CacheClient(app.state.redis, prefix="api")
+    local_cache = None
+    if settings.cache_local_max_entries > 0:
+        local_cache = LocalCache(
+            max_entries=settings.cache_local_max_entries,
+            max_bytes=settings.cache_local_max_bytes,
+            ttl=settings.cache_local_ttl,
+        )
+    hot_keys = None
+    if settings.hot_keys_sample_rate > 0:
+        hot_keys = HotKeyDetector(
+            sample_rate=settings.hot_keys_sample_rate,
+            top_k=settings.hot_keys_top_k,
+            promote_rate=settings.hot_keys_promote_rate,
+            promote_ttl=settings.hot_keys_promote_ttl,
+        )
+    app.state.cache = CacheClient(
+        app.state.redis,
+        prefix="api",
+        local_cache=local_cache,
+        hot_keys=hot_keys,
+    )
+    await app.state.cache.start_invalidation_listener()
+    # 限流使用独立连接池, 避免与缓存流量互相挤占; 共用热点检测器, 限流键同样出现在 /debug/hot-keys
+    app.state.rate_limit_cache = CacheClient(
+        app.state.redis_manager.client("ratelimit"),
+        prefix="api",
+        hot_keys=hot_keys,
+    )
+    if settings.rate_limit_approximate:
+        app.state.rate_limiter = ApproximateRateLimiter(app.state.rate_limit_cache)
+    else:
+        app.state.rate_limiter = SlidingWindowRateLimiter(app.state.rate_limit_cache)
 
     yield
 
     # 清理资源
+    if isinstance(app.state.rate_limiter, ApproximateRateLimiter):
+        # 停止后台同步并写回本地累计的计数
+        await app.state.rate_limiter.close()
+    await app.state.cache.stop_invalidation_listener()
     await app.state.http_client.aclose()
-    await app.state.redis.close()
+    await app.state.redis_manager.close()
 
 
 def create_app() -> FastAPI:
@@ -69,7 +118,19 @@ def create_app() -> FastAPI:
         redoc_url="/redoc" if settings.debug else None,
     )
 
-    # 添加中间件 (顺序重要)
+    # 添加中间件; 顺序重要, 后添加的位于外层
+    if settings.rate_limit_enabled:
+        # 位于 CORS / 请求 ID / 日志中间件内层, 429 响应同样经过这些中间件
+        app.add_middleware(
+            RateLimitMiddleware,
+            max_requests=settings.rate_limit_requests,
+            window_seconds=settings.rate_limit_window,
+            trusted_proxies=settings.rate_limit_trusted_proxies,
+            jwt_handler=JWTHandler(
+                secret_key=settings.jwt_secret_key,
+                algorithm=settings.jwt_algorithm,
+            ),
+        )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
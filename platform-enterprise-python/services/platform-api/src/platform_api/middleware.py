@@ -1,29 +1,73 @@
 """API Gateway Middleware"""
 
+import time
+
 from fastapi import Request, Response
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from platform_cache import CacheClient, RateLimiter
-from platform_core.exceptions import RateLimitError
+from platform_core.exceptions import RateLimitError, UnauthorizedError
+from platform_core.security import JWTHandler
 from platform_observability import get_logger
 
+
 logger = get_logger(__name__)
 
 
+def get_client_ip(request: Request, trusted_proxies: int = 0) -> str:
+    """
+    获取客户端 IP
+
+    trusted_proxies 为网关前受信任的反向代理层数 (负载均衡、Ingress 等)。
+    每层代理都会把对端地址追加到 X-Forwarded-For 末尾, 因此从右数第 trusted_proxies 个
+    地址即最外层受信任代理看到的客户端; 更靠左的部分可由客户端伪造, 不予采信。
+    为 0 时直接使用 TCP 对端地址。
+    """
+    if trusted_proxies > 0:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+            if hops:
+                return hops[-min(trusted_proxies, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """限流中间件"""
+    """
+    限流中间件
+
+    限流器在应用生命周期内创建并存放于 app.state.rate_limiter
+    (由 rate_limit_approximate 配置选择 SlidingWindowRateLimiter 或 ApproximateRateLimiter)。
+    携带有效访问令牌的请求按用户限流, 其余请求按客户端 IP 限流。
+    应注册在 CORSMiddleware 之前 (位于其内层), 使 429 响应同样带有 CORS 头、请求 ID 与访问日志。
+    """
 
     def __init__(
         self,
         app,
-        cache: CacheClient,
         max_requests: int = 100,
         window_seconds: int = 60,
+        trusted_proxies: int = 0,
+        jwt_handler: JWTHandler | None = None,
     ):
         super().__init__(app)
-        self.limiter = RateLimiter(cache)
         self.max_requests = max_requests
         self.window_seconds = window_seconds
+        self.trusted_proxies = trusted_proxies
+        self.jwt_handler = jwt_handler
+
+    def _user_id(self, request: Request) -> str | None:
+        """从有效的访问令牌中取用户 ID"""
+        if self.jwt_handler is None:
+            return None
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith("Bearer "):
+            return None
+        try:
+            payload = self.jwt_handler.verify_token(auth_header.split(" ")[1])
+        except (UnauthorizedError, ValueError):
+            return None
+        return payload.sub
 
     async def dispatch(self, request: Request, call_next) -> Response:
         # 跳过健康检查端点
@@ -31,21 +75,26 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
 
         # 获取客户端标识
-        client_ip = request.client.host if request.client else "unknown"
-        key = f"ip:{client_ip}"
+        client_ip = get_client_ip(request, self.trusted_proxies)
+        user_id = self._user_id(request)
+        key = f"user:{user_id}" if user_id else f"ip:{client_ip}"
 
         # 检查限流
-        allowed, remaining, reset = await self.limiter.is_allowed(
+        allowed, remaining, reset = await request.app.state.rate_limiter.is_allowed(
             key, self.max_requests, self.window_seconds
         )
 
         if not allowed:
             logger.warning(
                 "Rate limit exceeded",
-                extra={"client_ip": client_ip, "reset_seconds": reset},
+                extra={"client_ip": client_ip, "user_id": user_id, "reset_seconds": reset},
             )
-            raise RateLimitError(
-                f"Rate limit exceeded. Retry after {reset} seconds"
+            # 中间件位于异常处理器之外, 直接返回 429 响应
+            exc = RateLimitError(f"Rate limit exceeded. Retry after {reset} seconds")
+            return JSONResponse(
+                status_code=exc.status_code,
+                content=exc.to_dict(),
+                headers={"Retry-After": str(reset)},
             )
 
         # 添加限流响应头
@@ -61,8 +110,6 @@ class LoggingMiddleware(BaseHTTPMiddleware):
     """日志中间件"""
 
     async def dispatch(self, request: Request, call_next) -> Response:
-        import time
-
         start_time = time.time()
 
         response = await call_next(request)
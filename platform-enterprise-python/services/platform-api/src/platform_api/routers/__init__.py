@@ -2,12 +2,15 @@
 
 from fastapi import APIRouter
 
-from platform_api.routers import health, proxy
+from platform_api.routers import debug, health, proxy
 
 api_router = APIRouter()
 
 # 健康检查
 api_router.include_router(health.router, tags=["Health"])
 
+# 指标与调试
+api_router.include_router(debug.router, tags=["Debug"])
+
 # 代理路由
 api_router.include_router(proxy.router, prefix="/v1", tags=["Proxy"])
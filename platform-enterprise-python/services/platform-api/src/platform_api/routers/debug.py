@@ -0,0 +1,116 @@
+"""Debug Endpoints"""
+
+import hashlib
+import secrets
+
+from fastapi import APIRouter, Request
+from fastapi.responses import Response
+
+from platform_cache import ApproximateRateLimiter
+from platform_core.exceptions import ForbiddenError
+from platform_observability.metrics import MetricsRegistry, default_registry
+
+from platform_api.dependencies import CacheDep, CurrentUserDep, RateLimiterDep
+
+router = APIRouter()
+
+# /metrics 只导出前 N 个热点键
+HOT_KEY_METRIC_LIMIT = 10
+# 键前缀最多保留的段数
+_HOT_KEY_PREFIX_SEGMENTS = 3
+# 进程内随机哈希密钥, 防止通过枚举 IP / ID 反推键
+_HOT_KEY_HASH_KEY = secrets.token_bytes(16)
+
+hot_key_rate = default_registry.gauge(
+    "cache_hot_key_rate",
+    "Estimated access rate of the current top cache keys (per second)",
+    ["rank", "prefix", "key_hash"],
+)
+
+approx_limiter_error_rate = default_registry.gauge(
+    "rate_limiter_approx_error_rate",
+    "Measured over-admission ratio of the approximate rate limiter",
+)
+approx_limiter_local_ratio = default_registry.gauge(
+    "rate_limiter_approx_local_ratio",
+    "Share of rate limit decisions made without a Redis round trip",
+)
+
+
+def hot_key_hash(key: str) -> str:
+    """键的带密钥短哈希 (用于在指标与同一实例的 /debug/hot-keys 之间对照)"""
+    return hashlib.blake2b(key.encode(), digest_size=6, key=_HOT_KEY_HASH_KEY).hexdigest()
+
+
+def hot_key_prefix(key: str) -> str:
+    """
+    键的命名空间前缀: 取至多 3 段, 遇到含数字或 @ 的段 (ID / IP / 邮箱) 即截止
+
+    如 api:ratelimit:sw:ip:10.0.0.1 -> api:ratelimit:sw, api:user:42 -> api:user
+    """
+    prefix: list[str] = []
+    for segment in key.split(":")[:_HOT_KEY_PREFIX_SEGMENTS]:
+        if "@" in segment or any(char.isdigit() for char in segment):
+            break
+        prefix.append(segment)
+    return ":".join(prefix)
+
+
+def refresh_hot_key_gauges(cache) -> None:
+    """
+    用当前前 N 个热点键刷新指标 (旧键的标签会被移除)
+
+    原始键可能包含 IP / 用户 ID 且基数不受控, 指标只带前缀与短哈希;
+    原始键仅通过需要 admin 角色的 /debug/hot-keys 查看。
+    """
+    if cache.hot_keys is None:
+        return
+    hot_key_rate.clear()
+    for rank, item in enumerate(cache.hot_keys.hot_keys()[:HOT_KEY_METRIC_LIMIT], start=1):
+        hot_key_rate.set(
+            item.rate,
+            rank=str(rank),
+            prefix=hot_key_prefix(item.key),
+            key_hash=hot_key_hash(item.key),
+        )
+
+
+def refresh_rate_limiter_gauges(limiter) -> None:
+    """用近似限流器的累计统计刷新指标 (滑动窗口限流器无此统计)"""
+    if isinstance(limiter, ApproximateRateLimiter):
+        approx_limiter_error_rate.set(limiter.stats.error_rate)
+        approx_limiter_local_ratio.set(limiter.stats.local_ratio)
+
+
+@router.get("/metrics")
+async def metrics(cache: CacheDep, limiter: RateLimiterDep) -> Response:
+    """Prometheus 指标端点"""
+    refresh_hot_key_gauges(cache)
+    refresh_rate_limiter_gauges(limiter)
+    return Response(
+        content=MetricsRegistry.export(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@router.get("/debug/hot-keys")
+async def hot_keys(cache: CacheDep, user: CurrentUserDep) -> dict:
+    """当前窗口的热点键 (需要 admin 角色)"""
+    if "admin" not in (user.roles or []):
+        raise ForbiddenError("Admin role required")
+    if cache.hot_keys is None:
+        return {"enabled": False, "keys": []}
+    return {
+        "enabled": True,
+        "sample_rate": cache.hot_keys.sample_rate,
+        "window_seconds": cache.hot_keys.window,
+        "keys": [{**item.to_dict(), "key_hash": hot_key_hash(item.key)} for item in cache.hot_keys.hot_keys()],
+    }
+
+
+@router.get("/debug/redis-pools")
+async def redis_pools(request: Request, user: CurrentUserDep) -> dict:
+    """各 Redis 连接池的占用与等待统计 (需要 admin 角色)"""
+    if "admin" not in (user.roles or []):
+        raise ForbiddenError("Admin role required")
+    return {name: stats.to_dict() for name, stats in request.app.state.redis_manager.stats().items()}
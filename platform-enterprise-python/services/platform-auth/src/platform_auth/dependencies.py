@@ -48,10 +48,10 @@ def get_password_hasher() -> PasswordHasher:
 
 
 async def get_event_publisher(request: Request) -> EventPublisher | None:
-    """获取事件发布器"""
-    redis = request.app.state.redis
-    if redis:
-        return EventPublisher(redis)
+    """获取事件发布器 (使用 streams 连接池)"""
+    manager = request.app.state.redis_manager
+    if manager:
+        return EventPublisher(manager.client("streams"))
     return None
 
 
@@ -60,6 +60,7 @@ async def get_auth_service(
     jwt_handler: Annotated[JWTHandler, Depends(get_jwt_handler)],
     password_hasher: Annotated[PasswordHasher, Depends(get_password_hasher)],
     event_publisher: Annotated[EventPublisher | None, Depends(get_event_publisher)],
+    request: Request,
 ) -> AuthService:
     """获取认证服务"""
     return AuthService(
@@ -67,6 +68,8 @@ async def get_auth_service(
         jwt_handler=jwt_handler,
         password_hasher=password_hasher,
         event_publisher=event_publisher,
+        email_filter=request.app.state.email_filter,
+        username_filter=request.app.state.username_filter,
     )
 
 
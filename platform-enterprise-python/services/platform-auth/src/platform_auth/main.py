@@ -1,20 +1,39 @@
 """Platform Auth Service - Main Application"""
 
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from redis.asyncio import Redis
 
+from platform_cache import BloomFilter, CacheClient, RedisManager, default_pools
 from platform_core.exceptions import PlatformException
 from platform_core.middleware import RequestIdMiddleware, TimingMiddleware
 from platform_core.schemas import ErrorResponse
-from platform_db import DatabaseManager
-from platform_observability import configure_logging, configure_tracing
+from platform_db import DatabaseManager, QueryInstrumentation, QueryStatsMiddleware
+from platform_observability import configure_logging, configure_tracing, get_logger
 
 from platform_auth.config import settings
 from platform_auth.routers import router
+from platform_auth.service import ensure_user_filters
+
+logger = get_logger(__name__)
+
+
+async def _watch_user_filters(
+    db_manager: DatabaseManager,
+    email_filter: BloomFilter,
+    username_filter: BloomFilter,
+) -> None:
+    """周期检查过滤器位图, 被淘汰时重建 (期间 might_contain 按可能存在处理)"""
+    while True:
+        await asyncio.sleep(settings.bloom_filter_check_interval)
+        try:
+            await ensure_user_filters(db_manager, email_filter, username_filter)
+        except Exception as e:
+            logger.warning("User bloom filter check failed", extra={"error": str(e)})
 
 
 @asynccontextmanager
@@ -41,18 +60,56 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         url=settings.database_url,
         pool_size=settings.database_pool_size,
         max_overflow=settings.database_max_overflow,
+        instrumentation=app.state.query_instrumentation,
+        prepared_statement_cache_size=settings.database_prepared_statement_cache_size,
     )
 
-    # 初始化 Redis
-    app.state.redis = Redis.from_url(
+    # 初始化 Redis (按用途划分的阻塞连接池)
+    app.state.redis_manager = RedisManager(
         settings.redis_url,
-        decode_responses=True,
+        pools=default_pools(
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            warmup=settings.redis_warmup_connections,
+        ),
     )
+    await app.state.redis_manager.warm_up()
+    app.state.redis = app.state.redis_manager.client("cache")
+    app.state.cache = CacheClient(app.state.redis, prefix="auth")
+
+    # 初始化注册查重过滤器, 位图不存在时从用户表重建
+    app.state.email_filter = None
+    app.state.username_filter = None
+    filter_watch = None
+    if settings.bloom_filter_enabled:
+        email_filter, username_filter = (
+            BloomFilter(
+                name,
+                capacity=settings.bloom_filter_capacity,
+                error_rate=settings.bloom_filter_error_rate,
+                cache=app.state.cache,
+            )
+            for name in ("users:email", "users:username")
+        )
+        try:
+            await ensure_user_filters(app.state.db_manager, email_filter, username_filter)
+            app.state.email_filter = email_filter
+            app.state.username_filter = username_filter
+        except Exception as e:
+            logger.warning("User bloom filters unavailable", extra={"error": str(e)})
+        else:
+            filter_watch = asyncio.create_task(
+                _watch_user_filters(app.state.db_manager, email_filter, username_filter)
+            )
 
     yield
 
     # 清理资源
-    await app.state.redis.close()
+    if filter_watch is not None:
+        filter_watch.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await filter_watch
+    await app.state.redis_manager.close()
     await app.state.db_manager.close()
 
 
@@ -67,7 +124,18 @@ def create_app() -> FastAPI:
         redoc_url="/redoc" if settings.debug else None,
     )
 
+    # 语句埋点 (每请求语句数 / 数据库耗时、N+1 检测、慢查询日志)
+    app.state.query_instrumentation = QueryInstrumentation(
+        slow_query_ms=settings.database_slow_query_ms,
+        n_plus_one_threshold=settings.database_n_plus_one_threshold,
+    )
+
     # 添加中间件
+    app.add_middleware(
+        QueryStatsMiddleware,
+        instrumentation=app.state.query_instrumentation,
+        expose_headers=settings.debug,
+    )
     app.add_middleware(RequestIdMiddleware)
     app.add_middleware(TimingMiddleware)
 
@@ -6,7 +6,7 @@ from enum import Enum
 from sqlalchemy import Boolean, DateTime, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from platform_db import Base, SoftDeleteMixin, TimestampMixin
+from platform_db import Base, SoftDeleteMixin, TimestampMixin, active_index
 
 
 class UserStatus(str, Enum):
@@ -22,10 +22,15 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
     """用户模型"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # 唯一性仅约束未删除用户, 已删除用户的邮箱与用户名可重新注册
+        active_index("ix_users_email_active", "email", unique=True),
+        active_index("ix_users_username_active", "username", unique=True),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    email: Mapped[str] = mapped_column(String(255), unique=True, index=True)
-    username: Mapped[str] = mapped_column(String(100), unique=True, index=True)
+    email: Mapped[str] = mapped_column(String(255))
+    username: Mapped[str] = mapped_column(String(100))
     hashed_password: Mapped[str] = mapped_column(String(255))
 
     # 状态
@@ -3,11 +3,14 @@
 import hashlib
 import json
 import secrets
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from platform_cache import BloomFilter
 from platform_core.exceptions import (
     ConflictError,
     NotFoundError,
@@ -16,7 +19,9 @@ from platform_core.exceptions import (
 )
 from platform_core.security import JWTHandler, PasswordHasher, TokenPayload
 from platform_core.utils import generate_uuid
+from platform_db import DatabaseManager, prebuilt
 from platform_messaging import EventPublisher, PasswordChangedEvent, UserCreatedEvent
+from platform_observability import get_logger
 
 from platform_auth.config import settings
 from platform_auth.models import RefreshToken, User, UserStatus
@@ -28,6 +33,17 @@ from platform_auth.schemas import (
     UserResponse,
 )
 
+logger = get_logger(__name__)
+
+# 热点查询预构建一次, 执行时只传参数
+_USER_BY_ID = prebuilt(select(User).where(User.id == bindparam("id")))
+_USER_BY_EMAIL = prebuilt(select(User).where(User.email == bindparam("email")))
+_USER_ID_BY_EMAIL = prebuilt(select(User.id).where(User.email == bindparam("email")))
+_USER_ID_BY_USERNAME = prebuilt(select(User.id).where(User.username == bindparam("username")))
+_REFRESH_TOKEN_BY_HASH = prebuilt(
+    select(RefreshToken).where(RefreshToken.token_hash == bindparam("token_hash"))
+)
+
 
 class AuthService:
     """认证服务"""
@@ -38,27 +54,30 @@ class AuthService:
         jwt_handler: JWTHandler,
         password_hasher: PasswordHasher,
         event_publisher: EventPublisher | None = None,
+        *,
+        email_filter: BloomFilter | None = None,
+        username_filter: BloomFilter | None = None,
     ) -> None:
         self.session = session
         self.jwt = jwt_handler
         self.hasher = password_hasher
         self.events = event_publisher
+        self.email_filter = email_filter
+        self.username_filter = username_filter
 
     async def register(self, data: RegisterRequest) -> AuthResponse:
         """用户注册"""
-        # 检查邮箱是否已存在
-        existing = await self.session.execute(
-            select(User).where(User.email == data.email)
-        )
-        if existing.scalar_one_or_none():
-            raise ConflictError("Email already registered")
+        # 检查邮箱是否已存在, 布隆过滤器判定一定不存在时跳过查询
+        if await self._might_exist(self.email_filter, data.email):
+            existing = await self.session.execute(_USER_ID_BY_EMAIL, {"email": data.email})
+            if existing.scalar_one_or_none():
+                raise ConflictError("Email already registered")
 
         # 检查用户名是否已存在
-        existing = await self.session.execute(
-            select(User).where(User.username == data.username)
-        )
-        if existing.scalar_one_or_none():
-            raise ConflictError("Username already taken")
+        if await self._might_exist(self.username_filter, data.username):
+            existing = await self.session.execute(_USER_ID_BY_USERNAME, {"username": data.username})
+            if existing.scalar_one_or_none():
+                raise ConflictError("Username already taken")
 
         # 创建用户
         user = User(
@@ -72,7 +91,14 @@ class AuthService:
         )
 
         self.session.add(user)
-        await self.session.flush()
+        try:
+            await self.session.flush()
+        except IntegrityError:
+            # 过滤器未覆盖的并发注册由唯一约束兜底
+            raise ConflictError("Email or username already registered") from None
+
+        await self._remember(self.email_filter, user.email)
+        await self._remember(self.username_filter, user.username)
 
         # 生成令牌
         tokens = await self._create_tokens(user)
@@ -96,9 +122,7 @@ class AuthService:
     async def login(self, data: LoginRequest, ip_address: str | None = None) -> AuthResponse:
         """用户登录"""
         # 查找用户
-        result = await self.session.execute(
-            select(User).where(User.email == data.email)
-        )
+        result = await self.session.execute(_USER_BY_EMAIL, {"email": data.email})
         user = result.scalar_one_or_none()
 
         if not user:
@@ -139,18 +163,14 @@ class AuthService:
         """刷新令牌"""
         # 验证刷新令牌
         token_hash = self._hash_token(refresh_token)
-        result = await self.session.execute(
-            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
-        )
+        result = await self.session.execute(_REFRESH_TOKEN_BY_HASH, {"token_hash": token_hash})
         stored_token = result.scalar_one_or_none()
 
         if not stored_token or not stored_token.is_valid:
             raise UnauthorizedError("Invalid refresh token")
 
         # 获取用户
-        result = await self.session.execute(
-            select(User).where(User.id == stored_token.user_id)
-        )
+        result = await self.session.execute(_USER_BY_ID, {"id": stored_token.user_id})
         user = result.scalar_one_or_none()
 
         if not user or not user.is_active:
@@ -165,9 +185,7 @@ class AuthService:
     async def logout(self, refresh_token: str) -> bool:
         """登出 - 撤销刷新令牌"""
         token_hash = self._hash_token(refresh_token)
-        result = await self.session.execute(
-            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
-        )
+        result = await self.session.execute(_REFRESH_TOKEN_BY_HASH, {"token_hash": token_hash})
         stored_token = result.scalar_one_or_none()
 
         if stored_token:
@@ -183,9 +201,7 @@ class AuthService:
         ip_address: str | None = None,
     ) -> bool:
         """修改密码"""
-        result = await self.session.execute(
-            select(User).where(User.id == user_id)
-        )
+        result = await self.session.execute(_USER_BY_ID, {"id": user_id})
         user = result.scalar_one_or_none()
 
         if not user:
@@ -208,6 +224,27 @@ class AuthService:
 
         return True
 
+    @staticmethod
+    async def _might_exist(bloom: BloomFilter | None, value: str) -> bool:
+        """未配置过滤器或过滤器不可用时按可能存在处理"""
+        if bloom is None:
+            return True
+        try:
+            return await bloom.might_contain(value)
+        except Exception as e:
+            logger.warning("Bloom filter lookup failed", extra={"filter": bloom.name, "error": str(e)})
+            return True
+
+    @staticmethod
+    async def _remember(bloom: BloomFilter | None, value: str) -> None:
+        """加入过滤器, 失败时只记录日志 (用户已创建, 过滤器由后台检查重建)"""
+        if bloom is None:
+            return
+        try:
+            await bloom.add(value)
+        except Exception as e:
+            logger.warning("Bloom filter add failed", extra={"filter": bloom.name, "error": str(e)})
+
     async def _create_tokens(self, user: User) -> TokenResponse:
         """创建访问令牌和刷新令牌"""
         # 访问令牌
@@ -258,3 +295,42 @@ class AuthService:
             created_at=user.created_at,
             last_login_at=user.last_login_at,
         )
+
+
+async def rebuild_user_filters(
+    session: AsyncSession,
+    email_filter: BloomFilter,
+    username_filter: BloomFilter,
+    batch_size: int = 10000,
+) -> int:
+    """从用户表重建邮箱 / 用户名过滤器, 返回用户数"""
+
+    async def column_values(column) -> AsyncIterator[str]:
+        result = await session.stream_scalars(
+            select(column).execution_options(yield_per=batch_size)
+        )
+        async for value in result:
+            yield value
+
+    await email_filter.rebuild(column_values(User.email))
+    return await username_filter.rebuild(column_values(User.username))
+
+
+async def ensure_user_filters(
+    db_manager: DatabaseManager,
+    email_filter: BloomFilter,
+    username_filter: BloomFilter,
+) -> bool:
+    """
+    过滤器位图不存在 (未建立或被淘汰) 时从用户表重建
+
+    Returns:
+        是否执行了重建
+    """
+    if await email_filter.is_initialized() and await username_filter.is_initialized():
+        return False
+    # 使用主库, 避免副本延迟漏掉刚注册的用户
+    async with db_manager.session() as session:
+        count = await rebuild_user_filters(session, email_filter, username_filter)
+    logger.info("User bloom filters rebuilt", extra={"users": count})
+    return True
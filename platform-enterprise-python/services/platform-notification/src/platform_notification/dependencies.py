@@ -7,6 +7,7 @@ from fastapi import Depends, Request
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from platform_cache import CacheClient
 from platform_core.exceptions import UnauthorizedError
 from platform_core.security import TokenPayload
 
@@ -21,8 +22,11 @@ def get_settings() -> Settings:
 
 
 async def get_db_session(request: Request) -> AsyncSession:
-    """获取数据库会话"""
-    async with request.app.state.db_manager.session() as session:
+    """获取数据库会话 (GET / HEAD / OPTIONS 读只读副本, 其余写主库; 写入后同一用户短时间内读主库)"""
+    async with request.app.state.db_manager.session_for_method(
+        request.method,
+        sticky_key=request.headers.get("X-User-Id"),
+    ) as session:
         yield session
 
 
@@ -31,6 +35,11 @@ async def get_redis(request: Request) -> Redis:
     return request.app.state.redis
 
 
+async def get_cache(request: Request) -> CacheClient:
+    """获取缓存客户端"""
+    return request.app.state.cache
+
+
 def get_email_service() -> EmailService:
     """获取邮件服务"""
     return EmailService()
@@ -39,9 +48,14 @@ def get_email_service() -> EmailService:
 async def get_notification_service(
     session: Annotated[AsyncSession, Depends(get_db_session)],
     email_service: Annotated[EmailService, Depends(get_email_service)],
+    cache: Annotated[CacheClient, Depends(get_cache)],
 ) -> NotificationService:
     """获取通知服务"""
-    return NotificationService(session=session, email_service=email_service)
+    return NotificationService(
+        session=session,
+        email_service=email_service,
+        cache=cache,
+    )
 
 
 async def get_current_user(request: Request) -> TokenPayload:
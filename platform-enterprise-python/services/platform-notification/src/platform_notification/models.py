@@ -3,10 +3,10 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from platform_db import Base, TimestampMixin
+from platform_db import Base, EntityCacheOptions, TimestampMixin
 
 
 class NotificationChannel(str, Enum):
@@ -32,6 +32,10 @@ class Notification(Base, TimestampMixin):
     """通知记录模型"""
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        # 用户通知列表的游标分页: WHERE user_id = ? AND (created_at, id) < (?, ?)
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     user_id: Mapped[str] = mapped_column(String(36), index=True)
@@ -64,6 +68,8 @@ class NotificationTemplate(Base, TimestampMixin):
     """通知模板模型"""
 
     __tablename__ = "notification_templates"
+    # 模板极少变更, 按主键走二级缓存
+    __entity_cache__ = EntityCacheOptions(ttl=600)
 
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
     name: Mapped[str] = mapped_column(String(100))
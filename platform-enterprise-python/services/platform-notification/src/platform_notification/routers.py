@@ -4,7 +4,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
 
-from platform_core.schemas import ApiResponse
+from platform_core.schemas import ApiResponse, CursorPaginatedData
 
 from platform_notification.dependencies import CurrentUserDep, NotificationServiceDep
 from platform_notification.schemas import (
@@ -42,6 +42,25 @@ async def list_my_notifications(
     return ApiResponse(data=notifications)
 
 
+@router.get(
+    "/me/cursor",
+    response_model=ApiResponse[CursorPaginatedData[NotificationResponse]],
+)
+async def page_my_notifications(
+    service: NotificationServiceDep,
+    current_user: CurrentUserDep,
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="上一页返回的 next_cursor"),
+) -> ApiResponse[CursorPaginatedData[NotificationResponse]]:
+    """获取我的通知列表 (游标分页)"""
+    notifications = await service.page_user_notifications(
+        user_id=current_user.sub,
+        limit=limit,
+        cursor=cursor,
+    )
+    return ApiResponse(data=notifications)
+
+
 @router.get("/{notification_id}", response_model=ApiResponse[NotificationResponse])
 async def get_notification(
     notification_id: str,
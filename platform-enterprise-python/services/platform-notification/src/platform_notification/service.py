@@ -6,10 +6,14 @@ import aiosmtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from jinja2 import Environment, FileSystemLoader, select_autoescape
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from platform_cache import CacheClient, cached
+from platform_core.exceptions import NotFoundError, ValidationError
+from platform_core.schemas import CursorPaginatedData
 from platform_core.utils import generate_uuid
+from platform_db import BaseRepository, InvalidCursorError, keyset_paginate, prebuilt, run_after_commit
 from platform_observability import get_logger
 
 from platform_notification.config import settings
@@ -28,6 +32,16 @@ from platform_notification.schemas import (
 logger = get_logger(__name__)
 
 
+# 热点查询预构建一次, 执行时只传参数
+_NOTIFICATION_BY_ID = prebuilt(select(Notification).where(Notification.id == bindparam("id")))
+
+
+class NotificationTemplateRepository(BaseRepository[NotificationTemplate]):
+    """通知模板仓储"""
+
+    model = NotificationTemplate
+
+
 class EmailService:
     """邮件服务"""
 
@@ -91,9 +105,12 @@ class NotificationService:
         self,
         session: AsyncSession,
         email_service: EmailService | None = None,
+        cache: CacheClient | None = None,
     ) -> None:
         self.session = session
         self.email_service = email_service or EmailService()
+        self.cache = cache
+        self.templates = NotificationTemplateRepository(session)
 
         # 模板引擎
         self.template_env = Environment(
@@ -117,6 +134,8 @@ class NotificationService:
         )
         self.session.add(notification)
         await self.session.flush()
+        # 提交后清除可能存在的负缓存; 客户端可能在记录写入前就查询过该 ID
+        run_after_commit(self.session, lambda: self.get_notification.invalidate(notification_id=notification.id))
 
         try:
             # 渲染模板
@@ -156,16 +175,18 @@ class NotificationService:
                 message=str(e),
             )
 
+    @cached(
+        "notification:{notification_id}",
+        ttl=300,
+        negative_on=(NotFoundError,),
+        negative_ttl=30,
+    )
     async def get_notification(self, notification_id: str) -> NotificationResponse:
         """获取通知详情"""
-        result = await self.session.execute(
-            select(Notification).where(Notification.id == notification_id)
-        )
+        result = await self.session.execute(_NOTIFICATION_BY_ID, {"id": notification_id})
         notification = result.scalar_one_or_none()
 
         if not notification:
-            from platform_core.exceptions import NotFoundError
-
             raise NotFoundError("Notification not found")
 
         return NotificationResponse.model_validate(notification)
@@ -187,17 +208,39 @@ class NotificationService:
         notifications = result.scalars().all()
         return [NotificationResponse.model_validate(n) for n in notifications]
 
+    async def page_user_notifications(
+        self,
+        user_id: str,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> CursorPaginatedData[NotificationResponse]:
+        """获取用户通知列表 (按创建时间倒序的游标分页, 深分页不随页数变慢)"""
+        try:
+            page = await keyset_paginate(
+                self.session,
+                select(Notification).where(Notification.user_id == user_id),
+                [Notification.created_at, Notification.id],
+                after=cursor,
+                limit=limit,
+                descending=True,
+            )
+        except InvalidCursorError as e:
+            raise ValidationError(str(e), details={"cursor": cursor}) from e
+
+        return CursorPaginatedData.create(
+            items=[NotificationResponse.model_validate(n) for n in page.items],
+            next_cursor=page.next_cursor,
+            limit=limit,
+        )
+
     async def _render_template(
         self,
         template_id: str,
         data: dict,
     ) -> str:
         """渲染模板"""
-        # 从数据库获取模板
-        result = await self.session.execute(
-            select(NotificationTemplate).where(NotificationTemplate.id == template_id)
-        )
-        template = result.scalar_one_or_none()
+        # 从数据库获取模板, 经二级缓存
+        template = await self.templates.get_by_id(template_id)
 
         if template:
             jinja_template = self.template_env.from_string(template.content_template)
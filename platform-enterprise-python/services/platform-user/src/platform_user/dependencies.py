@@ -7,6 +7,7 @@ from fastapi import Depends, Request
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from platform_cache import CacheClient
 from platform_core.exceptions import UnauthorizedError
 from platform_core.security import TokenPayload
 from platform_messaging import EventPublisher
@@ -22,8 +23,19 @@ def get_settings() -> Settings:
 
 
 async def get_db_session(request: Request) -> AsyncSession:
-    """获取数据库会话"""
-    async with request.app.state.db_manager.session() as session:
+    """获取数据库会话 (GET / HEAD / OPTIONS 读只读副本, 其余写主库; 写入后同一用户短时间内读主库)"""
+    async with request.app.state.db_manager.session_for_method(
+        request.method,
+        sticky_key=request.headers.get("X-User-Id"),
+    ) as session:
+        yield session
+
+
+async def get_write_db_session(request: Request) -> AsyncSession:
+    """获取主库会话 (用于只读请求中可能产生写入的操作)"""
+    async with request.app.state.db_manager.write_session(
+        sticky_key=request.headers.get("X-User-Id"),
+    ) as session:
         yield session
 
 
@@ -32,20 +44,43 @@ async def get_redis(request: Request) -> Redis:
     return request.app.state.redis
 
 
+async def get_cache(request: Request) -> CacheClient:
+    """获取缓存客户端"""
+    return request.app.state.cache
+
+
 async def get_event_publisher(request: Request) -> EventPublisher | None:
-    """获取事件发布器"""
-    redis = request.app.state.redis
-    if redis:
-        return EventPublisher(redis)
+    """获取事件发布器 (使用 streams 连接池)"""
+    manager = request.app.state.redis_manager
+    if manager:
+        return EventPublisher(manager.client("streams"))
     return None
 
 
 async def get_user_profile_service(
     session: Annotated[AsyncSession, Depends(get_db_session)],
     event_publisher: Annotated[EventPublisher | None, Depends(get_event_publisher)],
+    cache: Annotated[CacheClient, Depends(get_cache)],
 ) -> UserProfileService:
     """获取用户档案服务"""
-    return UserProfileService(session=session, event_publisher=event_publisher)
+    return UserProfileService(
+        session=session,
+        event_publisher=event_publisher,
+        cache=cache,
+    )
+
+
+async def get_user_profile_writer(
+    session: Annotated[AsyncSession, Depends(get_write_db_session)],
+    event_publisher: Annotated[EventPublisher | None, Depends(get_event_publisher)],
+    cache: Annotated[CacheClient, Depends(get_cache)],
+) -> UserProfileService:
+    """获取使用主库会话的用户档案服务"""
+    return UserProfileService(
+        session=session,
+        event_publisher=event_publisher,
+        cache=cache,
+    )
 
 
 async def get_user_address_service(
@@ -74,5 +109,6 @@ SettingsDep = Annotated[Settings, Depends(get_settings)]
 DbSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
 RedisDep = Annotated[Redis, Depends(get_redis)]
 UserProfileServiceDep = Annotated[UserProfileService, Depends(get_user_profile_service)]
+UserProfileWriterDep = Annotated[UserProfileService, Depends(get_user_profile_writer)]
 UserAddressServiceDep = Annotated[UserAddressService, Depends(get_user_address_service)]
 CurrentUserDep = Annotated[TokenPayload, Depends(get_current_user)]
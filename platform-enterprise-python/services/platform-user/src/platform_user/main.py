@@ -5,12 +5,12 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from redis.asyncio import Redis
 
+from platform_cache import CacheClient, RedisManager, default_pools
 from platform_core.exceptions import PlatformException
 from platform_core.middleware import RequestIdMiddleware, TimingMiddleware
 from platform_core.schemas import ErrorResponse
-from platform_db import DatabaseManager
+from platform_db import DatabaseManager, QueryInstrumentation, QueryStatsMiddleware, RedisStickyStore
 from platform_observability import configure_logging, configure_tracing
 
 from platform_user.config import settings
@@ -41,18 +41,34 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         url=settings.database_url,
         pool_size=settings.database_pool_size,
         max_overflow=settings.database_max_overflow,
+        replica_urls=settings.database_replica_urls,
+        max_replica_lag=settings.database_max_replica_lag,
+        read_your_writes_window=settings.database_read_your_writes_window,
+        instrumentation=app.state.query_instrumentation,
+        prepared_statement_cache_size=settings.database_prepared_statement_cache_size,
     )
 
-    # 初始化 Redis
-    app.state.redis = Redis.from_url(
+    # 初始化 Redis (按用途划分的阻塞连接池)
+    app.state.redis_manager = RedisManager(
         settings.redis_url,
-        decode_responses=True,
+        pools=default_pools(
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            warmup=settings.redis_warmup_connections,
+        ),
     )
+    await app.state.redis_manager.warm_up()
+    app.state.redis = app.state.redis_manager.client("cache")
+    app.state.cache = CacheClient(app.state.redis, prefix="user")
+
+    # 读己之写标记存放在 Redis, 服务的多个实例共享
+    app.state.db_manager.sticky_store = RedisStickyStore(app.state.redis, prefix="user:db:primary:")
+    await app.state.db_manager.start()
 
     yield
 
     # 清理资源
-    await app.state.redis.close()
+    await app.state.redis_manager.close()
     await app.state.db_manager.close()
 
 
@@ -67,7 +83,18 @@ def create_app() -> FastAPI:
         redoc_url="/redoc" if settings.debug else None,
     )
 
+    # 语句埋点 (每请求语句数 / 数据库耗时、N+1 检测、慢查询日志)
+    app.state.query_instrumentation = QueryInstrumentation(
+        slow_query_ms=settings.database_slow_query_ms,
+        n_plus_one_threshold=settings.database_n_plus_one_threshold,
+    )
+
     # 添加中间件
+    app.add_middleware(
+        QueryStatsMiddleware,
+        instrumentation=app.state.query_instrumentation,
+        expose_headers=settings.debug,
+    )
     app.add_middleware(RequestIdMiddleware)
     app.add_middleware(TimingMiddleware)
 
@@ -5,16 +5,17 @@ from datetime import date
 from sqlalchemy import Boolean, Date, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from platform_db import Base, SoftDeleteMixin, TimestampMixin
+from platform_db import Base, SoftDeleteMixin, TimestampMixin, active_index
 
 
 class UserProfile(Base, TimestampMixin, SoftDeleteMixin):
     """用户档案模型"""
 
     __tablename__ = "user_profiles"
+    __table_args__ = (active_index("ix_user_profiles_user_id_active", "user_id", unique=True),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    user_id: Mapped[str] = mapped_column(String(36), unique=True, index=True)
+    user_id: Mapped[str] = mapped_column(String(36))
 
     # 基本信息
     display_name: Mapped[str | None] = mapped_column(String(100))
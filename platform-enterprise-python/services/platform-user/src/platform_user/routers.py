@@ -4,12 +4,14 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends
 
+from platform_core.exceptions import NotFoundError
 from platform_core.schemas import ApiResponse
 
 from platform_user.dependencies import (
     CurrentUserDep,
     UserAddressServiceDep,
     UserProfileServiceDep,
+    UserProfileWriterDep,
 )
 from platform_user.schemas import (
     UserAddressCreate,
@@ -26,10 +28,14 @@ router = APIRouter(prefix="/users", tags=["Users"])
 @router.get("/me/profile", response_model=ApiResponse[UserProfileResponse])
 async def get_my_profile(
     service: UserProfileServiceDep,
+    writer: UserProfileWriterDep,
     current_user: CurrentUserDep,
 ) -> ApiResponse[UserProfileResponse]:
-    """获取当前用户档案"""
-    profile = await service.get_or_create_profile(current_user.sub)
+    """获取当前用户档案 (不存在时在主库创建)"""
+    try:
+        profile = await service.get_profile(current_user.sub)
+    except NotFoundError:
+        profile = await writer.get_or_create_profile(current_user.sub)
     return ApiResponse(data=profile)
 
 
@@ -1,10 +1,12 @@
 """User Service Layer"""
 
-from sqlalchemy import select, update
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from platform_cache import CacheClient, cached
 from platform_core.exceptions import NotFoundError
 from platform_core.utils import generate_uuid
+from platform_db import BaseRepository, prebuilt, run_after_commit
 from platform_messaging import EventPublisher, UserUpdatedEvent
 
 from platform_user.models import UserAddress, UserProfile
@@ -18,6 +20,18 @@ from platform_user.schemas import (
 )
 
 
+# 热点查询预构建一次, 执行时只传参数
+_PROFILE_BY_USER_ID = prebuilt(
+    select(UserProfile).where(UserProfile.user_id == bindparam("user_id"))
+)
+_ADDRESS_BY_ID = prebuilt(
+    select(UserAddress).where(
+        UserAddress.id == bindparam("id"),
+        UserAddress.user_id == bindparam("user_id"),
+    )
+)
+
+
 class UserProfileService:
     """用户档案服务"""
 
@@ -25,15 +39,21 @@ class UserProfileService:
         self,
         session: AsyncSession,
         event_publisher: EventPublisher | None = None,
+        cache: CacheClient | None = None,
     ) -> None:
         self.session = session
         self.events = event_publisher
-
+        self.cache = cache
+
+    @cached(
+        "user:profile:{user_id}",
+        ttl=300,
+        negative_on=(NotFoundError,),
+        negative_ttl=30,
+    )
     async def get_profile(self, user_id: str) -> UserProfileResponse:
         """获取用户档案"""
-        result = await self.session.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
-        )
+        result = await self.session.execute(_PROFILE_BY_USER_ID, {"user_id": user_id})
         profile = result.scalar_one_or_none()
 
         if not profile:
@@ -52,6 +72,8 @@ class UserProfileService:
         )
         self.session.add(profile)
         await self.session.flush()
+        # 提交后清除可能存在的负缓存; 提交前清除时并发读取会重新写回负缓存
+        run_after_commit(self.session, lambda: self.get_profile.invalidate(user_id=user_id))
 
         return UserProfileResponse.model_validate(profile)
 
@@ -59,9 +81,7 @@ class UserProfileService:
         self, user_id: str, data: UserProfileUpdate
     ) -> UserProfileResponse:
         """更新用户档案"""
-        result = await self.session.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
-        )
+        result = await self.session.execute(_PROFILE_BY_USER_ID, {"user_id": user_id})
         profile = result.scalar_one_or_none()
 
         if not profile:
@@ -77,6 +97,8 @@ class UserProfileService:
                 setattr(profile, key, value)
 
         await self.session.flush()
+        if changes:
+            run_after_commit(self.session, lambda: self.get_profile.invalidate(user_id=user_id))
 
         # 发布事件
         if self.events and changes:
@@ -90,9 +112,7 @@ class UserProfileService:
         self, user_id: str, data: UserProfileCreate | None = None
     ) -> UserProfileResponse:
         """获取或创建用户档案"""
-        result = await self.session.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
-        )
+        result = await self.session.execute(_PROFILE_BY_USER_ID, {"user_id": user_id})
         profile = result.scalar_one_or_none()
 
         if profile:
@@ -101,11 +121,18 @@ class UserProfileService:
         return await self.create_profile(user_id, data or UserProfileCreate())
 
 
+class UserAddressRepository(BaseRepository[UserAddress]):
+    """用户地址仓储"""
+
+    model = UserAddress
+
+
 class UserAddressService:
     """用户地址服务"""
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self.addresses = UserAddressRepository(session)
 
     async def list_addresses(self, user_id: str) -> list[UserAddressResponse]:
         """获取用户地址列表"""
@@ -120,10 +147,7 @@ class UserAddressService:
     async def get_address(self, user_id: str, address_id: str) -> UserAddressResponse:
         """获取地址详情"""
         result = await self.session.execute(
-            select(UserAddress).where(
-                UserAddress.id == address_id,
-                UserAddress.user_id == user_id,
-            )
+            _ADDRESS_BY_ID, {"id": address_id, "user_id": user_id}
         )
         address = result.scalar_one_or_none()
 
@@ -157,20 +181,17 @@ class UserAddressService:
     async def update_address(
         self, user_id: str, address_id: str, data: UserAddressUpdate
     ) -> UserAddressResponse:
-        """更新地址"""
-        result = await self.session.execute(
-            select(UserAddress).where(
-                UserAddress.id == address_id,
-                UserAddress.user_id == user_id,
-            )
+        """更新地址 (单条 UPDATE ... RETURNING)"""
+        update_data = data.model_dump(exclude_unset=True)
+        address = await self.addresses.update_by_id(
+            address_id,
+            update_data,
+            where=[UserAddress.user_id == user_id],
         )
-        address = result.scalar_one_or_none()
 
         if not address:
             raise NotFoundError("Address not found")
 
-        update_data = data.model_dump(exclude_unset=True)
-
         # 如果设为默认，清除其他默认地址
         if update_data.get("is_default"):
             await self.session.execute(
@@ -179,24 +200,16 @@ class UserAddressService:
                 .values(is_default=False)
             )
 
-        for key, value in update_data.items():
-            setattr(address, key, value)
-
-        await self.session.flush()
         return UserAddressResponse.model_validate(address)
 
     async def delete_address(self, user_id: str, address_id: str) -> bool:
-        """删除地址"""
-        result = await self.session.execute(
-            select(UserAddress).where(
-                UserAddress.id == address_id,
-                UserAddress.user_id == user_id,
-            )
+        """删除地址 (单条 DELETE)"""
+        deleted = await self.addresses.delete_by_id(
+            address_id,
+            where=[UserAddress.user_id == user_id],
         )
-        address = result.scalar_one_or_none()
 
-        if not address:
+        if not deleted:
             raise NotFoundError("Address not found")
 
-        await self.session.delete(address)
         return True
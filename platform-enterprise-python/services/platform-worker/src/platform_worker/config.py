@@ -22,8 +22,11 @@ class Settings(BaseSettings):
     database_pool_size: int = 10
     database_max_overflow: int = 5
 
-    # Redis 配置
+    # Redis 配置 (memory:// 使用进程内后端, 适用于单节点部署与无 Redis 压测)
     redis_url: str = "redis://localhost:6379/3"
+    redis_max_connections: int = 10
+    redis_pool_timeout: float = 5.0
+    redis_warmup_connections: int = 2
 
     # Worker 配置
     consumer_group: str = "platform-workers"
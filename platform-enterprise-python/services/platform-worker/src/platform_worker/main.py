@@ -2,10 +2,9 @@
 
 import asyncio
 import signal
-from typing import Any
-
-from redis.asyncio import Redis
+from typing import TYPE_CHECKING, Any
 
+from platform_cache import PoolConfig, RedisManager
 from platform_db import DatabaseManager
 from platform_messaging import EventConsumer
 from platform_observability import configure_logging, get_logger
@@ -13,6 +12,11 @@ from platform_observability import configure_logging, get_logger
 from platform_worker.config import settings
 from platform_worker.handlers import EVENT_HANDLERS
 
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
 logger = get_logger(__name__)
 
 
@@ -20,6 +24,7 @@ class WorkerApp:
     """Worker 应用"""
 
     def __init__(self) -> None:
+        self.redis_manager: RedisManager | None = None
         self.redis: Redis | None = None
         self.db_manager: DatabaseManager | None = None
         self.consumer: EventConsumer | None = None
@@ -37,11 +42,20 @@ class WorkerApp:
 
         logger.info("Starting worker application")
 
-        # 初始化 Redis
-        self.redis = Redis.from_url(
+        # 初始化 Redis (事件流连接池; XREADGROUP BLOCK 需要无读超时)
+        self.redis_manager = RedisManager(
             settings.redis_url,
-            decode_responses=True,
+            pools={
+                "streams": PoolConfig(
+                    max_connections=settings.redis_max_connections,
+                    timeout=settings.redis_pool_timeout,
+                    warmup=settings.redis_warmup_connections,
+                    socket_timeout=None,
+                ),
+            },
         )
+        await self.redis_manager.warm_up()
+        self.redis = self.redis_manager.client("streams")
 
         # 初始化数据库
         self.db_manager = DatabaseManager(
@@ -77,8 +91,8 @@ class WorkerApp:
         if self.consumer:
             self.consumer.stop()
 
-        if self.redis:
-            await self.redis.close()
+        if self.redis_manager:
+            await self.redis_manager.close()
 
         if self.db_manager:
             await self.db_manager.close()
@@ -0,0 +1,73 @@
+"""Gateway Rate Limit Middleware Tests"""
+
+from collections.abc import Callable
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from platform_api.middleware import RateLimitMiddleware
+from platform_cache import CacheClient, SlidingWindowRateLimiter, create_redis_client
+from platform_core.security import JWTHandler
+
+
+_JWT = JWTHandler(secret_key="test-secret")  # noqa: S106
+
+
+def make_app(memory_url: Callable[[], str], *, trusted_proxies: int = 0) -> FastAPI:
+    app = FastAPI()
+    app.state.rate_limiter = SlidingWindowRateLimiter(CacheClient(create_redis_client(memory_url()), prefix="api"))
+    app.add_middleware(
+        RateLimitMiddleware,
+        max_requests=2,
+        window_seconds=60,
+        trusted_proxies=trusted_proxies,
+        jwt_handler=_JWT,
+    )
+    app.add_middleware(CORSMiddleware, allow_origins=["*"])
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    return app
+
+
+def client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway")
+
+
+async def test_rejected_response_passes_through_cors(memory_url: Callable[[], str]) -> None:
+    async with client(make_app(memory_url)) as http:
+        responses = [await http.get("/ping", headers={"Origin": "https://app.example"}) for _ in range(3)]
+
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    rejected = responses[-1]
+    assert rejected.headers["Access-Control-Allow-Origin"] == "*"
+    assert int(rejected.headers["Retry-After"]) >= 1
+    assert responses[0].headers["X-RateLimit-Remaining"] == "1"
+
+
+@pytest.mark.parametrize(("trusted_proxies", "separate"), [(0, False), (1, True)])
+async def test_forwarded_client_ip(memory_url: Callable[[], str], trusted_proxies: int, separate: bool) -> None:
+    async with client(make_app(memory_url, trusted_proxies=trusted_proxies)) as http:
+        for _ in range(2):
+            await http.get("/ping", headers={"X-Forwarded-For": "203.0.113.1"})
+        response = await http.get("/ping", headers={"X-Forwarded-For": "203.0.113.2"})
+
+    # 未信任代理时所有请求共享负载均衡器的地址
+    assert (response.status_code == 200) is separate
+
+
+async def test_authenticated_users_have_their_own_bucket(memory_url: Callable[[], str]) -> None:
+    alice = {"Authorization": f"Bearer {_JWT.create_access_token('alice')}"}
+    bob = {"Authorization": f"Bearer {_JWT.create_access_token('bob')}"}
+
+    async with client(make_app(memory_url)) as http:
+        for _ in range(2):
+            assert (await http.get("/ping", headers=alice)).status_code == 200
+        assert (await http.get("/ping", headers=alice)).status_code == 429
+        assert (await http.get("/ping", headers=bob)).status_code == 200
+        # 无效令牌回退到按 IP 限流
+        assert (await http.get("/ping", headers={"Authorization": "Bearer invalid"})).status_code == 200
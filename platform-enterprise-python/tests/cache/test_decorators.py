@@ -0,0 +1,60 @@
+"""Cache Decorator Tests"""
+
+from collections.abc import Callable
+
+import pytest
+from prometheus_client import REGISTRY
+
+from platform_cache import CacheClient, cached, create_redis_client
+from platform_core.exceptions import NotFoundError
+
+
+class _Service:
+    def __init__(self, cache: CacheClient) -> None:
+        self.cache = cache
+        self.rows = {"1": "alice"}
+
+    @cached("name:{user_id}", ttl=60, negative_on=(NotFoundError,), negative_ttl=30)
+    async def get_name(self, user_id: str) -> str:
+        if user_id not in self.rows:
+            raise NotFoundError("User not found")
+        return self.rows[user_id]
+
+
+def _calls(result: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "platform_cached_function_calls_total",
+        {"function": f"{__name__}._Service.get_name", "result": result},
+    )
+    return value or 0.0
+
+
+async def test_cached_counts_hits_misses_and_negative_hits(memory_url: Callable[[], str]) -> None:
+    service = _Service(CacheClient(create_redis_client(memory_url()), prefix="test"))
+    stats = service.get_name.stats
+    before = stats.to_dict()
+    exported = {result: _calls(result) for result in ("hit", "miss", "negative_hit")}
+
+    assert await service.get_name("1") == "alice"
+    assert await service.get_name("1") == "alice"
+    for _ in range(2):
+        with pytest.raises(NotFoundError):
+            await service.get_name("2")
+
+    assert stats.hits - before["hits"] == 1
+    assert stats.misses - before["misses"] == 2
+    assert stats.negative_hits - before["negative_hits"] == 1
+    assert _calls("hit") - exported["hit"] == 1
+    assert _calls("miss") - exported["miss"] == 2
+    assert _calls("negative_hit") - exported["negative_hit"] == 1
+
+
+async def test_invalidate_clears_negative_entry(memory_url: Callable[[], str]) -> None:
+    service = _Service(CacheClient(create_redis_client(memory_url()), prefix="test"))
+    with pytest.raises(NotFoundError):
+        await service.get_name("2")
+
+    service.rows["2"] = "bob"
+    await service.get_name.invalidate(user_id="2")
+
+    assert await service.get_name("2") == "bob"
@@ -0,0 +1,140 @@
+"""Lua Script Parity Tests
+
+memory:// 后端以 register_script_handler() 注册的 Python 实现代替 Lua 脚本。
+这里对同一组调用分别在真实 Redis 与 memory:// 上执行脚本并比较结果;
+需要 REDIS_URL 或可用的 Docker (testcontainers), 否则跳过。
+"""
+
+import uuid
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import pytest
+from redis.exceptions import NoScriptError
+
+from platform_cache import CacheClient, create_redis_client
+from platform_cache.client import RELEASE_LEASE_SCRIPT
+from platform_cache.rate_limiter import SLIDING_WINDOW_SCRIPT, TOKEN_BUCKET_SCRIPT
+
+
+pytestmark = pytest.mark.integration
+
+# 一小时的窗口, 两个后端先后执行的时间差对结果的影响可以忽略
+_WINDOW_MS = 3_600_000
+
+
+@pytest.fixture
+async def backends(redis_url: str, memory_url: Callable[[], str]) -> AsyncIterator[tuple[CacheClient, CacheClient]]:
+    """(真实 Redis, memory://), 真实 Redis 使用随机前缀隔离"""
+    real = CacheClient(create_redis_client(redis_url), prefix=f"test-{uuid.uuid4().hex}")
+    memory = CacheClient(create_redis_client(memory_url()), prefix="test")
+    yield real, memory
+    await real.delete_pattern("*")
+    await real.redis.aclose()
+
+
+async def _eval(cache: CacheClient, script: str, key: str, *args: Any) -> Any:
+    return await cache.redis.register_script(script)(keys=[cache._make_key(key)], args=list(args))
+
+
+async def _now_ms(cache: CacheClient) -> int:
+    seconds, micros = await cache.redis.time()
+    return int(seconds) * 1000 + int(micros) // 1000
+
+
+async def _seed_sliding_window(cache: CacheClient, key: str, windows_ago: int, c: int, p: int) -> None:
+    """写入 windows_ago 个窗口之前的状态"""
+    now = await _now_ms(cache)
+    start = now - now % _WINDOW_MS
+    await cache.redis.hset(cache._make_key(key), mapping={"s": start - windows_ago * _WINDOW_MS, "c": c, "p": p})
+
+
+async def _sliding_window_state(cache: CacheClient, key: str) -> dict[str, int]:
+    state = await cache.redis.hgetall(cache._make_key(key))
+    now = await _now_ms(cache)
+    return {"s": int(state["s"]) - (now - now % _WINDOW_MS), "c": int(state["c"]), "p": int(state["p"])}
+
+
+@pytest.mark.parametrize(
+    ("seed", "costs"),
+    [
+        # 新键, 逐步用满额度; 超额请求不计数
+        (None, [1, 2, 1, 3, 1, 1]),
+        # 上一窗口已满, 按剩余权重计入
+        ((1, 5, 0), [1, 1]),
+        # 上一窗口部分使用
+        ((1, 2, 4), [1, 1, 1, 1]),
+        # 更早的窗口, 计数全部丢弃
+        ((3, 5, 5), [2, 2, 2]),
+    ],
+)
+async def test_sliding_window_matches_lua(
+    backends: tuple[CacheClient, CacheClient], seed: tuple[int, int, int] | None, costs: list[int]
+) -> None:
+    results = []
+    for cache in backends:
+        if seed is not None:
+            await _seed_sliding_window(cache, "sw", *seed)
+        calls = [await _eval(cache, SLIDING_WINDOW_SCRIPT, "sw", 5, _WINDOW_MS, cost) for cost in costs]
+        results.append((calls, await _sliding_window_state(cache, "sw")))
+
+    (real_calls, real_state), (memory_calls, memory_state) = results
+    assert [call[:2] for call in memory_calls] == [call[:2] for call in real_calls]
+    for real, memory in zip(real_calls, memory_calls, strict=True):
+        assert memory[2] == pytest.approx(real[2], abs=5000)
+    assert memory_state == real_state
+    assert await backends[1].redis.pttl(backends[1]._make_key("sw")) == pytest.approx(
+        await backends[0].redis.pttl(backends[0]._make_key("sw")), abs=5000
+    )
+
+
+@pytest.mark.parametrize(
+    ("seed", "requests"),
+    [
+        (None, [1, 1, 1, 1, 4]),
+        # 100 秒前剩余 0.5 个令牌, 期间补充 0.1 个
+        ((0.5, 100), [1, 0.5, 1]),
+    ],
+)
+async def test_token_bucket_matches_lua(
+    backends: tuple[CacheClient, CacheClient], seed: tuple[float, int] | None, requests: list[float]
+) -> None:
+    results = []
+    for cache in backends:
+        if seed is not None:
+            tokens, seconds_ago = seed
+            now = await _now_ms(cache) / 1000
+            await cache.redis.hset(
+                cache._make_key("bucket"),
+                mapping={"tokens": str(tokens), "last_update": str(now - seconds_ago)},
+            )
+        results.append([await _eval(cache, TOKEN_BUCKET_SCRIPT, "bucket", 3, 0.001, tokens) for tokens in requests])
+
+    real_calls, memory_calls = results
+    for real, memory in zip(real_calls, memory_calls, strict=True):
+        assert memory[0] == real[0]
+        assert float(memory[1]) == pytest.approx(float(real[1]), abs=0.01)
+        assert float(memory[2]) == pytest.approx(float(real[2]), abs=5)
+
+
+async def test_release_lease_matches_lua(backends: tuple[CacheClient, CacheClient]) -> None:
+    results = []
+    for cache in backends:
+        await cache.redis.set(cache._make_key("lease"), "owner")
+        results.append(
+            [
+                await _eval(cache, RELEASE_LEASE_SCRIPT, "lease", "other"),
+                await _eval(cache, RELEASE_LEASE_SCRIPT, "lease", "owner"),
+                await _eval(cache, RELEASE_LEASE_SCRIPT, "lease", "owner"),
+            ]
+        )
+
+    assert results[1] == results[0] == [0, 1, 0]
+
+
+async def test_evalsha_before_load_matches_redis(backends: tuple[CacheClient, CacheClient]) -> None:
+    # 随机脚本, 保证未被真实 Redis 缓存
+    script = f"return '{uuid.uuid4().hex}'"
+    for cache in backends:
+        with pytest.raises(NoScriptError):
+            await cache.redis.evalsha(cache.redis.register_script(script).sha, 0)
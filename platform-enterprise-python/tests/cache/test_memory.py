@@ -0,0 +1,219 @@
+"""In-Memory Redis Backend Tests"""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+import pytest
+from redis.exceptions import NoScriptError, ResponseError
+
+from platform_cache import InMemoryRedis, MemoryStore
+from platform_cache.client import RELEASE_LEASE_SCRIPT
+from platform_messaging import EventConsumer, EventPublisher, UserCreatedEvent
+
+
+@pytest.fixture
+def redis(memory_url: Callable[[], str]) -> InMemoryRedis:
+    return InMemoryRedis.from_url(memory_url(), decode_responses=True)
+
+
+# ==================== 过期 ====================
+
+
+def test_timer_wheel_reaps_without_access(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    # 一圈 0.8 秒, long 的过期时刻超过一圈
+    store = MemoryStore(tick=0.1, slots=8)
+    redis = InMemoryRedis(store, decode_responses=True)
+    redis.run_command("set", "short", "1", px=150)
+    redis.run_command("set", "extended", "1", px=150)
+    redis.run_command("expire", "extended", 2)
+    redis.run_command("set", "long", "1", ex=5)
+    redis.run_command("set", "forever", "1")
+
+    now[0] += 0.2
+    assert store.expire_due() == 1
+    assert set(store.data) == {"extended", "long", "forever"}
+
+    now[0] += 2
+    assert store.expire_due() == 1
+    assert set(store.data) == {"long", "forever"}
+
+    now[0] += 3
+    assert store.expire_due() == 1
+    assert set(store.data) == {"forever"}
+    assert store.expired_keys == 3
+
+
+def test_lazy_expiry_on_read(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    store = MemoryStore()
+    redis = InMemoryRedis(store, decode_responses=True)
+    redis.run_command("set", "k", "v", ex=1)
+    assert redis.run_command("ttl", "k") == 1
+
+    now[0] += 1
+    assert redis.run_command("get", "k") is None
+    assert redis.run_command("ttl", "k") == -2
+    assert store.expired_keys == 1
+
+
+async def test_background_reaper() -> None:
+    store = MemoryStore(tick=0.01)
+    redis = InMemoryRedis(store)
+    await redis.set("k", "v", px=20)
+
+    await asyncio.sleep(0.1)
+
+    assert "k" not in store.data
+    assert store.expired_keys == 1
+
+
+# ==================== Pipeline / 脚本 ====================
+
+
+async def test_pipeline_collects_errors(redis: InMemoryRedis) -> None:
+    await redis.hset("hash", "f", "1")
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.incr("counter").incrby("counter", 4).get("hash").expire("counter", 60)
+        results = await pipe.execute(raise_on_error=False)
+
+    assert results[:2] == [1, 5]
+    assert isinstance(results[2], ResponseError)
+    assert results[3] is True
+    assert 0 < await redis.ttl("counter") <= 60
+
+    async with redis.pipeline() as pipe:
+        pipe.get("hash")
+        with pytest.raises(ResponseError, match="WRONGTYPE"):
+            await pipe.execute()
+
+
+async def test_evalsha_requires_loaded_script(redis: InMemoryRedis) -> None:
+    sha = await redis.script_load(RELEASE_LEASE_SCRIPT)
+    other = InMemoryRedis(MemoryStore(), decode_responses=True)
+
+    await redis.set("lease", "me")
+    assert await redis.evalsha(sha, 1, "lease", "me") == 1
+    with pytest.raises(NoScriptError):
+        await other.evalsha(sha, 1, "lease", "me")
+    with pytest.raises(ResponseError, match="not supported"):
+        await redis.eval("return 1", 0)
+
+
+# ==================== Pub/Sub ====================
+
+
+async def test_pubsub_delivers_to_subscribers(redis: InMemoryRedis) -> None:
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe("events")
+
+    assert await redis.publish("events", "hello") == 1
+    assert await redis.publish("other", "ignored") == 0
+
+    message = await pubsub.get_message(timeout=0.1)
+    assert message is not None
+    assert (message["channel"], message["data"]) == ("events", "hello")
+    assert await pubsub.get_message(timeout=0.01) is None
+
+    await pubsub.aclose()
+    assert await redis.publish("events", "after close") == 0
+
+
+# ==================== Stream / 消费者组 ====================
+
+
+async def test_consumer_group_read_ack_pending(redis: InMemoryRedis) -> None:
+    await redis.xgroup_create("events", "workers", id="0", mkstream=True)
+    with pytest.raises(ResponseError, match="BUSYGROUP"):
+        await redis.xgroup_create("events", "workers", id="0", mkstream=True)
+    ids = [await redis.xadd("events", {"n": str(i)}) for i in range(3)]
+
+    [[stream, entries]] = await redis.xreadgroup("workers", "c1", {"events": ">"}, count=2)
+    assert stream == "events"
+    assert entries == [(ids[0], {"n": "0"}), (ids[1], {"n": "1"})]
+
+    summary = await redis.xpending("events", "workers")
+    assert summary["pending"] == 2
+    assert summary["consumers"] == [{"name": "c1", "pending": 2}]
+
+    assert await redis.xack("events", "workers", ids[0]) == 1
+    assert await redis.xack("events", "workers", ids[0]) == 0
+
+    # 新消息只投递一次; 以 0 读取本消费者尚未确认的历史
+    [[_, entries]] = await redis.xreadgroup("workers", "c2", {"events": ">"})
+    assert [entry_id for entry_id, _ in entries] == [ids[2]]
+    [[_, entries]] = await redis.xreadgroup("workers", "c1", {"events": "0"})
+    assert [entry_id for entry_id, _ in entries] == [ids[1]]
+
+    with pytest.raises(ResponseError, match="NOGROUP"):
+        await redis.xreadgroup("missing", "c1", {"events": ">"})
+
+
+async def test_xclaim_transfers_idle_entries(redis: InMemoryRedis) -> None:
+    await redis.xgroup_create("events", "workers", id="0", mkstream=True)
+    entry_id = await redis.xadd("events", {"n": "1"})
+    await redis.xreadgroup("workers", "c1", {"events": ">"})
+
+    assert await redis.xclaim("events", "workers", "c2", 60_000, [entry_id]) == []
+
+    claimed = await redis.xclaim("events", "workers", "c2", 0, [entry_id])
+    assert claimed == [(entry_id, {"n": "1"})]
+    [pending] = await redis.xpending_range("events", "workers", min="-", max="+", count=10)
+    assert pending["message_id"] == entry_id
+    assert pending["consumer"] == "c2"
+    assert pending["times_delivered"] == 2
+
+    # 已删除的条目在认领时从待确认列表移除
+    await redis.xdel("events", entry_id)
+    assert await redis.xclaim("events", "workers", "c1", 0, [entry_id]) == []
+    assert (await redis.xpending("events", "workers"))["pending"] == 0
+
+
+async def test_blocking_xreadgroup(redis: InMemoryRedis) -> None:
+    await redis.xgroup_create("events", "workers", id="$", mkstream=True)
+    assert await redis.xreadgroup("workers", "c1", {"events": ">"}, block=10) == []
+
+    read = asyncio.create_task(redis.xreadgroup("workers", "c1", {"events": ">"}, block=1000))
+    await asyncio.sleep(0)
+    entry_id = await redis.xadd("events", {"n": "1"})
+
+    assert await asyncio.wait_for(read, 1) == [["events", [(entry_id, {"n": "1"})]]]
+
+
+async def test_event_consumer_round_trip(redis: InMemoryRedis) -> None:
+    publisher = EventPublisher(redis)
+    consumer = EventConsumer(redis, "workers", "c1")
+    received: list[dict] = []
+    done = asyncio.Event()
+
+    @consumer.on("user.created")
+    async def handle(data: dict) -> None:
+        received.append(data)
+        done.set()
+
+    task = asyncio.create_task(consumer.consume(["user"], block_ms=50))
+    await asyncio.sleep(0)
+    await publisher.publish(UserCreatedEvent(user_id="u1", email="u1@example.com", username="u1"))
+    await asyncio.wait_for(done.wait(), 1)
+    consumer.stop()
+    await asyncio.wait_for(task, 1)
+
+    assert received[0]["user_id"] == "u1"
+    assert (await redis.xpending("events:user", "workers"))["pending"] == 0
+
+
+async def test_event_consumer_claims_pending(redis: InMemoryRedis) -> None:
+    publisher = EventPublisher(redis)
+    await redis.xgroup_create("events:user", "workers", id="0", mkstream=True)
+    await publisher.publish(UserCreatedEvent(user_id="u1", email="u1@example.com", username="u1"))
+    # c1 读取后未确认即退出
+    await redis.xreadgroup("workers", "c1", {"events:user": ">"})
+
+    consumer = EventConsumer(redis, "workers", "c2")
+    assert await consumer.claim_pending("user", min_idle_time=0) == 1
+
+    [pending] = await redis.xpending_range("events:user", "workers", min="-", max="+", count=10)
+    assert pending["consumer"] == "c2"
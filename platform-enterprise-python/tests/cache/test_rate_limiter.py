@@ -0,0 +1,158 @@
+"""Rate Limiter Tests"""
+
+import math
+import time
+from collections.abc import Callable
+
+import pytest
+
+from platform_cache import (
+    ApproximateRateLimiter,
+    CacheClient,
+    HotKeyDetector,
+    RateLimiter,
+    SlidingWindowRateLimiter,
+    TokenBucketLimiter,
+    create_redis_client,
+)
+
+
+# 10 秒窗口的起点, 便于推算窗口内的经过时间
+_T0 = 1_700_000_000.0
+
+
+@pytest.fixture
+def cache(memory_url: Callable[[], str]) -> CacheClient:
+    return CacheClient(create_redis_client(memory_url()), prefix="test")
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """可控的墙钟; 进程内 Redis 的 TIME 命令同样读取 time.time"""
+    now = [_T0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+async def test_fixed_window_limits_and_resets(cache: CacheClient) -> None:
+    limiter = RateLimiter(cache)
+
+    results = [await limiter.is_allowed("user:1", 2, 60) for _ in range(3)]
+
+    assert [(allowed, remaining) for allowed, remaining, _ in results] == [(True, 1), (True, 0), (False, 0)]
+    assert all(0 < ttl <= 60 for _, _, ttl in results)
+    assert await limiter.reset("user:1")
+    assert (await limiter.is_allowed("user:1", 2, 60))[0]
+
+
+async def test_sliding_window_admits_up_to_limit(cache: CacheClient, clock: list[float]) -> None:
+    limiter = SlidingWindowRateLimiter(cache)
+
+    results = [await limiter.is_allowed("user:1", 3, 10) for _ in range(4)]
+
+    assert [(allowed, remaining) for allowed, remaining, _ in results] == [
+        (True, 2),
+        (True, 1),
+        (True, 0),
+        (False, 0),
+    ]
+    assert await limiter.reset("user:1")
+    assert (await limiter.is_allowed("user:1", 3, 10))[0]
+
+
+async def test_sliding_window_has_no_boundary_burst(cache: CacheClient, clock: list[float]) -> None:
+    limiter = SlidingWindowRateLimiter(cache)
+    for _ in range(3):
+        assert (await limiter.is_allowed("user:1", 3, 10))[0]
+
+    # 进入下一窗口时上一窗口的计数按剩余比例计入, 不会立即放出整窗额度
+    clock[0] = _T0 + 10
+    allowed, _, reset = await limiter.is_allowed("user:1", 3, 10)
+    assert not allowed
+    # 需等待上一窗口权重衰减到 2 / 3 以下, 即约 3.3 秒
+    assert reset == 4
+
+    # 经过半个窗口, 估算值为 3 * 0.5 = 1.5, 还可放行 1 个
+    clock[0] = _T0 + 15
+    assert (await limiter.is_allowed("user:1", 3, 10))[0]
+    assert not (await limiter.is_allowed("user:1", 3, 10))[0]
+
+
+async def test_sliding_window_cost(cache: CacheClient, clock: list[float]) -> None:
+    limiter = SlidingWindowRateLimiter(cache)
+
+    assert await limiter.is_allowed("user:1", 5, 10, cost=4) == (True, 1, 10)
+    assert not (await limiter.is_allowed("user:1", 5, 10, cost=2))[0]
+    assert (await limiter.is_allowed("user:1", 5, 10, cost=1))[0]
+
+
+async def test_token_bucket_refills_over_time(cache: CacheClient, clock: list[float]) -> None:
+    limiter = TokenBucketLimiter(cache)
+
+    for _ in range(3):
+        assert (await limiter.try_acquire("user:1", capacity=3, refill_rate=1)).acquired
+
+    result = await limiter.try_acquire("user:1", capacity=3, refill_rate=1)
+    assert not result.acquired
+    assert result.wait_time == pytest.approx(1.0)
+
+    clock[0] = _T0 + 0.5
+    result = await limiter.try_acquire("user:1", capacity=3, refill_rate=1)
+    assert not result.acquired
+    assert result.wait_time == pytest.approx(0.5)
+
+    clock[0] = _T0 + 1
+    assert (await limiter.try_acquire("user:1", capacity=3, refill_rate=1)).acquired
+
+
+async def test_token_bucket_request_above_capacity_never_fits(cache: CacheClient, clock: list[float]) -> None:
+    limiter = TokenBucketLimiter(cache)
+
+    result = await limiter.try_acquire("user:1", capacity=3, refill_rate=1, tokens=4)
+
+    assert not result.acquired
+    assert math.isinf(result.wait_time)
+
+
+@pytest.mark.parametrize(
+    ("capacity", "refill_rate", "tokens"), [(0, 1, 1), (3, 0, 1), (-1, 1, 1), (3, 1, 0), (3, 1, -2)]
+)
+async def test_token_bucket_rejects_invalid_arguments(
+    cache: CacheClient, capacity: int, refill_rate: float, tokens: int
+) -> None:
+    limiter = TokenBucketLimiter(cache)
+
+    with pytest.raises(ValueError):
+        await limiter.try_acquire("user:1", capacity=capacity, refill_rate=refill_rate, tokens=tokens)
+
+
+async def test_approximate_limiter_admits_exactly_limit_in_one_process(cache: CacheClient, clock: list[float]) -> None:
+    limiter = ApproximateRateLimiter(cache, local_share=0.5)
+    try:
+        results = [await limiter.is_allowed("user:1", 10, 60) for _ in range(15)]
+        await limiter.flush()
+    finally:
+        await limiter.close()
+
+    assert sum(allowed for allowed, _, _ in results) == 10
+    assert not any(allowed for allowed, _, _ in results[10:])
+    assert limiter.stats.over_admitted == 0
+    window_start = int(_T0 // 60) * 60
+    assert await cache.redis.get(cache._make_key(f"ratelimit:approx:user:1:{window_start}")) == "10"
+
+
+@pytest.mark.parametrize("limiter_type", [SlidingWindowRateLimiter, ApproximateRateLimiter])
+async def test_limiters_record_hot_keys(memory_url: Callable[[], str], clock: list[float], limiter_type: type) -> None:
+    cache = CacheClient(create_redis_client(memory_url()), prefix="test", hot_keys=HotKeyDetector(sample_rate=1.0))
+    limiter = limiter_type(cache)
+    try:
+        for _ in range(5):
+            await limiter.is_allowed("user:1", 100, 60)
+        await limiter.is_allowed("user:2", 100, 60)
+    finally:
+        if isinstance(limiter, ApproximateRateLimiter):
+            await limiter.close()
+
+    hot = cache.hot_keys.hot_keys()
+    assert hot[0].key.startswith(f"test:{limiter.key_prefix}:user:1")
+    assert len(hot) == 2
@@ -0,0 +1,34 @@
+"""Tag-Based Invalidation Tests"""
+
+from collections.abc import Callable
+
+import pytest
+
+from platform_cache import CacheClient, create_redis_client
+
+
+@pytest.fixture
+def cache(memory_url: Callable[[], str]) -> CacheClient:
+    return CacheClient(create_redis_client(memory_url()), prefix="test")
+
+
+async def test_invalidate_tag_deletes_only_tagged_keys(cache: CacheClient) -> None:
+    await cache.set("user:1", {"id": 1}, tags=["users"])
+    await cache.set("user:2", {"id": 2}, tags=["users", "admins"])
+    await cache.set("config", {"debug": False})
+
+    assert await cache.invalidate_tag("users") == 2
+
+    assert await cache.get("user:1") is None
+    assert await cache.get("user:2") is None
+    assert await cache.get("config") == {"debug": False}
+    assert await cache.invalidate_tag("users") == 0
+
+
+async def test_prune_tag_removes_missing_members(cache: CacheClient) -> None:
+    await cache.set("user:1", {"id": 1}, tags=["users"])
+    await cache.set("user:2", {"id": 2}, tags=["users"])
+    await cache.delete("user:1")
+
+    assert await cache.prune_tag("users") == 1
+    assert await cache.invalidate_tag("users") == 1
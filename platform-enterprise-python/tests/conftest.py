@@ -0,0 +1,50 @@
+"""Shared Test Fixtures"""
+
+import os
+import uuid
+from collections.abc import Callable, Iterator
+
+import pytest
+
+from platform_cache.memory import _stores
+
+
+try:
+    from testcontainers.redis import RedisContainer
+except ImportError:
+    RedisContainer = None
+
+
+@pytest.fixture
+def memory_url() -> Iterator[Callable[[], str]]:
+    """生成独立的 memory:// URL, 测试结束后清理对应的进程内键空间"""
+    names: list[str] = []
+
+    def make() -> str:
+        name = uuid.uuid4().hex
+        names.append(name)
+        return f"memory://{name}"
+
+    yield make
+    for name in names:
+        _stores.pop(name, None)
+
+
+@pytest.fixture(scope="session")
+def redis_url() -> Iterator[str]:
+    """真实 Redis 的 URL: 优先读取 REDIS_URL, 否则用 testcontainers 启动; 均不可用时跳过"""
+    url = os.environ.get("REDIS_URL")
+    if url:
+        yield url
+        return
+    if RedisContainer is None:
+        pytest.skip("REDIS_URL is not set and testcontainers is not installed")
+    try:
+        container = RedisContainer("redis:7-alpine").start()
+    except Exception as e:
+        pytest.skip(f"REDIS_URL is not set and the Redis container failed to start: {e}")
+    try:
+        host = container.get_container_host_ip()
+        yield f"redis://{host}:{container.get_exposed_port(6379)}/0"
+    finally:
+        container.stop()
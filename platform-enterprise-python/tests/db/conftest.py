@@ -0,0 +1,30 @@
+"""Database Test Fixtures"""
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from sample_models import Item, Template
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from platform_db import Base, CursorCodec
+
+
+@pytest.fixture
+async def engine(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Item.__table__, Template.__table__])
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine: AsyncEngine) -> AsyncIterator[AsyncSession]:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def codec() -> CursorCodec:
+    return CursorCodec("test-secret")
@@ -0,0 +1,42 @@
+"""Test Models"""
+
+from datetime import datetime
+from typing import Any, ClassVar
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from platform_db import Base, BaseRepository, EntityCacheOptions, SoftDeleteMixin, active_index
+
+
+class Item(Base, SoftDeleteMixin):
+    """软删除 + 部分唯一索引 + 乐观锁版本"""
+
+    __tablename__ = "test_items"
+    __table_args__ = (active_index("ix_test_items_sku_active", "sku", unique=True),)
+
+    sku: Mapped[str] = mapped_column(String(50))
+    name: Mapped[str] = mapped_column(String(100))
+    created_at: Mapped[datetime] = mapped_column()
+    version: Mapped[int] = mapped_column(default=1)
+
+    __mapper_args__: ClassVar[dict[str, Any]] = {"version_id_col": version}
+
+
+class Template(Base):
+    """启用二级缓存的模型"""
+
+    __tablename__ = "test_templates"
+    __entity_cache__ = EntityCacheOptions(ttl=60)
+
+    name: Mapped[str] = mapped_column(String(100))
+    body: Mapped[str] = mapped_column(String(500))
+    created_at: Mapped[datetime] = mapped_column()
+
+
+class ItemRepository(BaseRepository[Item]):
+    model = Item
+
+
+class TemplateRepository(BaseRepository[Template]):
+    model = Template
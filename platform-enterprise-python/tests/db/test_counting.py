@@ -0,0 +1,59 @@
+"""Count Estimate Tests"""
+
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sample_models import Template
+from sqlalchemy import Executable, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Mapped, mapped_column
+
+from platform_db import Base, SoftDeleteMixin, estimate_count
+
+
+class Archived(Base, SoftDeleteMixin):
+    """软删除模型"""
+
+    __tablename__ = "test_archived"
+
+    name: Mapped[str] = mapped_column(String(100))
+
+
+class _PlannerSession:
+    """记录语句的 PostgreSQL 会话替身, EXPLAIN 与 reltuples 均返回 rows"""
+
+    def __init__(self, rows: int) -> None:
+        self.rows = rows
+        self.statements: list[str] = []
+
+    def get_bind(self) -> Any:
+        return SimpleNamespace(dialect=postgresql.dialect())
+
+    async def scalar(self, statement: Executable, *_: Any) -> Any:
+        compiled = str(statement.compile(dialect=postgresql.dialect()))
+        self.statements.append(compiled)
+        if compiled.startswith("EXPLAIN"):
+            return json.dumps([{"Plan": {"Plan Rows": self.rows}}])
+        return float(self.rows)
+
+
+async def test_soft_deleted_model_estimates_live_rows_via_explain() -> None:
+    session = _PlannerSession(5000)
+
+    assert await estimate_count(session, Archived) == 5000  # type: ignore[arg-type]
+
+    [statement] = session.statements
+    assert statement.startswith("EXPLAIN")
+    assert "NOT test_archived.is_deleted" in statement
+
+
+@pytest.mark.parametrize(("model", "include_deleted"), [(Template, False), (Archived, True)])
+async def test_table_statistics_without_filters(model: type[Base], include_deleted: bool) -> None:
+    session = _PlannerSession(5000)
+
+    assert await estimate_count(session, model, include_deleted=include_deleted) == 5000  # type: ignore[arg-type]
+
+    [statement] = session.statements
+    assert "pg_class" in statement
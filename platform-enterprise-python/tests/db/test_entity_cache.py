@@ -0,0 +1,128 @@
+"""Second-Level Entity Cache Tests"""
+
+import asyncio
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+
+import pytest
+from sample_models import Template, TemplateRepository
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from platform_cache import create_redis_client
+from platform_db import EntityCache, init_entity_cache
+from platform_db import entity_cache as entity_cache_module
+from platform_db.entity_cache import _remove_listeners
+
+
+@pytest.fixture
+def cache(memory_url: Callable[[], str], monkeypatch: pytest.MonkeyPatch) -> Iterator[EntityCache]:
+    monkeypatch.setattr(entity_cache_module, "_state", {})
+    cache = init_entity_cache(create_redis_client(memory_url()))
+    yield cache
+    _remove_listeners(cache)
+
+
+@pytest.fixture
+def statements(engine: AsyncEngine) -> Iterator[list[str]]:
+    """记录引擎执行的语句"""
+    executed: list[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def seed(session: AsyncSession, count: int) -> list[Template]:
+    templates = [
+        Template(name=f"t{i}", body=f"body {i}", created_at=datetime(2024, 1, 1, tzinfo=UTC)) for i in range(count)
+    ]
+    session.add_all(templates)
+    await session.commit()
+    session.expunge_all()
+    return templates
+
+
+async def drain(cache: EntityCache) -> None:
+    """等待提交后调度的失效任务完成"""
+    await asyncio.gather(*cache._tasks)
+
+
+async def test_miss_populates_and_hit_skips_database(
+    session: AsyncSession, cache: EntityCache, statements: list[str]
+) -> None:
+    (template,) = await seed(session, 1)
+    repo = TemplateRepository(session)
+
+    loaded = await repo.get_by_id(template.id)
+    assert loaded.body == "body 0"
+    assert await cache.redis.get(cache.key(Template, template.id)) is not None
+
+    session.expunge_all()
+    statements.clear()
+    cached = await repo.get_by_id(template.id)
+
+    assert cached.body == "body 0"
+    assert cached.created_at == loaded.created_at
+    assert statements == []
+
+
+async def test_get_by_ids_loads_only_misses(session: AsyncSession, cache: EntityCache, statements: list[str]) -> None:
+    templates = await seed(session, 3)
+    repo = TemplateRepository(session)
+    await repo.get_by_id(templates[1].id)
+    session.expunge_all()
+    statements.clear()
+
+    ids = [template.id for template in templates]
+    found = await repo.get_by_ids([*reversed(ids), 404])
+
+    assert [template.id for template in found] == list(reversed(ids))
+    assert len(statements) == 1
+    assert all(await cache.redis.mget([cache.key(Template, id) for id in ids]))
+
+
+async def test_commit_writes_tombstone_and_blocks_backfill(session: AsyncSession, cache: EntityCache) -> None:
+    (template,) = await seed(session, 1)
+    repo = TemplateRepository(session)
+    loaded = await repo.get_by_id(template.id)
+
+    loaded.body = "changed"
+    await session.commit()
+    await drain(cache)
+    key = cache.key(Template, template.id)
+    assert await cache.redis.get(key) == "!"
+
+    session.expunge_all()
+    reloaded = await repo.get_by_id(template.id)
+    assert reloaded.body == "changed"
+    # 占位期间回填被 SET NX 拒绝
+    assert await cache.redis.get(key) == "!"
+
+
+async def test_update_by_id_invalidates(session: AsyncSession, cache: EntityCache) -> None:
+    (template,) = await seed(session, 1)
+    repo = TemplateRepository(session)
+    await repo.get_by_id(template.id)
+
+    await repo.update_by_id(template.id, {"body": "changed"})
+    await session.commit()
+    await drain(cache)
+
+    assert await cache.redis.get(cache.key(Template, template.id)) == "!"
+
+
+async def test_uncommitted_writes_are_not_cached(session: AsyncSession, cache: EntityCache) -> None:
+    (template,) = await seed(session, 1)
+    repo = TemplateRepository(session)
+
+    await session.execute(text("UPDATE test_templates SET body = 'pending'"))
+    session.add(Template(name="other", body="x", created_at=datetime(2024, 1, 1, tzinfo=UTC)))
+    await session.flush()
+    await repo.get_by_id(template.id)
+
+    assert await cache.redis.get(cache.key(Template, template.id)) is None
+    await session.rollback()
@@ -0,0 +1,43 @@
+"""Query Instrumentation Tests"""
+
+import logging
+from datetime import UTC, datetime
+
+import pytest
+from prometheus_client import REGISTRY
+from sample_models import Item
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from platform_db import QueryInstrumentation, fingerprint
+
+
+def test_fingerprint_normalizes_literals_and_lists() -> None:
+    fingerprint_id, sql = fingerprint("SELECT *  FROM items WHERE id IN (1, 2, 3) AND name = 'a'")
+
+    assert sql == "SELECT * FROM items WHERE id IN (?) AND name = ?"
+    assert fingerprint("SELECT * FROM items WHERE id IN ($1) AND name = $2")[0] == fingerprint_id
+    assert fingerprint("SELECT * FROM items WHERE id = 1")[0] != fingerprint_id
+
+
+async def test_track_counts_statements_and_flags_n_plus_one(
+    engine: AsyncEngine, session: AsyncSession, caplog: pytest.LogCaptureFixture
+) -> None:
+    instrumentation = QueryInstrumentation(n_plus_one_threshold=2)
+    instrumentation.instrument(engine)
+    session.add(Item(sku="sku-0", name="item 0", created_at=datetime(2024, 1, 1, tzinfo=UTC)))
+    await session.commit()
+
+    with caplog.at_level(logging.WARNING), instrumentation.track("GET /items") as stats:
+        for id in (1, 2, 3):
+            await session.scalar(select(Item.name).where(Item.id == id))
+
+    assert stats.count == 3
+    [(fingerprint_id, count)] = stats.by_fingerprint.items()
+    assert count == 3
+    [record] = [record for record in caplog.records if record.getMessage() == "Possible N+1 query"]
+    assert record.fingerprint == fingerprint_id
+    assert record.scope == "GET /items"
+    assert REGISTRY.get_sample_value("platform_db_n_plus_one_total", {"fingerprint": fingerprint_id}) == 1
+    snapshot = {row["fingerprint"]: row for row in instrumentation.snapshot()}
+    assert snapshot[fingerprint_id]["calls"] == 3
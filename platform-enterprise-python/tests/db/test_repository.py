@@ -0,0 +1,235 @@
+"""Base Repository Tests"""
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from sample_models import Item, ItemRepository
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from platform_db import (
+    INCLUDE_DELETED,
+    CursorCodec,
+    InvalidCursorError,
+    include_deleted,
+    init_cursor_codec,
+    prebuilt,
+)
+
+
+_ITEM_BY_SKU = prebuilt(select(Item).where(Item.sku == bindparam("sku")))
+
+_START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+async def seed(session: AsyncSession, count: int) -> list[Item]:
+    # created_at 成对重复, 验证 (created_at, id) 作为排序键时的翻页边界
+    items = [
+        Item(sku=f"sku-{i}", name=f"item {i}", created_at=_START + timedelta(minutes=i // 2)) for i in range(count)
+    ]
+    session.add_all(items)
+    await session.commit()
+    return items
+
+
+async def collect_pages(
+    repo: ItemRepository, codec: CursorCodec, *, descending: bool = False, limit: int = 3
+) -> list[list[int]]:
+    pages: list[list[int]] = []
+    cursor = None
+    while True:
+        page = await repo.paginate(
+            order_by=Item.created_at, after=cursor, limit=limit, descending=descending, codec=codec
+        )
+        pages.append([item.id for item in page.items])
+        if not page.has_more:
+            return pages
+        cursor = page.next_cursor
+
+
+async def test_paginate_visits_every_row_once(session: AsyncSession, codec: CursorCodec) -> None:
+    items = await seed(session, 10)
+    repo = ItemRepository(session)
+
+    pages = await collect_pages(repo, codec)
+
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+    assert [id for page in pages for id in page] == [item.id for item in items]
+
+
+async def test_paginate_descending(session: AsyncSession, codec: CursorCodec) -> None:
+    items = await seed(session, 7)
+    repo = ItemRepository(session)
+
+    pages = await collect_pages(repo, codec, descending=True)
+
+    assert [id for page in pages for id in page] == [item.id for item in reversed(items)]
+
+
+async def test_paginate_rejects_foreign_cursor(session: AsyncSession, codec: CursorCodec) -> None:
+    await seed(session, 5)
+    repo = ItemRepository(session)
+    page = await repo.paginate(order_by=Item.created_at, limit=2, codec=codec)
+
+    with pytest.raises(InvalidCursorError):
+        await repo.paginate(order_by=Item.created_at, after=page.next_cursor, limit=2, descending=True, codec=codec)
+    with pytest.raises(InvalidCursorError):
+        await repo.paginate(order_by=Item.created_at, after=page.next_cursor, codec=CursorCodec("other"))
+    with pytest.raises(InvalidCursorError):
+        await repo.paginate(order_by=Item.created_at, after=page.next_cursor[:-2], codec=codec)
+
+
+async def test_paginate_uses_global_codec(session: AsyncSession) -> None:
+    items = await seed(session, 4)
+    repo = ItemRepository(session)
+    codec = init_cursor_codec("global-secret")
+
+    page = await repo.paginate(order_by=Item.created_at, limit=2)
+    rest = await repo.paginate(order_by=Item.created_at, after=page.next_cursor, limit=2, codec=codec)
+
+    assert [item.id for item in page.items + rest.items] == [item.id for item in items]
+    assert not rest.has_more
+
+
+async def test_create_many_inserts_each_chunk_in_one_statement(engine: AsyncEngine, session: AsyncSession) -> None:
+    statements: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if statement.startswith("INSERT"):
+            statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    rows = [{"sku": f"sku-{i}", "name": f"item {i}", "created_at": _START} for i in range(5)]
+
+    items = await ItemRepository(session).create_many(rows, chunk_size=2)
+
+    assert [item.sku for item in items] == [row["sku"] for row in rows]
+    assert len(statements) == 3
+
+
+async def test_create_many_returns_columns_in_input_order(session: AsyncSession) -> None:
+    rows = [{"sku": f"sku-{i}", "name": f"item {i}", "created_at": _START} for i in range(5)]
+
+    returned = await ItemRepository(session).create_many(
+        rows, chunk_size=2, return_instances=False, returning=[Item.sku]
+    )
+
+    assert returned == [{"sku": row["sku"]} for row in rows]
+
+
+async def test_upsert_many_counts_inserted_and_updated(session: AsyncSession) -> None:
+    await seed(session, 2)
+    repo = ItemRepository(session)
+
+    result = await repo.upsert_many(
+        [
+            {"sku": "sku-0", "name": "renamed", "created_at": _START},
+            {"sku": "sku-9", "name": "new", "created_at": _START},
+        ],
+        conflict_cols=["sku"],
+        update_cols=["name"],
+    )
+    await session.commit()
+
+    assert (result.inserted, result.updated) == (1, 1)
+    names = dict((await session.execute(select(Item.sku, Item.name).execution_options(populate_existing=True))).all())
+    assert names == {"sku-0": "renamed", "sku-1": "item 1", "sku-9": "new"}
+
+
+async def test_upsert_many_do_nothing_reports_no_updates(session: AsyncSession) -> None:
+    await seed(session, 2)
+    repo = ItemRepository(session)
+
+    result = await repo.upsert_many(
+        [{"sku": "sku-1", "name": "ignored", "created_at": _START}],
+        conflict_cols=["sku"],
+        update_cols=[],
+    )
+
+    assert (result.inserted, result.updated) == (0, 0)
+
+
+async def test_upsert_many_reuses_soft_deleted_key(session: AsyncSession) -> None:
+    items = await seed(session, 1)
+    items[0].soft_delete()
+    await session.commit()
+    repo = ItemRepository(session)
+
+    # 部分唯一索引只覆盖未删除的行, 已删除行的键可以重新插入
+    result = await repo.upsert_many([{"sku": "sku-0", "name": "again", "created_at": _START}], conflict_cols=["sku"])
+    await session.commit()
+
+    assert (result.inserted, result.updated) == (1, 0)
+    assert len((await session.scalars(include_deleted(select(Item).where(Item.sku == "sku-0")))).all()) == 2
+
+
+async def test_update_by_id_bumps_version(session: AsyncSession) -> None:
+    items = await seed(session, 1)
+    repo = ItemRepository(session)
+
+    updated = await repo.update_by_id(items[0].id, {"name": "v2"}, expected_version=1)
+
+    assert updated is not None
+    assert (updated.name, updated.version) == ("v2", 2)
+
+
+async def test_update_by_id_version_conflict(session: AsyncSession) -> None:
+    items = await seed(session, 1)
+    repo = ItemRepository(session)
+    await repo.update_by_id(items[0].id, {"name": "v2"})
+
+    with pytest.raises(StaleDataError):
+        await repo.update_by_id(items[0].id, {"name": "stale"}, expected_version=1)
+
+
+async def test_update_by_id_missing_row(session: AsyncSession) -> None:
+    repo = ItemRepository(session)
+
+    assert await repo.update_by_id(404, {"name": "x"}, expected_version=1) is None
+
+
+async def test_soft_deleted_rows_are_hidden(session: AsyncSession) -> None:
+    items = await seed(session, 2)
+    items[1].soft_delete()
+    await session.commit()
+    session.expunge_all()
+    repo = ItemRepository(session)
+    deleted_id = items[1].id
+
+    assert await repo.get_by_id(deleted_id) is None
+    assert await repo.get_by(sku="sku-1") is None
+    assert not await repo.exists(deleted_id)
+    assert [item.id for item in await repo.get_all()] == [items[0].id]
+    assert [item.id for item in await repo.get_by_ids([items[0].id, deleted_id])] == [items[0].id]
+    assert await repo.update_by_id(deleted_id, {"name": "x"}) is None
+    assert not await repo.delete_by_id(deleted_id)
+
+
+async def test_include_deleted_reads_soft_deleted_rows(session: AsyncSession) -> None:
+    items = await seed(session, 2)
+    items[1].soft_delete()
+    await session.commit()
+    session.expunge_all()
+    repo = ItemRepository(session)
+    deleted_id = items[1].id
+
+    assert (await repo.get_by_id(deleted_id, include_deleted=True)).id == deleted_id
+    assert (await repo.get_by(sku="sku-1", include_deleted=True)).id == deleted_id
+    assert await repo.exists(deleted_id, include_deleted=True)
+    assert len(await repo.get_all(include_deleted=True)) == 2
+    assert len(await repo.get_by_ids([items[0].id, deleted_id], include_deleted=True)) == 2
+
+
+async def test_prebuilt_statement_honours_include_deleted(session: AsyncSession) -> None:
+    items = await seed(session, 1)
+    items[0].soft_delete()
+    await session.commit()
+    session.expunge_all()
+
+    assert (await session.execute(_ITEM_BY_SKU, {"sku": "sku-0"})).scalar_one_or_none() is None
+    found = await session.execute(include_deleted(_ITEM_BY_SKU), {"sku": "sku-0"})
+    assert found.scalar_one().id == items[0].id
+    found = await session.execute(_ITEM_BY_SKU, {"sku": "sku-0"}, execution_options={INCLUDE_DELETED: True})
+    assert found.scalar_one().id == items[0].id
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""自动 Pipeline 基准测试 - 原生 Redis 客户端 vs AutoPipeline
+
+每种并发度下由 N 个协程并发执行 GET / INCR, 统计总吞吐与平均批大小。
+
+用法:
+    uv run python tools/benchmarks/auto_pipeline.py --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import time
+
+from redis.asyncio import Redis
+
+from platform_cache import AutoPipeline, create_redis_pool
+
+
+async def worker(client, ops: int, key: str) -> None:
+    """交替执行 GET 与 INCR"""
+    for i in range(ops):
+        if i % 2:
+            await client.incr(key)
+        else:
+            await client.get(key)
+
+
+async def throughput(client, concurrency: int, total_ops: int) -> float:
+    """返回 ops/s"""
+    ops = max(1, total_ops // concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(client, ops, f"bench:autopipe:{i % 16}") for i in range(concurrency)))
+    return ops * concurrency / (time.perf_counter() - start)
+
+
+async def run(redis_url: str, levels: list[int], total_ops: int, window_us: float) -> None:
+    """运行基准测试"""
+    pool = create_redis_pool(redis_url, max_connections=max(levels))
+    redis = Redis(connection_pool=pool)
+    await redis.ping()
+
+    print(f"total ops per level: {total_ops}, window: {window_us:.0f} us")
+    print(f"  {'concurrency':>11} {'plain ops/s':>12} {'auto ops/s':>12} {'speedup':>8} {'avg batch':>10}")
+    for concurrency in levels:
+        plain = await throughput(redis, concurrency, total_ops)
+        auto = AutoPipeline(redis, window=window_us / 1e6)
+        pipelined = await throughput(auto, concurrency, total_ops)
+        print(
+            f"  {concurrency:>11} {plain:>12.0f} {pipelined:>12.0f} "
+            f"{pipelined / plain:>7.1f}x {auto.avg_batch_size:>10.1f}"
+        )
+
+    await redis.delete(*(f"bench:autopipe:{i}" for i in range(16)))
+    await redis.aclose()
+
+
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="Auto-pipelining benchmark")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--window-us", type=float, default=0.0, help="收集窗口 (微秒), 0 为同一 tick")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.redis_url, args.concurrency, args.ops, args.window_us))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""缓存批量操作基准测试 - 逐键循环 vs get_many / set_many
+
+用法:
+    uv run python tools/benchmarks/cache_batch.py --redis-url redis://localhost:6379/15
+    uv run python tools/benchmarks/cache_batch.py --redis-url memory://   # 进程内后端, 排除网络开销
+"""
+
+import argparse
+import asyncio
+import time
+
+from platform_cache import CacheClient, create_redis_client
+
+
+def make_profile(i: int) -> dict:
+    """构造一个接近 UserProfileResponse 的载荷"""
+    return {
+        "id": f"profile-{i:08d}",
+        "user_id": f"user-{i:08d}",
+        "display_name": f"User {i}",
+        "avatar_url": f"https://cdn.example.com/avatars/{i}.png",
+        "bio": "Lorem ipsum dolor sit amet " * 4,
+        "language": "zh-CN",
+        "timezone": "Asia/Shanghai",
+        "notification_email": True,
+        "notification_push": True,
+        "phone_verified": False,
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+
+
+async def timed(label: str, rounds: int, func) -> float:
+    """执行 rounds 次并打印平均耗时"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await func()
+    elapsed_ms = (time.perf_counter() - start) * 1000 / rounds
+    print(f"  {label:<28} {elapsed_ms:8.3f} ms/op")
+    return elapsed_ms
+
+
+async def run(redis_url: str, batch: int, rounds: int) -> None:
+    """运行基准测试"""
+    redis = create_redis_client(redis_url)
+    cache = CacheClient(redis, prefix="bench")
+    keys = [f"profile:{i}" for i in range(batch)]
+    mapping = {key: make_profile(i) for i, key in enumerate(keys)}
+
+    async def set_loop() -> None:
+        for key, value in mapping.items():
+            await cache.set(key, value)
+
+    async def set_batch() -> None:
+        await cache.set_many(mapping)
+
+    async def get_loop() -> None:
+        for key in keys:
+            await cache.get(key)
+
+    async def get_batch() -> None:
+        await cache.get_many(keys)
+
+    print(f"batch={batch} rounds={rounds}")
+    loop_set = await timed("set (per-key loop)", rounds, set_loop)
+    batch_set = await timed("set_many (pipeline)", rounds, set_batch)
+    loop_get = await timed("get (per-key loop)", rounds, get_loop)
+    batch_get = await timed("get_many (MGET)", rounds, get_batch)
+    print(f"  speedup: set x{loop_set / batch_set:.1f}, get x{loop_get / batch_get:.1f}")
+    print(f"  round trips per op: loop={batch}, batch=1")
+
+    await cache.delete_many(keys)
+    await redis.aclose()
+
+
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="CacheClient batch API benchmark")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.redis_url, args.batch, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
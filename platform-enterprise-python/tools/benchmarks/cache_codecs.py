@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""缓存编解码基准测试 - 各编解码器 / 压缩组合的耗时与 Redis 内存占用
+
+载荷为 UserProfileResponse.model_dump() 的结果 (含 datetime / date)。
+
+用法:
+    uv run python tools/benchmarks/cache_codecs.py
+    uv run python tools/benchmarks/cache_codecs.py --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import UTC, date, datetime
+
+from redis.asyncio import Redis
+
+from platform_cache import CacheClient, Serializer, create_redis_pool
+from platform_user.schemas import UserProfileResponse
+
+
+VARIANTS: list[tuple[str, str, str | None]] = [
+    ("json (legacy text)", "", None),
+    ("json", "json", None),
+    ("orjson", "orjson", None),
+    ("msgpack", "msgpack", None),
+    ("orjson+zstd", "orjson", "zstd"),
+    ("msgpack+zstd", "msgpack", "zstd"),
+    ("orjson+lz4", "orjson", "lz4"),
+    ("msgpack+lz4", "msgpack", "lz4"),
+]
+
+
+def make_payload(bio_repeat: int) -> dict:
+    """构造真实形态的用户档案载荷"""
+    profile = UserProfileResponse(
+        id="2f1d3c4e-5a6b-4c7d-8e9f-0a1b2c3d4e5f",
+        user_id="9a8b7c6d-5e4f-4a3b-2c1d-0e9f8a7b6c5d",
+        display_name="张三 Zhang San",
+        avatar_url="https://cdn.example.com/avatars/9a8b7c6d.png",
+        bio="热爱开源、分布式系统与性能优化。" * bio_repeat,
+        birthday=date(1990, 5, 17),
+        gender="male",
+        location="上海 Shanghai",
+        website="https://zhangsan.dev",
+        phone="13800138000",
+        created_at=datetime(2024, 1, 1, tzinfo=UTC),
+        updated_at=datetime.now(UTC),
+    )
+    return profile.model_dump()
+
+
+def bench_codec(serializer: Serializer | None, payload: dict, rounds: int) -> tuple[int, float, float]:
+    """返回 (编码后字节数, 编码 us/op, 解码 us/op)"""
+    if serializer is None:
+        dumps = lambda v: json.dumps(v, default=str)  # noqa: E731
+        loads = json.loads
+    else:
+        dumps, loads = serializer.dumps, serializer.loads
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        data = dumps(payload)
+    encode_us = (time.perf_counter() - start) * 1e6 / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        loads(data)
+    decode_us = (time.perf_counter() - start) * 1e6 / rounds
+
+    size = len(data.encode() if isinstance(data, str) else data)
+    return size, encode_us, decode_us
+
+
+async def redis_memory(redis_url: str, serializer: Serializer | None, payload: dict, keys: int) -> float:
+    """写入 keys 个值并返回每键平均 MEMORY USAGE 字节数"""
+    pool = create_redis_pool(redis_url, serializer=serializer)
+    redis = Redis(connection_pool=pool)
+    cache = CacheClient(redis, prefix="bench:codec", serializer=serializer)
+    names = [f"profile:{i}" for i in range(keys)]
+    await cache.set_many(dict.fromkeys(names, payload))
+    usage = [await redis.memory_usage(cache._make_key(name)) or 0 for name in names]
+    await cache.delete_many(names)
+    await redis.aclose()
+    return sum(usage) / len(usage)
+
+
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="Cache codec benchmark")
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--bio-repeat", type=int, nargs="+", default=[1, 20, 200])
+    parser.add_argument("--redis-url", default=None, help="测量 Redis 内存占用 (可选)")
+    parser.add_argument("--keys", type=int, default=200)
+    args = parser.parse_args()
+
+    for repeat in args.bio_repeat:
+        payload = make_payload(repeat)
+        print(f"\npayload bio x{repeat}")
+        header = f"  {'codec':<20} {'bytes':>8} {'enc us':>9} {'dec us':>9}"
+        if args.redis_url:
+            header += f" {'redis B/key':>12}"
+        print(header)
+
+        for label, codec, compression in VARIANTS:
+            try:
+                serializer = Serializer(codec, compression=compression) if codec else None
+            except ImportError as e:
+                print(f"  {label:<20} skipped ({e.name} not installed)")
+                continue
+
+            size, enc, dec = bench_codec(serializer, payload, args.rounds)
+            line = f"  {label:<20} {size:>8} {enc:>9.2f} {dec:>9.2f}"
+            if args.redis_url:
+                mem = asyncio.run(redis_memory(args.redis_url, serializer, payload, args.keys))
+                line += f" {mem:>12.0f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""一致性哈希环基准测试 - 键分布均衡度与扩容时的迁移比例
+
+- 均衡度: 各节点键数相对平均值的最大偏差
+- 迁移比例: N -> N+1 个节点时改变归属的键占比 (理想值约 1/(N+1))
+
+用法:
+    uv run python tools/benchmarks/hash_ring.py --nodes 4 --vnodes 40 160
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from platform_cache import HashRing
+
+
+def measure(nodes: int, vnodes: int, keys: list[str]) -> tuple[float, float, float]:
+    """返回 (最大偏差, 迁移比例, 查找 us/op)"""
+    ring = HashRing([f"redis-{i}" for i in range(nodes)], vnodes=vnodes)
+
+    start = time.perf_counter()
+    before = [ring.get_node(key) for key in keys]
+    lookup_us = (time.perf_counter() - start) * 1e6 / len(keys)
+
+    counts = Counter(before)
+    mean = len(keys) / nodes
+    skew = max(abs(count - mean) for count in counts.values()) / mean
+
+    ring.add_node(f"redis-{nodes}")
+    moved = sum(1 for key, node in zip(keys, before, strict=True) if ring.get_node(key) != node)
+    return skew, moved / len(keys), lookup_us
+
+
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="Consistent hash ring benchmark")
+    parser.add_argument("--keys", type=int, default=200000)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--vnodes", type=int, nargs="+", default=[1, 40, 160])
+    args = parser.parse_args()
+
+    keys = [f"user:profile:{i}" for i in range(args.keys)]
+    print(f"{'nodes':>5} {'vnodes':>6} {'max skew':>9} {'moved':>7} {'ideal':>7} {'lookup us':>10}")
+    for nodes in args.nodes:
+        for vnodes in args.vnodes:
+            skew, moved, lookup_us = measure(nodes, vnodes, keys)
+            print(f"{nodes:>5} {vnodes:>6} {skew:>8.1%} {moved:>7.1%} {1 / (nodes + 1):>7.1%} {lookup_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""限流器基准测试 - 固定窗口 (RateLimiter) vs 滑动窗口 (SlidingWindowRateLimiter)
+
+- 延迟: 单次 is_allowed 的平均 / p99 耗时
+- 准确性: 以恒定速率持续请求, 统计任意长度为 window 的区间内放行的最大请求数
+  (理想值 <= limit, 固定窗口在边界处最多可达 2 * limit)
+
+用法:
+    uv run python tools/benchmarks/rate_limiter.py --redis-url redis://localhost:6379/15
+    uv run python tools/benchmarks/rate_limiter.py --redis-url memory://   # 进程内后端, 排除网络开销
+"""
+
+import argparse
+import asyncio
+import bisect
+import time
+import uuid
+
+from platform_cache import CacheClient, RateLimiter, SlidingWindowRateLimiter, create_redis_client
+
+
+async def bench_latency(limiter, calls: int) -> tuple[float, float]:
+    """返回 (平均 ms, p99 ms)"""
+    key = f"latency:{uuid.uuid4().hex}"
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await limiter.is_allowed(key, calls * 2, 60)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return sum(samples) / len(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+async def bench_accuracy(limiter, limit: int, window: float, duration: float, rate: float) -> tuple[int, int]:
+    """返回 (放行总数, 任意滑动窗口内的最大放行数)"""
+    key = f"accuracy:{uuid.uuid4().hex}"
+    allowed_at: list[float] = []
+    interval = 1 / rate
+    start = time.monotonic()
+    while (now := time.monotonic()) - start < duration:
+        allowed, *_ = await limiter.is_allowed(key, limit, window)
+        if allowed:
+            allowed_at.append(now)
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - now)))
+
+    peak = 0
+    for i, t in enumerate(allowed_at):
+        j = bisect.bisect_left(allowed_at, t + window)
+        peak = max(peak, j - i)
+    return len(allowed_at), peak
+
+
+async def run(redis_url: str, *, calls: int, limit: int, window: float, duration: float, rate: float) -> None:
+    """运行基准测试"""
+    redis = create_redis_client(redis_url)
+    cache = CacheClient(redis, prefix="bench")
+    sliding = SlidingWindowRateLimiter(cache)
+    await sliding.load()
+    limiters = {
+        "fixed window (INCR+EXPIRE+TTL)": RateLimiter(cache),
+        "sliding window (EVALSHA)": sliding,
+    }
+
+    print(f"latency over {calls} calls")
+    for label, limiter in limiters.items():
+        avg, p99 = await bench_latency(limiter, calls)
+        print(f"  {label:<32} avg {avg:6.3f} ms  p99 {p99:6.3f} ms")
+
+    print(f"\naccuracy: limit={limit}/{window}s, offered {rate:.0f} req/s for {duration}s")
+    for label, limiter in limiters.items():
+        total, peak = await bench_accuracy(limiter, limit, window, duration, rate)
+        print(f"  {label:<32} allowed {total:5d}  max in any window {peak:4d} ({peak / limit:.2f}x limit)")
+
+    await redis.aclose()
+
+
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(description="Rate limiter benchmark")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--window", type=int, default=2, help="窗口秒数 (整数, 固定窗口仅支持整秒)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=200.0)
+    args = parser.parse_args()
+
+    asyncio.run(
+        run(
+            args.redis_url,
+            calls=args.calls,
+            limit=args.limit,
+            window=args.window,
+            duration=args.duration,
+            rate=args.rate,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()